@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+"""
+Record upstream responses as benchmark fixtures, and generate synthetic versions data.
+
+Recording fetches the versions data (at the latest release tag) and the EOL data for every source
+in constants.URLS and writes them to a fixtures directory along with an index of where each came
+from. Synthetic versions data is generated in the same format as each upstream source, scaled to
+any number of versions and including pre-release and malformed entries, so the parsers can be
+measured at sizes far beyond the real data.
+
+Either can be loaded into a cache directory, which lets the command line run completely offline.
+
+Usage:
+    python benchmarks/fixtures.py [--directory DIR]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+
+from types import SimpleNamespace
+from typing import Dict, List
+
+# The repository root, so the fixtures are recorded with the working copy rather than an installed copy
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint cannot follow the working copy added to the path above, so the imports from it are not checked
+# pylint: disable=wrong-import-position,import-error,no-name-in-module
+from wolfsoftware.get_language_versions.cache import configure_cache, store_entry  # noqa: E402
+from wolfsoftware.get_language_versions.constants import URLS  # noqa: E402
+from wolfsoftware.get_language_versions.fetch import fetch_url  # noqa: E402
+from wolfsoftware.get_language_versions.tags import get_latest_tag  # noqa: E402
+# pylint: enable=wrong-import-position,import-error,no-name-in-module
+
+# The directory recorded fixtures are written to by default
+FIXTURES_DIRECTORY: str = os.path.join(ROOT, 'benchmarks', 'fixtures')
+
+# The name of the index of the recorded fixtures within the fixtures directory
+INDEX_FILENAME: str = 'index.json'
+
+# The number of versions in each major.minor of the synthetic data
+PATCHES_PER_MINOR: int = 50
+
+# The number of minor versions in each major of the synthetic data
+MINORS_PER_MAJOR: int = 50
+
+# The number of synthetic major.minor cycles still supported (the rest are past their end of life)
+SUPPORTED_CYCLES: int = 5
+
+
+def _tag_url(releases_url: str, tag: str) -> str:
+    """
+    Get the URL a releases URL redirects to for a tag.
+
+    Arguments:
+        releases_url (str): The releases URL.
+        tag (str): The release tag.
+
+    Returns:
+        str: The release tag URL.
+    """
+    return releases_url.replace('/releases/latest/', f'/releases/tag/{tag}')
+
+
+def record_fixtures(directory: str) -> dict:
+    """
+    Fetch the versions data and EOL data for every source and write them to the fixtures directory.
+
+    Arguments:
+        directory (str): The fixtures directory.
+
+    Returns:
+        dict: The index of the recorded fixtures.
+    """
+    configure_cache(enabled=False)
+    os.makedirs(directory, exist_ok=True)
+    sources: Dict[str, dict] = {}
+
+    for language, urls in URLS.items():
+        source: dict = {"tag": None, "versions_url": urls["versions_url"], "eol_url": urls["eol_url"]}
+
+        if "releases_url" in urls:
+            source["tag"] = get_latest_tag(urls["releases_url"])
+            source["versions_url"] = urls["versions_url"].replace('LATEST_TAG', source["tag"])
+
+        for kind, url in (("versions", source["versions_url"]), ("eol", source["eol_url"])):
+            source[f"{kind}_file"] = f"{language}.{kind}"
+            with open(os.path.join(directory, source[f"{kind}_file"]), 'wb') as handle:
+                handle.write(fetch_url(url).content)
+
+        sources[language] = source
+
+    index: dict = {"recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'), "sources": sources}
+    with open(os.path.join(directory, INDEX_FILENAME), 'w', encoding='utf-8') as handle:
+        json.dump(index, handle, indent=2)
+
+    return index
+
+
+def load_fixtures(directory: str) -> Dict[str, SimpleNamespace]:
+    """
+    Load the recorded fixtures.
+
+    Arguments:
+        directory (str): The fixtures directory.
+
+    Returns:
+        Dict[str, SimpleNamespace]: The release tag, versions data and EOL data of each language, or nothing if no fixtures have been recorded.
+    """
+    path: str = os.path.join(directory, INDEX_FILENAME)
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, encoding='utf-8') as handle:
+        index: dict = json.load(handle)
+
+    fixtures: Dict[str, SimpleNamespace] = {}
+    for language, source in index["sources"].items():
+        with open(os.path.join(directory, source["versions_file"]), 'rb') as versions, open(os.path.join(directory, source["eol_file"]), 'rb') as eol:
+            fixtures[language] = SimpleNamespace(tag=source["tag"], versions=versions.read(), eol=eol.read())
+
+    return fixtures
+
+
+def synthetic_versions(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate version strings, newest first, with about 10% pre-releases and 2% malformed entries.
+
+    Arguments:
+        count (int): The number of versions.
+        seed (int): The random seed, so the same data is generated every time.
+
+    Returns:
+        List[str]: The version strings.
+    """
+    rng: random.Random = random.Random(seed)
+    versions: List[str] = []
+
+    for number in range(count):
+        major: int = 1 + number // (PATCHES_PER_MINOR * MINORS_PER_MAJOR)
+        minor: int = (number // PATCHES_PER_MINOR) % MINORS_PER_MAJOR
+        text: str = f"{major}.{minor}.{number % PATCHES_PER_MINOR}"
+
+        roll: float = rng.random()
+        if roll < 0.10:
+            text += f"-rc.{rng.randint(1, 5)}"
+        elif roll < 0.12:
+            text = f"nightly-{number}"
+
+        versions.append(text)
+
+    versions.reverse()
+    return versions
+
+
+def synthetic_body(language: str, versions: List[str]) -> bytes:
+    """
+    Build the versions data for a language from version strings, in the same format as its upstream source.
+
+    Arguments:
+        language (str): The supported language.
+        versions (List[str]): The version strings, newest first.
+
+    Returns:
+        bytes: The versions data.
+    """
+    if language == 'terraform':
+        links: str = ''.join(f'<li><a href="/terraform/{version}/">terraform_{version}</a></li>\n' for version in versions)
+        return f'<!DOCTYPE html>\n<html><body><ul>\n<li><a href="../">../</a></li>\n{links}</ul></body></html>\n'.encode('utf-8')
+
+    document: object
+    if language == 'perl':
+        document = versions
+    elif language == 'php':
+        document = [dict(zip(('major', 'minor', 'release'), (version.split('.', 2) + ['0', '0'])[:3])) for version in versions]
+    elif language == 'ruby':
+        document = {"ruby": versions + ['head'], "jruby": ['9.4.7.0'], "truffleruby": ['24.0.1']}
+    else:
+        document = [{"version": version, "stable": '-' not in version, "release_url": f"https://example.invalid/releases/{version}",
+                     "files": [{"filename": f"{language}-{version}-linux-x64.tar.gz", "arch": "x64", "platform": "linux",
+                                "download_url": f"https://example.invalid/{language}-{version}-linux-x64.tar.gz"}]} for version in versions]
+
+    return json.dumps(document).encode('utf-8')
+
+
+def synthetic_eol(versions: List[str]) -> bytes:
+    """
+    Build the EOL data for version strings, with the newest major.minor cycles still supported.
+
+    Arguments:
+        versions (List[str]): The version strings, newest first.
+
+    Returns:
+        bytes: The EOL data.
+    """
+    cycles: List[str] = list(dict.fromkeys('.'.join(version.split('.')[:2]) for version in versions if not version.startswith('nightly')))
+    return json.dumps([{"cycle": cycle, "eol": False if position < SUPPORTED_CYCLES else "2000-01-01"}
+                       for position, cycle in enumerate(cycles)]).encode('utf-8')
+
+
+def synthetic_fixtures(count: int, seed: int = 0) -> Dict[str, SimpleNamespace]:
+    """
+    Generate synthetic fixtures for every language.
+
+    Arguments:
+        count (int): The number of versions for each language.
+        seed (int): The random seed.
+
+    Returns:
+        Dict[str, SimpleNamespace]: The release tag, versions data and EOL data of each language.
+    """
+    versions: List[str] = synthetic_versions(count, seed)
+    eol: bytes = synthetic_eol(versions)
+
+    return {language: SimpleNamespace(tag='synthetic' if "releases_url" in urls else None, versions=synthetic_body(language, versions), eol=eol)
+            for language, urls in URLS.items()}
+
+
+def seed_cache(directory: str, fixtures: Dict[str, SimpleNamespace]) -> None:
+    """
+    Load fixtures into a cache directory, so that the command line can answer queries from them with no network access.
+
+    Arguments:
+        directory (str): The cache directory.
+        fixtures (Dict[str, SimpleNamespace]): The fixtures for each language.
+    """
+    configure_cache(directory=directory)
+
+    for language, fixture in fixtures.items():
+        urls: dict = URLS[language]
+        versions_url: str = urls["versions_url"]
+
+        if "releases_url" in urls:
+            store_entry(urls["releases_url"], _tag_url(urls["releases_url"], fixture.tag), b'', None, None)
+            versions_url = versions_url.replace('LATEST_TAG', fixture.tag)
+
+        store_entry(versions_url, versions_url, fixture.versions, None, None)
+        store_entry(urls["eol_url"], urls["eol_url"], fixture.eol, None, None)
+
+
+def main() -> None:
+    """Record the fixtures."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Record upstream responses as benchmark fixtures.')
+    parser.add_argument('--directory', type=str, default=FIXTURES_DIRECTORY, help='The directory to write the fixtures to')
+    args: argparse.Namespace = parser.parse_args()
+
+    index: dict = record_fixtures(args.directory)
+    for language, source in index["sources"].items():
+        print(f"{language:<12} {source['tag'] or '-':<24} {source['versions_url']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Benchmark the start up time of the command line paths that should not touch the network.
+
+Each command is run in a fresh interpreter several times and the median wall time is reported, along
+with the overhead on top of starting a bare interpreter (which is what the limit applies to, so the
+result does not depend on how fast the machine starts Python). The heavy dependencies that each
+command must not import are also checked, so that an eager import creeping back in fails the
+benchmark even on a machine fast enough to stay under the time limit.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--max-overhead-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess  # nosec B404
+import sys
+import time
+
+from typing import Dict, List, Tuple
+
+# The repository root, so the benchmark measures the working copy rather than an installed copy
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that the fast paths must never import
+HEAVY_MODULES: Tuple[str, ...] = ('requests', 'urllib3', 'yaspin', 'packaging', 'wolfsoftware.notify', 'http.server')
+
+# The command line arguments for each fast path
+COMMANDS: Dict[str, List[str]] = {
+    "help": ['-h'],
+    "version": ['-v'],
+    "list-languages": ['-L'],
+}
+
+# Runs the CLI with the given arguments then reports any heavy modules that were imported on stderr
+_PROBE: str = '''
+import sys
+sys.argv = ['get-language-versions'] + sys.argv[1:]
+try:
+    from wolfsoftware.get_language_versions.main import main
+    main()
+except SystemExit:
+    pass
+finally:
+    heavy = [name for name in {heavy!r} if name in sys.modules]
+    sys.stderr.write('HEAVY:' + ','.join(heavy) + '\\n')
+'''
+
+
+def run_command(arguments: List[str]) -> Tuple[float, List[str]]:
+    """
+    Run the CLI once in a fresh interpreter.
+
+    Arguments:
+        arguments (List[str]): The command line arguments.
+
+    Returns:
+        Tuple[float, List[str]]: The wall time in milliseconds and the heavy modules that were imported.
+    """
+    start: float = time.perf_counter()
+    result: subprocess.CompletedProcess = subprocess.run([sys.executable, '-c', _PROBE.format(heavy=HEAVY_MODULES)] + arguments,  # nosec B603
+                                                         cwd=ROOT, capture_output=True, text=True, check=False)
+    elapsed: float = (time.perf_counter() - start) * 1000
+
+    heavy: List[str] = []
+    for line in result.stderr.splitlines():
+        if line.startswith('HEAVY:'):
+            heavy = [name for name in line[len('HEAVY:'):].split(',') if name]
+    return elapsed, heavy
+
+
+def run_baseline(runs: int) -> float:
+    """
+    Measure the start up time of a bare interpreter, for reference.
+
+    Arguments:
+        runs (int): The number of runs.
+
+    Returns:
+        float: The median wall time in milliseconds.
+    """
+    timings: List[float] = []
+    for _ in range(runs):
+        start: float = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=False)  # nosec B603
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Run the benchmark and exit non-zero if any command is too slow or imports a heavy module."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Benchmark the start up time of get-language-versions.')
+    parser.add_argument('--runs', type=int, default=10, help='The number of runs of each command')
+    parser.add_argument('--max-overhead-ms', type=float, default=75.0,
+                        help='The maximum median wall time allowed for each command, on top of starting a bare interpreter')
+    args: argparse.Namespace = parser.parse_args()
+
+    failed: bool = False
+
+    baseline: float = run_baseline(args.runs)
+    print(f"{'interpreter':<16} {baseline:8.1f} ms")
+
+    for name, arguments in COMMANDS.items():
+        timings: List[float] = []
+        heavy: List[str] = []
+        for _ in range(args.runs):
+            elapsed, imported = run_command(arguments)
+            timings.append(elapsed)
+            heavy = sorted(set(heavy) | set(imported))
+
+        median: float = statistics.median(timings)
+        status: str = 'ok'
+        if median - baseline > args.max_overhead_ms:
+            status = f"too slow (limit +{args.max_overhead_ms:.0f} ms)"
+            failed = True
+        if heavy:
+            status = f"imported {', '.join(heavy)}"
+            failed = True
+
+        print(f"{name:<16} {median:8.1f} ms  (+{median - baseline:.1f} ms)  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python
+"""
+Benchmark the parsing and processing stages, the command line and import time, entirely offline.
+
+Each stage of the pipeline (extracting the versions from the raw data, building the index, answering
+a query from it, and the process_versions / compare_min_max_value path both from parsed records and
+from version strings) is run against the recorded fixtures (see fixtures.py) and against synthetic
+versions data for every language at each of the requested sizes. The throughput of each stage is
+taken from the fastest of several runs, and the peak memory from a separate run under tracemalloc.
+
+The command line is timed answering queries from a cache seeded with the fixtures, with the proxies
+pointed at an unused local port so that any attempt to reach the network fails rather than being
+measured, and the import time of the command line and of the query pipeline is measured on top of
+starting a bare interpreter.
+
+Results can be written to a JSON file and compared against a previous results file, in which case
+the benchmark exits non-zero if any result is slower (or uses more memory) than the baseline by
+more than the allowed margin.
+
+Usage:
+    python benchmarks/suite.py [--sizes N,N,...] [--repeat N] [--output FILE] [--baseline FILE] [--max-regression FRACTION]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fixtures import FIXTURES_DIRECTORY, ROOT, load_fixtures, seed_cache, synthetic_fixtures
+
+# pylint: disable=import-error,no-name-in-module
+from wolfsoftware.get_language_versions.constants import MAX_VERSION, MIN_VERSION, SUPPORTED_LANGUAGES
+from wolfsoftware.get_language_versions.index import VersionIndex
+from wolfsoftware.get_language_versions.process import process_versions
+from wolfsoftware.get_language_versions.versions import extract_versions
+# pylint: enable=import-error,no-name-in-module
+
+# Version of the results file format
+RESULTS_FORMAT_VERSION: int = 1
+
+# The languages benchmarked from synthetic data (node, nodejs and python share the same format as go)
+SYNTHETIC_LANGUAGES: Tuple[str, ...] = ('go', 'perl', 'php', 'ruby', 'terraform')
+
+# The size of the chunks the raw data is fed to the parsers in, as it would be when streamed
+CHUNK_SIZE: int = 65536
+
+# The query answered by the query stage (every version, releases only)
+QUERY: SimpleNamespace = SimpleNamespace(max_version=MAX_VERSION, include_pre_releases=False, remove_patch_version=False, highest_only=False, max_versions=0)
+
+# The command line arguments for each command line benchmark
+CLI_COMMANDS: Dict[str, List[str]] = {
+    "all": ['-A'],
+    "all-json": ['-A', '-o', 'json'],
+    "all-pre-releases": ['-A', '-m', 'ALL', '-P'],
+}
+
+# The modules whose import time is measured
+IMPORTS: Dict[str, str] = {
+    "cli": 'wolfsoftware.get_language_versions.cli',
+    "pipeline": 'wolfsoftware.get_language_versions.process',
+}
+
+# Points the proxies at a port nothing listens on, so the command line cannot reach the network
+_OFFLINE_ENVIRONMENT: Dict[str, str] = {"HTTP_PROXY": 'http://127.0.0.1:9', "HTTPS_PROXY": 'http://127.0.0.1:9', "NO_PROXY": ''}
+
+
+def _chunks(body: bytes) -> List[bytes]:
+    """
+    Split raw data into chunks.
+
+    Arguments:
+        body (bytes): The raw data.
+
+    Returns:
+        List[bytes]: The chunks.
+    """
+    return [body[offset:offset + CHUNK_SIZE] for offset in range(0, len(body), CHUNK_SIZE)]
+
+
+def measure_stage(stage: Callable[[], Any], repeat: int) -> Tuple[float, float, Any]:
+    """
+    Measure a stage: the fastest wall time of several runs, and the peak memory of one more run.
+
+    Arguments:
+        stage (Callable[[], Any]): The stage.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        Tuple[float, float, Any]: The fastest wall time in seconds, the peak memory in KiB and the result of the stage.
+    """
+    timings: List[float] = []
+    result: Any = None
+
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        result = stage()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    stage()
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return min(timings), peak / 1024, result
+
+
+def _result(seconds: float, peak_kib: float, items: int, size: Optional[int] = None) -> dict:
+    """
+    Build a result.
+
+    Arguments:
+        seconds (float): The wall time.
+        peak_kib (float): The peak memory in KiB.
+        items (int): The number of items processed.
+        size (Optional[int]): The number of bytes processed, if the stage reads raw data.
+
+    Returns:
+        dict: The result.
+    """
+    result: dict = {"seconds": seconds, "peak_kib": round(peak_kib, 1), "items": items, "items_per_second": round(items / seconds) if seconds else None}
+    if size is not None:
+        result["bytes"] = size
+        result["mb_per_second"] = round(size / seconds / 1e6, 2) if seconds else None
+    return result
+
+
+def benchmark_stages(language: str, body: bytes, repeat: int) -> Dict[str, dict]:
+    """
+    Benchmark every pipeline stage for one language's versions data.
+
+    Arguments:
+        language (str): The language the data is for (which selects the parser).
+        body (bytes): The raw versions data.
+        repeat (int): The number of timed runs of each stage.
+
+    Returns:
+        Dict[str, dict]: The result of each stage.
+    """
+    chunks: List[bytes] = _chunks(body)
+    results: Dict[str, dict] = {}
+
+    seconds, peak, records = measure_stage(lambda: extract_versions(language, chunks), repeat)
+    results["extract"] = _result(seconds, peak, len(records), len(body))
+
+    seconds, peak, index = measure_stage(lambda: VersionIndex(records), repeat)
+    results["index"] = _result(seconds, peak, len(records))
+
+    seconds, peak, versions = measure_stage(lambda: index.query(QUERY, MIN_VERSION), repeat)
+    results["query"] = _result(seconds, peak, len(versions))
+
+    seconds, peak, _ = measure_stage(lambda: process_versions(records, MIN_VERSION, MAX_VERSION, False, False), repeat)
+    results["process_versions"] = _result(seconds, peak, len(records))
+
+    texts: List[str] = [record.text for record in records]
+    seconds, peak, _ = measure_stage(lambda: process_versions(texts, MIN_VERSION, MAX_VERSION, False, False), repeat)
+    results["process_versions_text"] = _result(seconds, peak, len(texts))
+
+    return results
+
+
+def _run_timed(arguments: List[str], environment: Dict[str, str]) -> Tuple[float, subprocess.CompletedProcess]:
+    """
+    Run a command in a fresh interpreter from the repository root.
+
+    Arguments:
+        arguments (List[str]): The interpreter arguments.
+        environment (Dict[str, str]): The environment.
+
+    Returns:
+        Tuple[float, subprocess.CompletedProcess]: The wall time in seconds and the completed process.
+    """
+    started: float = time.perf_counter()
+    completed: subprocess.CompletedProcess = subprocess.run([sys.executable] + arguments, cwd=ROOT, env=environment,  # nosec B603
+                                                            capture_output=True, text=True, check=False)
+    return time.perf_counter() - started, completed
+
+
+def benchmark_cli(fixtures: Dict[str, SimpleNamespace], repeat: int) -> Dict[str, dict]:
+    """
+    Benchmark the command line answering queries offline, from a cache seeded with the fixtures.
+
+    Arguments:
+        fixtures (Dict[str, SimpleNamespace]): The fixtures for each language.
+        repeat (int): The number of runs of each command.
+
+    Returns:
+        Dict[str, dict]: The median wall time of each command (or the error if it failed).
+    """
+    results: Dict[str, dict] = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        seed_cache(directory, fixtures)
+        environment: Dict[str, str] = dict(os.environ, **_OFFLINE_ENVIRONMENT)
+
+        for name, arguments in CLI_COMMANDS.items():
+            command: List[str] = ['-m', 'wolfsoftware.get_language_versions.main'] + arguments
+            command += ['-q', '--no-memo', '--cache-dir', directory, '--cache-ttl', str(365 * 86400)]
+            timings: List[float] = []
+            for _ in range(repeat):
+                elapsed, completed = _run_timed(command, environment)
+                if completed.returncode != 0:
+                    results[name] = {"error": (completed.stderr or completed.stdout).strip().splitlines()[-1:]}
+                    break
+                timings.append(elapsed)
+            else:
+                results[name] = {"seconds": statistics.median(timings)}
+
+    return results
+
+
+def benchmark_imports(repeat: int) -> Dict[str, dict]:
+    """
+    Benchmark the import time of the command line and the query pipeline, on top of starting a bare interpreter.
+
+    Arguments:
+        repeat (int): The number of runs of each import.
+
+    Returns:
+        Dict[str, dict]: The median wall time of each import, and its overhead on the bare interpreter.
+    """
+    environment: Dict[str, str] = dict(os.environ)
+    baseline: float = statistics.median(_run_timed(['-c', 'pass'], environment)[0] for _ in range(repeat))
+    results: Dict[str, dict] = {"interpreter": {"seconds": baseline}}
+
+    for name, module in IMPORTS.items():
+        seconds: float = statistics.median(_run_timed(['-c', f'import {module}'], environment)[0] for _ in range(repeat))
+        results[name] = {"seconds": seconds, "overhead_seconds": seconds - baseline}
+
+    return results
+
+
+def run_suite(sizes: List[int], repeat: int, fixtures_directory: str) -> dict:
+    """
+    Run every benchmark.
+
+    Arguments:
+        sizes (List[int]): The numbers of versions to generate synthetic data for.
+        repeat (int): The number of timed runs of each benchmark.
+        fixtures_directory (str): The directory holding the recorded fixtures.
+
+    Returns:
+        dict: The results, keyed by benchmark name, along with details of the environment they were measured in.
+    """
+    results: Dict[str, dict] = {}
+    recorded: Dict[str, SimpleNamespace] = load_fixtures(fixtures_directory)
+
+    for language in SUPPORTED_LANGUAGES:
+        if language in recorded:
+            for stage, result in benchmark_stages(language, recorded[language].versions, repeat).items():
+                results[f"recorded/{language}/{stage}"] = result
+
+    for size in sizes:
+        synthetic: Dict[str, SimpleNamespace] = synthetic_fixtures(size)
+        for language in SYNTHETIC_LANGUAGES:
+            for stage, result in benchmark_stages(language, synthetic[language].versions, repeat).items():
+                results[f"synthetic-{size}/{language}/{stage}"] = result
+
+    source: str = 'recorded' if recorded else f"synthetic-{min(sizes)}"
+    for name, result in benchmark_cli(recorded or synthetic_fixtures(min(sizes)), repeat).items():
+        results[f"cli/{source}/{name}"] = result
+
+    for name, result in benchmark_imports(repeat).items():
+        results[f"import/{name}"] = result
+
+    return {
+        "format": RESULTS_FORMAT_VERSION,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, max_regression: float) -> List[str]:
+    """
+    Find the results that are slower, or use more memory, than the baseline by more than the allowed margin.
+
+    Arguments:
+        current (dict): The results.
+        baseline (dict): The baseline results.
+        max_regression (float): The allowed margin, as a fraction of the baseline.
+
+    Returns:
+        List[str]: A description of each regression.
+    """
+    regressions: List[str] = []
+
+    for name, result in current["results"].items():
+        previous: Optional[dict] = baseline["results"].get(name)
+        if previous is None:
+            continue
+
+        for metric in ('seconds', 'peak_kib'):
+            if result.get(metric) and previous.get(metric) and result[metric] > previous[metric] * (1 + max_regression):
+                regressions.append(f"{name} {metric}: {previous[metric]:.6g} -> {result[metric]:.6g} (+{result[metric] / previous[metric] - 1:.0%})")
+
+        if "error" in result and "error" not in previous:
+            regressions.append(f"{name} failed: {' '.join(result['error'])}")
+
+    return regressions
+
+
+def print_results(results: dict) -> None:
+    """
+    Print the results as a table.
+
+    Arguments:
+        results (dict): The results.
+    """
+    print(f"{'benchmark':<48} {'ms':>10} {'items/s':>12} {'MB/s':>8} {'peak KiB':>10}")
+
+    for name, result in results["results"].items():
+        if "error" in result:
+            print(f"{name:<48} failed: {' '.join(result['error'])}")
+            continue
+
+        fields: List[str] = ['' if result.get(key) is None else str(result[key]) for key in ('items_per_second', 'mb_per_second', 'peak_kib')]
+        print(f"{name:<48} {result['seconds'] * 1000:10.2f} {fields[0]:>12} {fields[1]:>8} {fields[2]:>10}")
+
+
+def _sizes(value: str) -> List[int]:
+    """
+    Parse a comma separated list of sizes.
+
+    Arguments:
+        value (str): The sizes.
+
+    Returns:
+        List[int]: The sizes.
+
+    Raises:
+        argparse.ArgumentTypeError: If any size is not a positive integer.
+    """
+    try:
+        sizes: List[int] = [int(size) for size in value.split(',')]
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(f"{value} is not a comma separated list of sizes") from err
+
+    if not sizes or min(sizes) <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a comma separated list of positive sizes")
+    return sizes
+
+
+def main() -> None:
+    """Run the benchmark suite, and exit non-zero if any result regressed against the baseline."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Benchmark get-language-versions offline.')
+    parser.add_argument('--sizes', type=_sizes, default=[10000, 100000],
+                        help='The numbers of versions to generate synthetic data for (e.g. 10000,100000,1000000)')
+    parser.add_argument('--repeat', type=int, default=5, help='The number of timed runs of each benchmark')
+    parser.add_argument('--fixtures', type=str, default=FIXTURES_DIRECTORY, help='The directory holding the recorded fixtures')
+    parser.add_argument('--output', type=str, help='Write the results to this JSON file')
+    parser.add_argument('--baseline', type=str, help='Compare the results against this JSON results file')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='The allowed slow down (or memory increase) against the baseline, as a fraction')
+    args: argparse.Namespace = parser.parse_args()
+
+    results: dict = run_suite(args.sizes, args.repeat, args.fixtures)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            regressions: List[str] = compare_results(results, json.load(handle), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Tests for get-language-versions."""
@@ -0,0 +1,60 @@
+"""Tests for answering a file of queries in one run."""
+
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import pytest
+
+from packaging import version as semver
+
+from wolfsoftware.get_language_versions import bulk
+from wolfsoftware.get_language_versions.bulk import plan_queries, read_queries, run_queries
+from wolfsoftware.get_language_versions.exceptions import InvalidQueryError
+from wolfsoftware.get_language_versions.index import VersionIndex
+from wolfsoftware.get_language_versions.records import VersionRecord
+
+
+def test_read_queries() -> None:
+    """Blank lines and comments are skipped, and each query keeps the line it was read from."""
+    queries: List[SimpleNamespace] = read_queries(['# versions to test against\n', '\n', '-l python -m 3.11 -R\n', '-l node NodeJS -H\n'])
+
+    assert [(query.line, query.languages, query.min_version) for query in queries] == [(3, ['python'], '3.11'), (4, ['node', 'nodejs'], 'EOL')]
+    assert queries[0].remove_patch_version and not queries[0].highest_only
+    assert queries[1].highest_only
+
+
+@pytest.mark.parametrize('line', ['-l cobol', '-m 3.9', '-l python -R -P', '-l python -m three', '-l python --unknown'])
+def test_invalid_query_reports_its_line(line: str) -> None:
+    """An invalid query is reported with the line it was read from."""
+    with pytest.raises(InvalidQueryError, match='line 2'):
+        read_queries(['-l python', line])
+
+
+def test_plan_queries() -> None:
+    """Each language is planned once, and only the languages queried from their EOL version need the EOL data."""
+    plan: SimpleNamespace = plan_queries(read_queries(['-l python node -m 3.0', '-l node ruby', '-l python']))
+
+    assert plan.languages == ['python', 'node', 'ruby']
+    assert plan.eol_languages == ['node', 'ruby', 'python']
+
+
+def test_each_source_is_indexed_once(monkeypatch) -> None:
+    """Every query is answered in input order, with the versions data of each source fetched and indexed exactly once."""
+    indexed: List[str] = []
+
+    def index(language: str, response: Optional[SimpleNamespace]) -> VersionIndex:  # pylint: disable=unused-argument
+        indexed.append(language)
+        records: List[Optional[VersionRecord]] = [VersionRecord.parse(text) for text in ('18.19.0', '20.11.0', '20.11.1', '21.6.0')]
+        return VersionIndex(record for record in records if record is not None)
+
+    monkeypatch.setattr(bulk, 'fetch_stable_versions', lambda language, speculative, stream=False: None)
+    monkeypatch.setattr(bulk, 'index_versions', index)
+    monkeypatch.setattr(bulk, 'get_minimum_version', lambda text, language: semver.Version('20.0' if text.upper() == 'EOL' else text))
+
+    results: List[SimpleNamespace] = run_queries(read_queries(['-l node nodejs', '-l nodejs -m 18 -H', '-l node -m 19 -R']), workers=2)
+    versions: List[Dict[str, List[str]]] = [result.versions for result in results]
+
+    assert indexed in (['node'], ['nodejs'])
+    assert versions == [{'node': ['20.11.1', '21.6.0'], 'nodejs': ['20.11.1', '21.6.0']},
+                        {'nodejs': ['21.6.0']},
+                        {'node': ['20.11', '21.6']}]
@@ -0,0 +1,70 @@
+"""Tests for the on-disk response cache."""
+
+import os
+
+from types import SimpleNamespace
+from typing import Iterator, Optional
+
+import pytest
+
+from wolfsoftware.get_language_versions.cache import EntryWriter, clear_cache, configure_cache, is_fresh, load_body, load_entry, store_entry
+
+
+@pytest.fixture(name='cache_dir')
+def fixture_cache_dir(tmp_path) -> Iterator[str]:
+    """
+    Use a temporary cache directory.
+
+    Yields:
+        str: The cache directory.
+    """
+    directory: str = str(tmp_path / 'cache')
+    configure_cache(directory=directory)
+    yield directory
+    configure_cache()
+
+
+def test_entry_round_trip(cache_dir: str) -> None:  # pylint: disable=unused-argument
+    """A stored response is loaded back with its validators and the digest of its body."""
+    store_entry('https://example.com/a', 'https://example.com/b', b'body', '"tag"', None)
+    entry: Optional[SimpleNamespace] = load_entry('https://example.com/a')
+
+    assert entry is not None
+    assert (entry.final_url, entry.etag, entry.last_modified) == ('https://example.com/b', '"tag"', None)
+    assert load_body('https://example.com/a') == b'body'
+    assert is_fresh(entry)
+    assert not is_fresh(entry, ttl=0)
+
+
+def test_aborted_write_leaves_no_entry(cache_dir: str) -> None:
+    """A download that is abandoned before it is committed never becomes an entry."""
+    writer: EntryWriter = EntryWriter('https://example.com/a')
+    writer.write(b'partial')
+    writer.abort()
+
+    assert load_entry('https://example.com/a') is None
+    assert not os.listdir(cache_dir)
+
+
+def test_clear_cache_only_removes_entries(cache_dir: str) -> None:
+    """Clearing the cache removes the entries, but keeps the directory and every other file in it."""
+    store_entry('https://example.com/a', 'https://example.com/a', b'body', None, None)
+    for name in ('versions.sqlite3', 'query-memo.json', 'important.txt'):
+        with open(os.path.join(cache_dir, name), 'w', encoding='utf-8') as handle:
+            handle.write(name)
+
+    clear_cache()
+
+    assert load_entry('https://example.com/a') is None
+    assert sorted(os.listdir(cache_dir)) == ['important.txt', 'query-memo.json', 'versions.sqlite3']
+
+
+def test_clear_missing_cache(tmp_path) -> None:
+    """Clearing a cache directory that does not exist does nothing."""
+    configure_cache(directory=str(tmp_path / 'missing'))
+    try:
+        clear_cache()
+    finally:
+        configure_cache()
+
+    assert not os.path.exists(tmp_path / 'missing')
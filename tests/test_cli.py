@@ -0,0 +1,78 @@
+"""Tests for the command line argument validation."""
+
+import argparse
+import os
+import sys
+
+from typing import List
+
+import pytest
+
+from wolfsoftware.get_language_versions.cache import configure_cache
+from wolfsoftware.get_language_versions.cli import process_arguments, setup_arg_parser, validate_modes
+from wolfsoftware.get_language_versions.memo import configure_memo
+from wolfsoftware.get_language_versions.output import configure_output
+
+
+def _validate(arguments: List[str]) -> None:
+    """
+    Parse and validate command line arguments.
+
+    Arguments:
+        arguments (List[str]): The command line arguments.
+    """
+    validate_modes(setup_arg_parser().parse_args(arguments))
+
+
+@pytest.mark.parametrize('output', ['json', 'matrix', 'ndjson'])
+def test_machine_rejects_structured_output(output: str) -> None:
+    """Machine output is a text format, so it cannot be combined with another output format."""
+    with pytest.raises(argparse.ArgumentTypeError):
+        _validate(['-l', 'python', '--machine', '-o', output])
+
+
+def test_machine_with_text_output() -> None:
+    """Machine output is allowed with the default text output."""
+    _validate(['-l', 'python', '--machine'])
+    _validate(['-l', 'python', '--machine', '-o', 'text'])
+
+
+def _process(arguments: List[str], monkeypatch) -> argparse.Namespace:
+    """
+    Process command line arguments as the command line does.
+
+    Arguments:
+        arguments (List[str]): The command line arguments.
+        monkeypatch (pytest.MonkeyPatch): Replaces the command line.
+
+    Returns:
+        argparse.Namespace: The processed arguments.
+    """
+    monkeypatch.setattr(sys, 'argv', ['get-language-versions'] + arguments)
+    try:
+        return process_arguments(setup_arg_parser())
+    finally:
+        configure_cache()
+        configure_memo()
+        configure_output()
+
+
+def test_clear_cache_alone_exits(tmp_path, monkeypatch) -> None:
+    """Clearing the cache with nothing else requested exits once the cache is cleared."""
+    with pytest.raises(SystemExit) as exit_info:
+        _process(['--clear-cache', '--cache-dir', str(tmp_path)], monkeypatch)
+
+    assert exit_info.value.code == 0
+
+
+def test_clear_cache_runs_the_requested_mode(tmp_path, monkeypatch) -> None:
+    """Clearing the cache before a bulk run still runs the bulk queries."""
+    queries: str = str(tmp_path / 'queries.txt')
+    with open(queries, 'w', encoding='utf-8') as handle:
+        handle.write('python\n')
+
+    args: argparse.Namespace = _process(['--clear-cache', '--cache-dir', str(tmp_path), '--bulk', queries], monkeypatch)
+    args.bulk.close()
+
+    assert args.clear_cache
+    assert os.path.exists(queries)
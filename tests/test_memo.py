@@ -0,0 +1,83 @@
+"""Tests for the memo of final query results."""
+
+import os
+
+from types import SimpleNamespace
+
+from packaging import version as semver
+
+from wolfsoftware.get_language_versions.cache import configure_cache
+from wolfsoftware.get_language_versions.globals import MEMO_FILENAME
+from wolfsoftware.get_language_versions.memo import QueryMemo, configure_memo, get_memo
+
+
+def _config(**settings) -> SimpleNamespace:
+    """
+    Build the query settings used by the memo key.
+
+    Arguments:
+        **settings: Settings to change from the defaults.
+
+    Returns:
+        SimpleNamespace: The query settings.
+    """
+    config: SimpleNamespace = SimpleNamespace(max_version=None, include_pre_releases=False, remove_patch_version=False,
+                                              highest_only=False, max_versions=None)
+    for name, value in settings.items():
+        setattr(config, name, value)
+    return config
+
+
+def test_key_changes_with_every_setting() -> None:
+    """A result is only reused for the same language, versions data, minimum version and settings."""
+    minimum: semver.Version = semver.Version('3.8')
+    key: str = QueryMemo.make_key('python', 'a', _config(), minimum)
+
+    assert key == QueryMemo.make_key('python', 'a', _config(), semver.Version('3.8'))
+    assert len({key,
+                QueryMemo.make_key('ruby', 'a', _config(), minimum),
+                QueryMemo.make_key('python', 'b', _config(), minimum),
+                QueryMemo.make_key('python', 'a', _config(), semver.Version('3.9')),
+                QueryMemo.make_key('python', 'a', _config(max_version='3.12'), minimum),
+                QueryMemo.make_key('python', 'a', _config(include_pre_releases=True), minimum),
+                QueryMemo.make_key('python', 'a', _config(remove_patch_version=True), minimum),
+                QueryMemo.make_key('python', 'a', _config(highest_only=True), minimum),
+                QueryMemo.make_key('python', 'a', _config(max_versions=2), minimum)}) == 9
+
+
+def test_least_recently_used_result_is_evicted() -> None:
+    """Once the memo is full the result used least recently is evicted, and results are returned as copies."""
+    memo: QueryMemo = QueryMemo(max_size=2)
+    memo.put('a', ['1.0'])
+    memo.put('b', ['2.0'])
+    memo.get('a').append('changed')
+    memo.put('c', ['3.0'])
+
+    assert memo.get('a') == ['1.0']
+    assert memo.get('b') is None
+    assert memo.get('c') == ['3.0']
+
+
+def test_persisted_memo(tmp_path) -> None:
+    """A persisted memo is saved in the cache directory and loaded by the next run, and an unreadable file is ignored."""
+    configure_cache(directory=str(tmp_path / 'cache'))
+    path: str = os.path.join(str(tmp_path / 'cache'), MEMO_FILENAME)
+
+    try:
+        configure_memo(persist=True)
+        get_memo().put('a', ['1.0'])
+        get_memo().save()
+
+        configure_memo(persist=True)
+        assert get_memo().get('a') == ['1.0']
+
+        with open(path, 'w', encoding='UTF-8') as handle:
+            handle.write('{not json')
+        configure_memo(persist=True)
+        assert get_memo().get('a') is None
+
+        configure_memo(enabled=False)
+        assert get_memo() is None
+    finally:
+        configure_cache()
+        configure_memo()
@@ -0,0 +1,129 @@
+"""Tests for the deadline, retry and hedging policy of upstream requests."""
+
+import io
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Callable, Iterator, List
+
+import pytest
+import requests
+
+from wolfsoftware.get_language_versions.exceptions import DeadlineExceededError
+from wolfsoftware.get_language_versions.globals import DEFAULT_WORKERS
+from wolfsoftware.get_language_versions.resilience import configure_requests, request_timeout, send_request, time_left
+
+
+@pytest.fixture(autouse=True)
+def fixture_request_settings() -> Iterator[None]:
+    """
+    Restore the default request settings after each test.
+
+    Yields:
+        None: Nothing.
+    """
+    yield
+    configure_requests()
+
+
+def _response(status: int) -> requests.Response:
+    """
+    Build a response with a status code.
+
+    Arguments:
+        status (int): The status code.
+
+    Returns:
+        requests.Response: The response.
+    """
+    response: requests.Response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(b'')
+    return response
+
+
+def _session(answers: List[Callable[[], requests.Response]]) -> SimpleNamespace:
+    """
+    Build a stand-in session answering each request with the next of the answers.
+
+    Arguments:
+        answers (List[Callable[[], requests.Response]]): Called in turn to answer each request (and may raise).
+
+    Returns:
+        SimpleNamespace: The session, with the URLs requested in its calls attribute.
+    """
+    lock: threading.Lock = threading.Lock()
+    session: SimpleNamespace = SimpleNamespace(calls=[])
+
+    def request(method: str, url: str, timeout: float, **kwargs) -> requests.Response:  # pylint: disable=unused-argument
+        with lock:
+            answer: Callable[[], requests.Response] = answers[len(session.calls)]
+            session.calls.append(url)
+        return answer()
+
+    session.request = request
+    return session
+
+
+def _fail() -> requests.Response:
+    """
+    Fail a request as if upstream could not be reached.
+
+    Raises:
+        requests.ConnectionError: Always.
+    """
+    raise requests.ConnectionError('unreachable')
+
+
+def test_retryable_status_is_retried() -> None:
+    """A 503 is retried and the answer of the retry is returned."""
+    configure_requests(retries=2, backoff=0.0)
+    session: SimpleNamespace = _session([lambda: _response(503), lambda: _response(200)])
+
+    assert send_request(session, 'GET', 'https://example.com/').status_code == 200
+    assert len(session.calls) == 2
+
+
+def test_retries_run_out() -> None:
+    """A connection error is raised once the retries have run out, and the last retryable status is returned."""
+    configure_requests(retries=1, backoff=0.0)
+
+    with pytest.raises(requests.ConnectionError):
+        send_request(_session([_fail, _fail]), 'GET', 'https://example.com/')
+
+    assert send_request(_session([lambda: _response(503), lambda: _response(503)]), 'GET', 'https://example.com/').status_code == 503
+
+
+def test_deadline() -> None:
+    """Requests are given the time left before the deadline, and none are sent once it has passed."""
+    configure_requests(timeout=30.0, deadline=10.0)
+    assert request_timeout() <= 10.0
+    assert request_timeout(share=0.5) <= 5.0
+
+    configure_requests(deadline=0.0)
+    assert time_left() == 0.0
+    with pytest.raises(DeadlineExceededError):
+        send_request(_session([]), 'GET', 'https://example.com/')
+
+
+def test_hedges_are_not_queued_behind_other_workers() -> None:
+    """Every slow request is hedged, however many are sent at once."""
+    configure_requests(hedge=95.0)
+    released: threading.Event = threading.Event()
+    count: int = 4 * DEFAULT_WORKERS
+
+    def slow() -> requests.Response:
+        released.wait(10)
+        return _response(500)
+
+    def send(_: int) -> int:
+        return send_request(_session([slow, lambda: _response(200)]), 'GET', 'https://example.com/').status_code
+
+    try:
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            statuses: List[int] = list(pool.map(send, range(count), timeout=5))
+    finally:
+        released.set()
+
+    assert statuses == [200] * count
@@ -0,0 +1,99 @@
+"""Tests for exporting and reading offline snapshots."""
+
+import os
+
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+
+from wolfsoftware.get_language_versions import snapshot
+from wolfsoftware.get_language_versions.constants import SUPPORTED_LANGUAGES
+from wolfsoftware.get_language_versions.exceptions import SnapshotError
+from wolfsoftware.get_language_versions.index import VersionIndex
+from wolfsoftware.get_language_versions.records import VersionRecord
+from wolfsoftware.get_language_versions.snapshot import Snapshot, export_snapshot
+from wolfsoftware.get_language_versions.versions import get_maximum_version
+
+
+def _query(**settings) -> SimpleNamespace:
+    """
+    Build the settings of a query.
+
+    Arguments:
+        **settings: Settings to change from the defaults.
+
+    Returns:
+        SimpleNamespace: The query settings.
+    """
+    config: SimpleNamespace = SimpleNamespace(max_version=get_maximum_version('LATEST'), include_pre_releases=False, remove_patch_version=False,
+                                              highest_only=False, max_versions=0)
+    for name, value in settings.items():
+        setattr(config, name, value)
+    return config
+
+
+@pytest.fixture(name='snapshot_path')
+def fixture_snapshot_path(tmp_path, monkeypatch) -> str:
+    """
+    Export a snapshot of stand-in upstream data, counting how often each source is indexed.
+
+    Returns:
+        str: The snapshot file.
+    """
+    indexed: List[str] = []
+
+    def index(language: str, response: Optional[SimpleNamespace]) -> VersionIndex:  # pylint: disable=unused-argument
+        indexed.append(language)
+        texts: tuple = ('3.11.9', '3.12.0', '3.12.4', '3.13.0rc1') if language != 'go' else ()
+        records: List[Optional[VersionRecord]] = [VersionRecord.parse(text) for text in texts]
+        return VersionIndex(record for record in records if record is not None)
+
+    monkeypatch.setattr(snapshot, 'fetch_stable_versions', lambda language, speculative, stream=False: None)
+    monkeypatch.setattr(snapshot, 'index_versions', index)
+    monkeypatch.setattr(snapshot, 'get_source_tag', lambda language: f'{language}-tag')
+    monkeypatch.setattr(snapshot, 'get_eol_schedule', lambda eol_url: [['3.12', False], ['3.11', '2000-01-01']])
+
+    path: str = str(tmp_path / 'upstream.snapshot')
+    summary: SimpleNamespace = export_snapshot(path, workers=2)
+
+    assert summary.languages == list(SUPPORTED_LANGUAGES)
+    assert summary.size == os.path.getsize(path)
+    assert len(indexed) == len(SUPPORTED_LANGUAGES) - 1
+    return path
+
+
+def test_snapshot_answers_queries(snapshot_path: str) -> None:
+    """A snapshot answers queries, including from the EOL version, without fetching anything."""
+    with Snapshot(snapshot_path) as offline:
+        assert offline.tag('python') == 'python-tag'
+        assert offline.query('python', _query(), 'EOL')["versions"] == ['3.12.4']
+        assert offline.query('nodejs', _query(), '3.11')["versions"] == ['3.11.9', '3.12.4']
+        assert offline.query('ruby', _query(include_pre_releases=True), '3.12')["versions"] == ['3.12.4', '3.13.0rc1']
+        assert not offline.query('go', _query(), 'ALL')["versions"]
+
+
+@pytest.mark.parametrize('damage', ['not a snapshot', 'truncated', 'future format'])
+def test_unreadable_snapshot(snapshot_path: str, damage: str) -> None:
+    """A file that is not a snapshot, is truncated or has an unsupported format version is reported as a SnapshotError."""
+    with open(snapshot_path, 'rb') as handle:
+        data: bytes = handle.read()
+
+    if damage == 'not a snapshot':
+        data = b'NOTSNAP\x00' + data[8:]
+    elif damage == 'truncated':
+        data = data[:20]
+    else:
+        data = data[:8] + b'\xff\xff\xff\xff' + data[12:]
+
+    with open(snapshot_path, 'wb') as handle:
+        handle.write(data)
+
+    with pytest.raises(SnapshotError):
+        Snapshot(snapshot_path)
+
+
+def test_missing_snapshot(tmp_path) -> None:
+    """A snapshot that does not exist is reported as a SnapshotError."""
+    with pytest.raises(SnapshotError):
+        Snapshot(str(tmp_path / 'missing.snapshot'))
@@ -0,0 +1,66 @@
+"""Tests for the local version store."""
+
+import time
+
+from typing import List, Optional
+
+from packaging import version as semver
+
+from wolfsoftware.get_language_versions.records import VersionRecord
+from wolfsoftware.get_language_versions.store import VersionStore
+
+
+def _records(*versions: str) -> List[VersionRecord]:
+    """
+    Parse versions into records.
+
+    Arguments:
+        *versions (str): The versions.
+
+    Returns:
+        List[VersionRecord]: The records.
+    """
+    records: List[Optional[VersionRecord]] = [VersionRecord.parse(text) for text in versions]
+    return [record for record in records if record is not None]
+
+
+def test_first_import_is_a_baseline(tmp_path) -> None:
+    """The versions of the first import of a source are never listed as new, only those added by later refreshes are."""
+    store: VersionStore = VersionStore(str(tmp_path / 'versions.db'))
+    started: float = time.time() - 1
+    low: semver.Version = semver.Version('1.0')
+    high: semver.Version = semver.Version('9.9')
+
+    try:
+        assert store.merge('python', _records('3.11.0', '3.12.0', '3.12.1'), 'v1', 'first') == 3
+        assert not store.since('python', started, low, high)
+
+        assert store.merge('python', _records('3.11.0', '3.12.0', '3.12.1', '3.12.2', '3.13.0'), 'v2', 'second') == 2
+        assert [record.text for record in store.since('python', started, low, high)] == ['3.12.2', '3.13.0']
+
+        assert store.merge('ruby', _records('3.3.0'), 'v1', 'first') == 1
+        assert not store.since('ruby', started, low, high)
+    finally:
+        store.close()
+
+
+def test_withdrawn_versions_are_not_candidates(tmp_path) -> None:
+    """A version upstream stops listing no longer answers queries, but is still listed as new."""
+    store: VersionStore = VersionStore(str(tmp_path / 'versions.db'))
+    started: float = time.time() - 1
+    low: semver.Version = semver.Version('1.0')
+    high: semver.Version = semver.Version('9.9')
+
+    try:
+        store.merge('python', _records('3.12.0', '3.12.1'), 'v1', 'first')
+        assert store.merge('python', _records('3.12.0', '3.12.1', '3.12.2'), 'v2', 'second') == 1
+        assert [record.text for record in store.candidates('python', low, high)] == ['3.12.2']
+
+        assert store.merge('python', _records('3.12.0', '3.12.1'), 'v3', 'third') == 0
+        assert [record.text for record in store.candidates('python', low, high)] == ['3.12.1']
+        assert [record.text for record in store.since('python', started, low, high)] == ['3.12.2']
+
+        assert store.merge('python', _records('3.12.0', '3.12.1', '3.12.2'), 'v4', 'fourth') == 0
+        assert [record.text for record in store.candidates('python', low, high)] == ['3.12.2']
+    finally:
+        store.close()
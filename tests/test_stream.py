@@ -0,0 +1,90 @@
+"""Tests for the incremental extraction of items from JSON documents."""
+
+import json
+
+from types import SimpleNamespace
+from typing import Iterator, List
+
+import pytest
+
+from wolfsoftware.get_language_versions.stream import iter_json_array
+
+
+def _chunks(document: bytes, size: int, progress: SimpleNamespace) -> Iterator[bytes]:
+    """
+    Yield the chunks of a document, recording when the last has been read.
+
+    Arguments:
+        document (bytes): The document.
+        size (int): The size of each chunk.
+        progress (SimpleNamespace): Its exhausted attribute is set once every chunk has been read.
+
+    Yields:
+        bytes: The next chunk.
+    """
+    progress.exhausted = False
+    for offset in range(0, len(document), size):
+        yield document[offset:offset + size]
+    progress.exhausted = True
+
+
+_ARRAY: list = [1.5, -20e3, 123, 0, 1e-07, "a \"quoted\" \\ string", "café ✓", True, False, None, {"a": [1, 2]}, "10.5.1"]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64])
+def test_values_split_across_chunks(size: int) -> None:
+    """Numbers, strings and literals split at any chunk boundary are decoded whole."""
+    progress: SimpleNamespace = SimpleNamespace(exhausted=False)
+    chunks: Iterator[bytes] = _chunks(json.dumps(_ARRAY, ensure_ascii=False).encode('utf-8'), size, progress)
+
+    assert list(iter_json_array(chunks)) == _ARRAY
+    assert progress.exhausted
+
+
+def test_every_split_of_a_number() -> None:
+    """A number split anywhere between two chunks is decoded whole."""
+    document: bytes = b'[12.75e+2, 3]'
+
+    for split in range(1, len(document)):
+        assert list(iter_json_array([document[:split], document[split:]])) == [1275.0, 3]
+
+
+def test_empty_array() -> None:
+    """An empty top level array yields nothing and the document is read to the end."""
+    progress: SimpleNamespace = SimpleNamespace(exhausted=False)
+    chunks: Iterator[bytes] = _chunks(b' [ ] \n', 1, progress)
+
+    assert not list(iter_json_array(chunks))
+    assert progress.exhausted
+
+
+def test_empty_array_through_path() -> None:
+    """An empty array reached through a path yields nothing and the rest of the document is still read."""
+    progress: SimpleNamespace = SimpleNamespace(exhausted=False)
+    chunks: Iterator[bytes] = _chunks(b'{"ruby": [], "jruby": ["9.4.0.0"]}\n', 1, progress)
+
+    assert not list(iter_json_array(chunks, path=('ruby',)))
+    assert progress.exhausted
+
+
+def test_array_through_path_reads_the_whole_document() -> None:
+    """The members after the array are read, so the whole document is consumed."""
+    progress: SimpleNamespace = SimpleNamespace(exhausted=False)
+    document: bytes = b'{"head": {"x": 1}, "data": {"items": [{"v": "1.0", "extra": [1]}, {"v": "2.0"}], "more": "x"}, "tail": [1, 2]}'
+    chunks: Iterator[bytes] = _chunks(document, 5, progress)
+    items: List[dict] = list(iter_json_array(chunks, path=('data', 'items'), fields=('v',)))
+
+    assert items == [{"v": "1.0"}, {"v": "2.0"}]
+    assert progress.exhausted
+
+
+def test_trailing_data_is_rejected() -> None:
+    """Anything other than whitespace after the document is an error."""
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[1, 2]', b' x']))
+
+
+def test_missing_key_is_rejected() -> None:
+    """A key of the path that is not present is an error."""
+    with pytest.raises(KeyError):
+        list(iter_json_array([b'{"ruby": []}'], path=('python',)))
@@ -0,0 +1,70 @@
+"""Tests for the per-phase timing instrumentation."""
+
+from typing import Dict, List
+
+from wolfsoftware.get_language_versions.fetch import FetchResult
+from wolfsoftware.get_language_versions.timings import TimingsReport, count_transfer, measure, subscribe, unsubscribe
+
+
+def _collect(chunks: List[bytes], stream: bool) -> Dict[str, dict]:
+    """
+    Download a body and read it while parsing, collecting the report rows.
+
+    Arguments:
+        chunks (List[bytes]): The body, in chunks.
+        stream (bool): Read the body while parsing rather than while downloading.
+
+    Returns:
+        Dict[str, dict]: The report rows, keyed by phase.
+    """
+    report: TimingsReport = TimingsReport(['python'])
+    subscribe(report.record)
+
+    try:
+        with measure("download", 'python'):
+            response: FetchResult = FetchResult('https://example.com/versions.json', iter(chunks))
+            if not stream:
+                response.load()
+        with measure("parse", 'python'):
+            for _ in response.iter_content():
+                pass
+    finally:
+        unsubscribe(report.record)
+
+    return {span["phase"]: span for span in report.spans()}
+
+
+def test_streamed_body_is_reported_under_download() -> None:
+    """The bytes of a body streamed while parsing are counted under download, not parse."""
+    rows: Dict[str, dict] = _collect([b'[1, ', b'2, ', b'3]'], stream=True)
+
+    assert rows["download"]["bytes"] == 9
+    assert rows["parse"]["bytes"] is None
+    assert set(rows) == {'download', 'parse'}
+
+
+def test_loaded_body_is_reported_under_download() -> None:
+    """The bytes of a body read during the download are counted under download."""
+    rows: Dict[str, dict] = _collect([b'[1, ', b'2, ', b'3]'], stream=False)
+
+    assert rows["download"]["bytes"] == 9
+    assert rows["parse"]["bytes"] is None
+
+
+def test_transfer_time_is_taken_out_of_the_span() -> None:
+    """The time spent reading a body during another phase is reported as a download span of its own."""
+    spans: List[dict] = []
+    subscribe(spans.append)
+
+    try:
+        with measure("parse", 'ruby'):
+            count_transfer(0.5, 100)
+    finally:
+        unsubscribe(spans.append)
+
+    assert len(spans) == 2
+    download: dict = spans[0]
+    parse: dict = spans[1]
+    assert (download["phase"], download["seconds"], download["bytes"]) == ('download', 0.5, 100)
+    assert (parse["phase"], parse["bytes"]) == ('parse', None)
+    assert parse["seconds"] < 0.5
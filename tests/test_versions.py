@@ -0,0 +1,126 @@
+"""Tests for extracting the versions from the upstream versions data."""
+
+import hashlib
+
+from typing import Iterator, List
+
+import requests
+
+from packaging import version as semver
+from requests.adapters import BaseAdapter
+
+from wolfsoftware.get_language_versions.cache import configure_cache, store_entry
+from wolfsoftware.get_language_versions.constants import URLS
+from wolfsoftware.get_language_versions.fetch import FetchResult, create_session, fetch_url, set_session
+from wolfsoftware.get_language_versions.records import VersionRecord
+from wolfsoftware.get_language_versions.resilience import configure_requests
+from wolfsoftware.get_language_versions.transport import RecordingStore, mount_transport
+from wolfsoftware.get_language_versions.versions import extract_versions, fetch_stable_versions
+
+
+def _terraform_listing() -> bytes:
+    """
+    Build a Terraform releases listing, newest first, larger than a single streamed chunk.
+
+    Returns:
+        bytes: The listing HTML.
+    """
+    links: str = ''.join(f'<li><a href="/terraform/1.{minor}.{patch}/">terraform_1.{minor}.{patch}</a></li>\n'
+                         for minor in range(9, -1, -1) for patch in range(299, -1, -1))
+    return f'<html><body><ul>\n<li><a href="../">../</a></li>\n{links}</ul></body></html>\n'.encode('utf-8')
+
+
+def _counted(chunks: Iterator[bytes], counter: List[int]) -> Iterator[bytes]:
+    """
+    Pass chunks through, counting the bytes read.
+
+    Arguments:
+        chunks (Iterator[bytes]): The chunks.
+        counter (List[int]): Its only item is increased by the size of each chunk.
+
+    Yields:
+        bytes: The next chunk.
+    """
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+
+def test_terraform_early_stop_still_caches_the_listing(tmp_path) -> None:
+    """
+    A scan that stops early reads the rest of a listing that is being cached, and only what it scans otherwise.
+
+    The first run downloads the listing in full, so that the second is answered from the cache, which
+    then stops reading at the early stop. With the cache disabled the download itself stops early.
+    """
+    url: str = URLS["terraform"]["versions_url"]
+    listing: bytes = _terraform_listing()
+    RecordingStore(str(tmp_path / 'recordings')).save('GET', url, 200, {"Content-Type": 'text/html'}, listing)
+
+    set_session(mount_transport(create_session(), 1, replay=str(tmp_path / 'recordings')))
+
+    try:
+        for from_cache, enabled in ((False, True), (True, True), (False, False)):
+            configure_cache(enabled=enabled, directory=str(tmp_path / 'cache'))
+            response: FetchResult = fetch_url(url, stream=True)
+            read: List[int] = [0]
+            records: List[VersionRecord] = extract_versions("terraform", _counted(response.iter_content(), read), semver.Version('1.8'),
+                                                            read_all=response.caching)
+
+            assert response.from_cache is from_cache
+            assert (read[0] == len(listing)) is (enabled and not from_cache)
+            if enabled:
+                assert response.known_digest == hashlib.sha256(listing).hexdigest()
+            # The scan stopped early, well before the oldest versions
+            assert records[-1].text != '1.0.0'
+            assert {record.text for record in records} >= {'1.9.299', '1.8.0'}
+    finally:
+        set_session(None)
+        configure_cache()
+
+
+class _UnreachableAdapter(BaseAdapter):
+    """Fail every request as if upstream could not be reached."""
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:  # pylint: disable=signature-differs,unused-argument
+        """
+        Fail a request.
+
+        Arguments:
+            request (requests.PreparedRequest): The request.
+            *args: The positional arguments of BaseAdapter.send() (unused).
+            **kwargs: The keyword arguments of BaseAdapter.send() (unused).
+
+        Raises:
+            requests.ConnectionError: Always.
+        """
+        raise requests.ConnectionError(f"{request.url} is unreachable")
+
+    def close(self) -> None:
+        """Release nothing, as no connections are opened."""
+
+
+def test_speculative_fetch_falls_back_when_the_head_branch_fails(tmp_path) -> None:
+    """With upstream unreachable, a speculative fetch still answers from the cached tagged copy."""
+    urls: dict = URLS["python"]
+    tagged_url: str = urls["versions_url"].replace('LATEST_TAG', '3.12.4-9947065640')
+    manifest: bytes = b'[{"version": "3.12.4", "stable": true}]'
+
+    configure_cache(directory=str(tmp_path / 'cache'))
+    configure_requests(retries=0)
+    session: requests.Session = create_session()
+    session.mount('https://', _UnreachableAdapter())
+    set_session(session)
+
+    try:
+        store_entry(urls["releases_url"], urls["releases_url"].replace('latest/', 'tag/3.12.4-9947065640'), b'', None, None)
+        store_entry(tagged_url, tagged_url, manifest, None, None)
+
+        response: FetchResult = fetch_stable_versions("python", speculative=True)
+
+        assert response.from_cache
+        assert response.content == manifest
+    finally:
+        set_session(None)
+        configure_requests()
+        configure_cache()
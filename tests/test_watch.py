@@ -0,0 +1,77 @@
+"""Tests for watching upstream for newly released versions."""
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from packaging import version as semver
+
+from wolfsoftware.get_language_versions import watch
+from wolfsoftware.get_language_versions.fetch import FetchResult
+from wolfsoftware.get_language_versions.watch import VersionWatcher, diff_versions
+
+
+def test_diff_versions() -> None:
+    """The added versions are reported in the order of this poll, then the removed ones in the order of the previous poll."""
+    events: List[dict] = diff_versions('python', ['3.12.1', '3.11.8', '3.10.13'], ['3.13.0', '3.12.2', '3.11.8'], 'v1')
+    expected: List[tuple] = [('added', '3.13.0'), ('added', '3.12.2'), ('removed', '3.12.1'), ('removed', '3.10.13')]
+
+    assert [(event["event"], event["version"]) for event in events] == expected
+    assert {(event["language"], event["tag"]) for event in events} == {('python', 'v1')}
+    assert not diff_versions('python', ['3.12.1'], ['3.12.1'], None)
+
+
+def _minimum(text: str) -> Future:
+    """
+    Resolve a minimum version as the watcher does.
+
+    Arguments:
+        text (str): The minimum version.
+
+    Returns:
+        Future: The resolved minimum version.
+    """
+    future: Future = Future()
+    future.set_result(semver.Version(text))
+    return future
+
+
+def test_unchanged_source_is_not_parsed(monkeypatch) -> None:
+    """A poll skips parsing when the digest and the minimum version are unchanged, and reports the changes otherwise."""
+    upstream: SimpleNamespace = SimpleNamespace(digest='a', versions=['3.12.1'], parsed=0)
+
+    def fetch(language: str, speculative: bool, stream: bool = False) -> FetchResult:  # pylint: disable=unused-argument
+        response: FetchResult = FetchResult(f'https://example.com/{language}.json', iter([b'[]']), from_cache=True)
+        response.known_digest = upstream.digest
+        return response
+
+    def load(*args) -> Callable[[semver.Version], List[str]]:  # pylint: disable=unused-argument
+        upstream.parsed += 1
+        return lambda minimum: [version for version in upstream.versions if semver.Version(version) >= minimum]
+
+    monkeypatch.setattr(watch, 'fetch_stable_versions', fetch)
+    monkeypatch.setattr(watch, 'load_answerer', load)
+    monkeypatch.setattr(watch, 'get_source_tag', lambda language: 'v1')
+
+    min_version: Dict[str, Future] = {'python': _minimum('3.0')}
+    watcher: VersionWatcher = VersionWatcher(SimpleNamespace(languages=['python'], speculative=False, min_version=min_version, workers=1), '3.0')
+
+    def poll() -> List[tuple]:
+        return [(event["event"], event["version"]) for event in watcher._poll_source('python')['python']]  # pylint: disable=protected-access
+
+    assert not poll()
+    assert (upstream.parsed, watcher.versions('python')) == (1, ['3.12.1'])
+
+    upstream.versions = ['3.12.2', '3.12.1']
+    assert not poll()
+    assert upstream.parsed == 1
+
+    min_version['python'] = _minimum('3.12.2')
+    assert poll() == [('added', '3.12.2'), ('removed', '3.12.1')]
+    assert upstream.parsed == 2
+
+    upstream.digest = 'b'
+    upstream.versions = ['3.12.3', '3.12.2']
+    assert poll() == [('added', '3.12.3')]
+    assert upstream.parsed == 3
+    assert watcher.versions('python') == ['3.12.3', '3.12.2']
@@ -0,0 +1,276 @@
+"""
+This module answers a file of queries in one run.
+
+Each line of the file is a query written with the same query options as the command line (for
+example "-l python node -m 3.9 -R"). Before anything is fetched the queries are planned: the
+distinct versions sources and EOL feeds needed by all of the queries are collected so that each
+is fetched and parsed exactly once, then every query is answered in memory from the resulting
+indexes and the results are returned in input order.
+"""
+
+import argparse
+import json
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, NoReturn, Optional, TextIO
+
+from packaging import version as semver
+
+from .constants import SUPPORTED_LANGUAGES
+from .exceptions import InvalidQueryError
+from .globals import DEFAULT_WORKERS
+from .index import VersionIndex
+from .output import progress_reporter
+from .parsing import index_versions
+from .snapshot import Snapshot
+from .timings import annotate, measure
+from .utils import list_language_versions
+from .validation import positive_int, validate_languages
+from .versions import fetch_stable_versions, get_maximum_version, get_minimum_version, get_source_key
+from .workers import map_unique, submit_unique
+
+
+class _QueryArgumentParser(argparse.ArgumentParser):
+    """An argument parser that raises ValueError instead of exiting, so that a bad query can be reported with its line number."""
+
+    def error(self, message: str) -> NoReturn:
+        """
+        Raise the error instead of printing the usage and exiting.
+
+        Arguments:
+            message (str): The error message.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError(message)
+
+
+def _setup_query_parser() -> argparse.ArgumentParser:
+    """
+    Configure the argument parser for a single query.
+
+    Returns:
+        argparse.ArgumentParser: The configured argument parser.
+    """
+    parser: argparse.ArgumentParser = _QueryArgumentParser(add_help=False)
+
+    parser.add_argument('-A', '--all', action='store_true')
+    parser.add_argument('-H', '--highest-only', action='store_true')
+    parser.add_argument('-P', '--include-pre-releases', action='store_true')
+    parser.add_argument('-R', '--remove-patch-version', action='store_true')
+    parser.add_argument('-m', '--min-version', type=str, default='EOL')
+    parser.add_argument('-M', '--max-version', type=str, default='LATEST')
+    parser.add_argument('-V', '--max-versions', type=positive_int, default=0)
+    parser.add_argument('-l', '--language', type=str.lower, nargs='+', choices=SUPPORTED_LANGUAGES)
+
+    return parser
+
+
+def parse_query(text: str, line_number: int, parser: argparse.ArgumentParser) -> SimpleNamespace:
+    """
+    Parse a single query.
+
+    Arguments:
+        text (str): The query, using the command line query options.
+        line_number (int): The line the query was read from.
+        parser (argparse.ArgumentParser): The query argument parser.
+
+    Returns:
+        SimpleNamespace: The query, holding its line number and text, the languages, the min-version string and
+            the settings used to answer it (max_version, include_pre_releases, remove_patch_version, highest_only
+            and max_versions).
+
+    Raises:
+        InvalidQueryError: If the query is not valid.
+    """
+    try:
+        args: argparse.Namespace = parser.parse_args(text.split())
+        languages: List[str] = validate_languages(args)
+        if args.remove_patch_version and args.include_pre_releases:
+            raise ValueError("argument -P/--include-pre-released: not allowed with argument -R/--remove-patch-version")
+        max_version: semver.Version = get_maximum_version(args.max_version)
+        if args.min_version.upper() not in ('EOL', 'ALL'):
+            semver.parse(args.min_version)
+    except (ValueError, argparse.ArgumentTypeError, semver.InvalidVersion) as err:
+        raise InvalidQueryError(f"Invalid query on line {line_number}: {err}") from err
+
+    return SimpleNamespace(line=line_number, text=text, languages=languages, min_version=args.min_version, max_version=max_version,
+                           include_pre_releases=args.include_pre_releases, remove_patch_version=args.remove_patch_version,
+                           highest_only=args.highest_only, max_versions=args.max_versions)
+
+
+def read_queries(lines: Iterable[str]) -> List[SimpleNamespace]:
+    """
+    Read queries, one per line, skipping blank lines and comments (lines starting with #).
+
+    Arguments:
+        lines (Iterable[str]): The lines to read.
+
+    Returns:
+        List[SimpleNamespace]: The parsed queries, in input order.
+
+    Raises:
+        InvalidQueryError: If any query is not valid.
+    """
+    parser: argparse.ArgumentParser = _setup_query_parser()
+    queries: List[SimpleNamespace] = []
+
+    for line_number, line in enumerate(lines, start=1):
+        text: str = line.strip()
+        if text and not text.startswith('#'):
+            queries.append(parse_query(text, line_number, parser))
+
+    return queries
+
+
+def plan_queries(queries: List[SimpleNamespace]) -> SimpleNamespace:
+    """
+    Work out which upstream data is needed to answer every query.
+
+    Arguments:
+        queries (List[SimpleNamespace]): The queries.
+
+    Returns:
+        SimpleNamespace: The plan, holding the languages whose versions data is needed (languages) and the
+            languages whose EOL data is needed (eol_languages). Languages that share a source are fetched once.
+    """
+    languages: Dict[str, None] = {}
+    eol_languages: Dict[str, None] = {}
+
+    for query in queries:
+        for language in query.languages:
+            languages[language] = None
+            if query.min_version.upper() == 'EOL':
+                eol_languages[language] = None
+
+    return SimpleNamespace(languages=list(languages), eol_languages=list(eol_languages))
+
+
+def run_queries(queries: List[SimpleNamespace], speculative: bool = False, workers: int = DEFAULT_WORKERS,
+                snapshot: Optional[Snapshot] = None) -> List[SimpleNamespace]:
+    """
+    Answer every query, fetching and parsing each upstream source exactly once.
+
+    The EOL feeds are fetched in the background while the versions data is fetched and indexed, then
+    every query is answered in memory. If a snapshot is given nothing is fetched, the queries are
+    answered from the snapshot instead.
+
+    Arguments:
+        queries (List[SimpleNamespace]): The queries.
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+        workers (int): The maximum number of concurrent fetches.
+        snapshot (Optional[Snapshot]): The snapshot to answer the queries from, if offline.
+
+    Returns:
+        List[SimpleNamespace]: For each query, in input order, the query and the versions for each of its languages.
+    """
+    if snapshot is not None:
+        return [SimpleNamespace(query=query, versions={language: snapshot.query(language, query, query.min_version)["versions"]
+                                                       for language in query.languages}) for query in queries]
+
+    plan: SimpleNamespace = plan_queries(queries)
+
+    eol_versions: Dict[str, Future] = submit_unique(lambda language: get_minimum_version('EOL', language), plan.eol_languages,
+                                                    key=lambda language: get_source_key(language, "eol_url"), max_workers=workers)
+
+    def load_index(language: str) -> VersionIndex:
+        return index_versions(language, fetch_stable_versions(language, speculative, stream=True))
+
+    with progress_reporter(f"Answering {len(queries)} queries for {', '.join(plan.languages)}") as progress:
+        indexes: Dict[str, VersionIndex] = map_unique(load_index, plan.languages, key=get_source_key, max_workers=workers)
+        progress.completed(plan.languages)
+
+    results: List[SimpleNamespace] = []
+
+    for query in queries:
+        versions: Dict[str, List[str]] = {}
+        for language in query.languages:
+            min_version: semver.Version
+            if query.min_version.upper() == 'EOL':
+                min_version = eol_versions[language].result()
+            else:
+                min_version = get_minimum_version(query.min_version, language)
+            with measure("filter", language):
+                versions[language] = indexes[language].query(query, min_version)
+                annotate(items=len(versions[language]))
+        results.append(SimpleNamespace(query=query, versions=versions))
+
+    return results
+
+
+def run_bulk(source: TextIO, speculative: bool = False, workers: int = DEFAULT_WORKERS, snapshot: Optional[Snapshot] = None) -> List[SimpleNamespace]:
+    """
+    Read and answer the queries in a file.
+
+    Arguments:
+        source (TextIO): The file to read queries from.
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+        workers (int): The maximum number of concurrent fetches.
+        snapshot (Optional[Snapshot]): The snapshot to answer the queries from, if offline.
+
+    Returns:
+        List[SimpleNamespace]: For each query, in input order, the query and the versions for each of its languages.
+    """
+    queries: List[SimpleNamespace] = read_queries(source)
+    if not queries:
+        return []
+    return run_queries(queries, speculative, workers, snapshot)
+
+
+def _bulk_record(result: SimpleNamespace) -> dict:
+    """
+    Build the structured result for a bulk query.
+
+    Arguments:
+        result (SimpleNamespace): The query and its versions.
+
+    Returns:
+        dict: The structured result, holding the line number, the query text and the versions for each language.
+    """
+    return {"line": result.query.line, "query": result.query.text, "versions": result.versions}
+
+
+def _matrix_include(results: List[SimpleNamespace]) -> List[dict]:
+    """
+    Build the GitHub Actions matrix entries for every language and version returned by the queries.
+
+    Arguments:
+        results (List[SimpleNamespace]): The queries and their versions.
+
+    Returns:
+        List[dict]: The distinct language and version pairs, in the order they were first returned.
+    """
+    seen: Dict[tuple, dict] = {}
+
+    for result in results:
+        for language, versions in result.versions.items():
+            for version in versions:
+                seen.setdefault((language, version), {"language": language, "version": version})
+
+    return list(seen.values())
+
+
+def write_results(results: List[SimpleNamespace], output_format: str) -> None:
+    """
+    Write the results of the queries, in input order.
+
+    In text format the versions of each query are listed in the same way as for a single query, in
+    the structured formats each query is a record holding its line number, text and versions (for
+    matrix, the distinct language and version pairs across all of the queries are written).
+
+    Arguments:
+        results (List[SimpleNamespace]): The queries and their versions.
+        output_format (str): The output format, one of OUTPUT_FORMATS.
+    """
+    if output_format == 'text':
+        for result in results:
+            list_language_versions(result.query, result.versions)
+    elif output_format == 'ndjson':
+        for result in results:
+            print(json.dumps(_bulk_record(result), separators=(',', ':')))
+    elif output_format == 'json':
+        print(json.dumps([_bulk_record(result) for result in results], indent=2))
+    elif output_format == 'matrix':
+        print(json.dumps({"include": _matrix_include(results)}, separators=(',', ':')))
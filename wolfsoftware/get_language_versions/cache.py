@@ -0,0 +1,287 @@
+"""
+This module provides a persistent on-disk cache for upstream HTTP responses.
+
+Entries are keyed by URL and stored as a pair of files: the raw response body and a small JSON
+metadata file holding the validators (ETag / Last-Modified), a digest of the body, the final URL
+after any redirects and the time the entry was last confirmed to be fresh. The cache directory is
+shared with other files (e.g. the version store and the persisted memo), so clearing the cache only
+removes the entry files.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from types import SimpleNamespace
+from typing import BinaryIO, Iterator, Optional, Pattern
+
+from .globals import CACHE_DIRECTORY, CACHE_TTL, EOL_TTL
+
+# Matches the names of the files of a cache entry (see _entry_path)
+_ENTRY_FILE: Pattern = re.compile(r'[0-9a-f]{64}\.(?:json|body)')
+
+# Runtime cache settings, these are updated by configure_cache()
+CACHE_SETTINGS: SimpleNamespace = SimpleNamespace(enabled=True, refresh=False, ttl=CACHE_TTL, directory=CACHE_DIRECTORY, eol_ttl=EOL_TTL)
+
+
+def configure_cache(enabled: bool = True, refresh: bool = False, ttl: int = CACHE_TTL, directory: str = CACHE_DIRECTORY, eol_ttl: int = EOL_TTL) -> None:
+    """
+    Configure how the cache is used for subsequent fetches.
+
+    Arguments:
+        enabled (bool): Read from and write to the cache (False bypasses it entirely).
+        refresh (bool): Revalidate every entry with upstream regardless of its age.
+        ttl (int): The number of seconds an entry is considered fresh without revalidation.
+        directory (str): The directory the cache entries are stored in.
+        eol_ttl (int): The number of seconds a stored EOL schedule is used before revalidation.
+    """
+    CACHE_SETTINGS.enabled = enabled
+    CACHE_SETTINGS.refresh = refresh
+    CACHE_SETTINGS.ttl = ttl
+    CACHE_SETTINGS.directory = directory
+    CACHE_SETTINGS.eol_ttl = eol_ttl
+
+
+def clear_cache() -> None:
+    """
+    Remove every entry (response, latest tag and EOL schedule) from the cache directory.
+
+    Only the entry files are removed, the directory and anything else in it are left alone.
+    """
+    try:
+        names: list = os.listdir(CACHE_SETTINGS.directory)
+    except OSError:
+        return
+
+    for name in names:
+        if _ENTRY_FILE.fullmatch(name):
+            try:
+                os.unlink(os.path.join(CACHE_SETTINGS.directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def _entry_path(url: str, suffix: str) -> str:
+    """
+    Get the path of a cache file for the given URL.
+
+    Arguments:
+        url (str): The URL the entry belongs to.
+        suffix (str): The file suffix, either "json" (metadata) or "body".
+
+    Returns:
+        str: The path to the cache file.
+    """
+    return os.path.join(CACHE_SETTINGS.directory, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.{suffix}")
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """
+    Write data to a file atomically so that concurrent readers never see a partial file.
+
+    Arguments:
+        path (str): The destination path.
+        data (bytes): The data to write.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_entry(url: str) -> Optional[SimpleNamespace]:
+    """
+    Load the cache entry metadata for a URL.
+
+    Arguments:
+        url (str): The URL to look up.
+
+    Returns:
+        Optional[SimpleNamespace]: The entry metadata, or None if there is no usable entry.
+    """
+    if not CACHE_SETTINGS.enabled:
+        return None
+
+    try:
+        with open(_entry_path(url, 'json'), 'r', encoding='UTF-8') as handle:
+            entry: SimpleNamespace = SimpleNamespace(**json.load(handle))
+    except (OSError, ValueError, TypeError):
+        return None
+
+    if not os.path.exists(_entry_path(url, 'body')):
+        return None
+
+    return entry
+
+
+def load_body(url: str) -> bytes:
+    """
+    Load the cached response body for a URL.
+
+    Arguments:
+        url (str): The URL to look up.
+
+    Returns:
+        bytes: The cached response body.
+    """
+    with open(_entry_path(url, 'body'), 'rb') as handle:
+        return handle.read()
+
+
+def iter_body(url: str, chunk_size: int) -> Iterator[bytes]:
+    """
+    Read the cached response body for a URL in chunks.
+
+    Arguments:
+        url (str): The URL to look up.
+        chunk_size (int): The maximum size of each chunk.
+
+    Yields:
+        bytes: The next chunk of the cached response body.
+    """
+    with open(_entry_path(url, 'body'), 'rb') as handle:
+        while True:
+            chunk: bytes = handle.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def is_fresh(entry: SimpleNamespace, ttl: Optional[int] = None) -> bool:
+    """
+    Check whether a cache entry can be used without revalidating it with upstream.
+
+    Arguments:
+        entry (SimpleNamespace): The entry metadata.
+        ttl (Optional[int]): The TTL to apply, defaults to the configured cache TTL.
+
+    Returns:
+        bool: True if the entry is within its TTL and a refresh has not been requested.
+    """
+    if ttl is None:
+        ttl = CACHE_SETTINGS.ttl
+    return not CACHE_SETTINGS.refresh and (time.time() - entry.fetched_at) < ttl
+
+
+class EntryWriter:
+    """
+    Incrementally write a response body into the cache as it is downloaded.
+
+    The body is written to a temporary file and only becomes visible as a cache entry once
+    commit() is called, so an interrupted or abandoned download never leaves a partial entry.
+
+    Arguments:
+        url (str): The requested URL.
+    """
+
+    def __init__(self, url: str) -> None:
+        """Initialise the writer and open the temporary body file."""
+        self.url: str = url
+        self._hash = hashlib.sha256()
+        self._handle: Optional[BinaryIO] = None
+        self._tmp_path: Optional[str] = None
+
+        if CACHE_SETTINGS.enabled:
+            try:
+                os.makedirs(CACHE_SETTINGS.directory, exist_ok=True)
+                fd, self._tmp_path = tempfile.mkstemp(dir=CACHE_SETTINGS.directory, prefix='.tmp-')
+                self._handle = os.fdopen(fd, 'wb')
+            except OSError:
+                self._handle = None
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Append a chunk of the response body.
+
+        Arguments:
+            chunk (bytes): The chunk to append.
+        """
+        self._hash.update(chunk)
+        if self._handle is not None:
+            try:
+                self._handle.write(chunk)
+            except OSError:
+                self.abort()
+
+    def commit(self, final_url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """
+        Store the written body and its metadata as the cache entry for the URL.
+
+        Arguments:
+            final_url (str): The URL of the response after following any redirects.
+            etag (Optional[str]): The ETag validator returned by upstream, if any.
+            last_modified (Optional[str]): The Last-Modified validator returned by upstream, if any.
+        """
+        if self._handle is None or self._tmp_path is None:
+            return
+
+        metadata: dict = {
+            "url": self.url,
+            "final_url": final_url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "digest": self._hash.hexdigest(),
+            "fetched_at": time.time(),
+        }
+
+        try:
+            self._handle.close()
+            self._handle = None
+            os.replace(self._tmp_path, _entry_path(self.url, 'body'))
+            self._tmp_path = None
+            _write_atomic(_entry_path(self.url, 'json'), json.dumps(metadata).encode('utf-8'))
+        except OSError:
+            self.abort()
+
+    def abort(self) -> None:
+        """Discard anything written so far."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self._tmp_path is not None and os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+        self._tmp_path = None
+
+
+def store_entry(url: str, final_url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+    """
+    Store a response in the cache.
+
+    Arguments:
+        url (str): The requested URL.
+        final_url (str): The URL of the response after following any redirects.
+        body (bytes): The response body.
+        etag (Optional[str]): The ETag validator returned by upstream, if any.
+        last_modified (Optional[str]): The Last-Modified validator returned by upstream, if any.
+    """
+    writer: EntryWriter = EntryWriter(url)
+    writer.write(body)
+    writer.commit(final_url, etag, last_modified)
+
+
+def touch_entry(url: str, entry: SimpleNamespace) -> None:
+    """
+    Mark an existing cache entry as fresh again (after upstream confirmed it is unchanged).
+
+    Arguments:
+        url (str): The URL the entry belongs to.
+        entry (SimpleNamespace): The entry metadata.
+    """
+    if not CACHE_SETTINGS.enabled:
+        return
+
+    entry.fetched_at = time.time()
+
+    try:
+        _write_atomic(_entry_path(url, 'json'), json.dumps(vars(entry)).encode('utf-8'))
+    except OSError:
+        pass
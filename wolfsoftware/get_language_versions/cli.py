@@ -9,34 +9,107 @@ input arguments.
 """
 
 import argparse
+import os
 import sys
 
 from types import SimpleNamespace
+from typing import Any, Dict, Optional
 
-from .config import create_configuration_from_arguments
+from .cache import clear_cache, configure_cache
 from .constants import SUPPORTED_LANGUAGES
-from .globals import ARG_PARSER_PROG_NAME, ARG_PARSER_DESCRIPTION, ARG_PARSER_EPILOG, VERSION_STRING
-from .process import process_languages
+from .globals import ARG_PARSER_PROG_NAME, ARG_PARSER_DESCRIPTION, ARG_PARSER_EPILOG, get_version_string
+from .globals import CACHE_DIRECTORY, CACHE_TTL, DEFAULT_WORKERS, EOL_TTL, MEMO_SIZE, POOL_SIZE
+from .globals import HEDGE_PERCENTILE, REQUESTS_TIMEOUT, RETRIES
+from .globals import DAEMON_HOST, DAEMON_PORT, DAEMON_REFRESH_INTERVAL, DAEMON_URL_ENV, WATCH_INTERVAL
+from .memo import configure_memo
+from .output import OUTPUT_FORMATS, ResultWriter, configure_output
+from .timings import TIMINGS_FORMATS, TimingsReport, subscribe, unsubscribe
 from .utils import list_supported_languages, list_language_versions
+from .validation import non_negative_int, percentile, positive_int, timestamp, validate_languages
 
 
-def positive_int(value: str) -> int:
+class VersionAction(argparse.Action):
     """
-    Ensure the provided value is a positive integer.
+    Show the version of the program and exit, looking the version up only when it is requested.
 
     Arguments:
-        value (str): The value to be validated.
+        argparse.Action (argparse.Action): Inherits from the base argparse Action class.
+    """
 
-    Returns:
-        int: The validated positive integer.
+    def __init__(self, option_strings: list, dest: str = argparse.SUPPRESS, default: str = argparse.SUPPRESS,
+                 help: Optional[str] = None) -> None:  # pylint: disable=redefined-builtin
+        """Initialise the action, which takes no values."""
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
 
-    Raises:
-        argparse.ArgumentTypeError: If the value is not a positive integer.
+    def __call__(self, parser: argparse.ArgumentParser, namespace: argparse.Namespace, values: Any, option_string: Optional[str] = None) -> None:
+        """Print the version string and exit."""
+        parser.exit(message=f"{get_version_string()}\n")
+
+
+def add_connection_arguments(connection: argparse._ArgumentGroup) -> None:
+    """
+    Add the arguments controlling how upstream is reached: pooling, the deadline, retry and hedging policy, and the transport.
+
+    Arguments:
+        connection (argparse._ArgumentGroup): The connection argument group.
+    """
+    connection.add_argument('--pool-size', type=positive_int, default=POOL_SIZE, help='The maximum number of pooled connections per host')
+    connection.add_argument('--no-keep-alive', action='store_true', help='Close connections after each request instead of reusing them.')
+    connection.add_argument('--timeout', type=positive_int, default=REQUESTS_TIMEOUT, help='The number of seconds each upstream request is given')
+    connection.add_argument('--deadline', type=positive_int, metavar='SECONDS',
+                            help='The number of seconds every upstream request must complete within, falling back to stale cached responses after it')
+    connection.add_argument('--retries', type=non_negative_int, default=RETRIES, help='The number of times a failed upstream request is retried')
+    connection.add_argument('--hedge', type=percentile, nargs='?', const=HEDGE_PERCENTILE, metavar='PERCENTILE',
+                            help=f'Send an upstream request again if it is slower than PERCENTILE (default {HEDGE_PERCENTILE:g}) of recent requests')
+    connection.add_argument('--record', type=str, metavar='DIR', help='Record every upstream response in DIR, for --replay or a stand-in upstream server')
+    connection.add_argument('--replay', type=str, metavar='DIR',
+                            help='Answer every upstream request from the responses recorded in DIR, with no network access')
+    connection.add_argument('--upstream', type=str, metavar='URL',
+                            help='Send every upstream request to the stand-in upstream server at URL (see wolfsoftware.get_language_versions.upstream)')
+
+
+def add_mode_arguments(daemon: argparse._ArgumentGroup, bulk: argparse._ArgumentGroup, snapshot: argparse._ArgumentGroup,
+                       store: argparse._ArgumentGroup, watch: argparse._ArgumentGroup) -> None:
+    """
+    Add the arguments for the alternative ways of answering queries.
+
+    Arguments:
+        daemon (argparse._ArgumentGroup): The daemon argument group.
+        bulk (argparse._ArgumentGroup): The bulk argument group.
+        snapshot (argparse._ArgumentGroup): The snapshot argument group.
+        store (argparse._ArgumentGroup): The store argument group.
+        watch (argparse._ArgumentGroup): The watch argument group.
     """
-    ivalue = int(value)
-    if ivalue <= 0:
-        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
-    return ivalue
+    # Daemon arguments
+    daemon.add_argument('--serve', action='store_true', help='Run as a query daemon, keeping every language loaded in memory.')
+    daemon.add_argument('--host', type=str, default=DAEMON_HOST, help='The host the query daemon listens on')
+    daemon.add_argument('--port', type=int, default=DAEMON_PORT, help='The port the query daemon listens on')
+    daemon.add_argument('--refresh-interval', type=positive_int, default=DAEMON_REFRESH_INTERVAL,
+                        help='The number of seconds between background refreshes in the query daemon')
+    daemon.add_argument('--daemon', type=str, default=os.environ.get(DAEMON_URL_ENV),
+                        help=f'The URL of a query daemon to use when it is reachable (or set {DAEMON_URL_ENV})')
+    daemon.add_argument('--no-daemon', action='store_true', help='Never use a query daemon.')
+
+    # Bulk arguments
+    bulk.add_argument('--bulk', type=argparse.FileType('r'), metavar='FILE',
+                      help='Answer every query in FILE (one per line, using the query options above, - for stdin), fetching each source once')
+
+    # Snapshot arguments
+    snapshot.add_argument('--snapshot-export', type=str, metavar='FILE', help='Capture the data for every supported language into a snapshot FILE and exit')
+    snapshot.add_argument('--snapshot', type=str, metavar='FILE', help='Answer queries from a snapshot FILE, with no network access')
+    snapshot.add_argument('--offline', action='store_true', help='Never access the network (requires --snapshot).')
+
+    # Store arguments
+    store.add_argument('--store', action='store_true', help='Record every version seen in the local version store, and answer queries from it.')
+    store.add_argument('--store-path', type=str, metavar='FILE', help='The version store database (defaults to a file in the cache directory)')
+    store.add_argument('--since', type=timestamp, metavar='DATE',
+                       help='List every version first seen in the version store since DATE, excluding those already listed when a source was first '
+                            'stored (an ISO 8601 date or date and time, implies --store)')
+
+    # Watch arguments
+    watch.add_argument('--watch', type=positive_int, nargs='?', const=WATCH_INTERVAL, metavar='SECONDS',
+                       help=f'Poll every SECONDS (default {WATCH_INTERVAL}) and only write the versions added to or removed from the result')
+    watch.add_argument('--watch-count', type=positive_int, metavar='N', help='Stop watching after N polls')
 
 
 def setup_arg_parser() -> argparse.ArgumentParser:
@@ -55,28 +128,129 @@ def setup_arg_parser() -> argparse.ArgumentParser:
     flags: argparse._ArgumentGroup = parser.add_argument_group('flags')
     optional_flags: argparse._ArgumentGroup = parser.add_argument_group('optional flags')
     optional: argparse._ArgumentGroup = parser.add_argument_group('optional')
+    cache: argparse._ArgumentGroup = parser.add_argument_group('cache')
+    connection: argparse._ArgumentGroup = parser.add_argument_group('connection')
+    daemon: argparse._ArgumentGroup = parser.add_argument_group('daemon')
+    bulk: argparse._ArgumentGroup = parser.add_argument_group('bulk')
+    snapshot: argparse._ArgumentGroup = parser.add_argument_group('snapshot')
+    store: argparse._ArgumentGroup = parser.add_argument_group('store')
+    watch: argparse._ArgumentGroup = parser.add_argument_group('watch')
+    output: argparse._ArgumentGroup = parser.add_argument_group('output')
     required: argparse._ArgumentGroup = parser.add_argument_group('required')
 
     # Command line flags
     flags.add_argument("-h", "--help", action="help", default=argparse.SUPPRESS, help="Show this help message and exit.")
-    flags.add_argument('-v', '--version', action='version', version=VERSION_STRING, help="Show program's version number and exit.")
+    flags.add_argument('-v', '--version', action=VersionAction, help="Show program's version number and exit.")
 
+    optional_flags.add_argument('-A', '--all', action='store_true', help='Check all of the supported languages.')
     optional_flags.add_argument('-H', '--highest-only', action='store_true', help='Only return the highest version found.')
     optional_flags.add_argument('-L', '--list-languages', action='store_true', help='List the supported languages')
     optional_flags.add_argument('-P', '--include-pre-releases', action='store_true', help='Include pre-release versions')
     optional_flags.add_argument('-R', '--remove-patch-version', action='store_true', help='Strip the patch version from the returned versions.')
+    optional_flags.add_argument('-S', '--speculative', action='store_true', help='Fetch the head branch versions data while resolving the latest tag.')
 
     # Optional arguments
     optional.add_argument('-m', '--min-version', type=str, default='EOL', help='The minimum version to start from')
     optional.add_argument('-M', '--max-version', type=str, default='LATEST', help='The maximum version to include')
     optional.add_argument('-V', '--max-versions', type=positive_int, default=0, help='The maximum number of versions to return')
+    optional.add_argument('-w', '--workers', type=positive_int, default=DEFAULT_WORKERS, help='The maximum number of concurrent fetches')
+    optional.add_argument('--processes', type=positive_int, nargs='?', const=os.cpu_count() or 1, metavar='N',
+                          help='Parse the versions data in N worker processes, so parsing overlaps downloading (default N: one per CPU)')
+
+    # Cache arguments
+    cache.add_argument('--no-cache', action='store_true', help='Bypass the response cache completely.')
+    cache.add_argument('--refresh-cache', action='store_true', help='Revalidate every cached response with upstream.')
+    cache.add_argument('--clear-cache', action='store_true', help='Remove all cached responses.')
+    cache.add_argument('--cache-ttl', type=positive_int, default=CACHE_TTL, help='The number of seconds a cached response is used before revalidation')
+    cache.add_argument('--cache-dir', type=str, metavar='DIR',
+                       help='The directory to store cached responses in (defaults to $XDG_CACHE_HOME/get-language-versions, or ~/.cache/get-language-versions)')
+    cache.add_argument('--eol-ttl', type=positive_int, default=EOL_TTL,
+                       help='The number of seconds the stored EOL schedule is used before revalidation (unless an EOL date passes)')
+    cache.add_argument('--no-memo', action='store_true', help='Do not memoize query results.')
+    cache.add_argument('--persist-memo', action='store_true', help='Persist memoized query results in the cache directory.')
+    cache.add_argument('--memo-size', type=positive_int, default=MEMO_SIZE, help='The maximum number of memoized query results')
+
+    add_connection_arguments(connection)
+    add_mode_arguments(daemon, bulk, snapshot, store, watch)
+
+    # Output arguments
+    output.add_argument('-q', '--quiet', action='store_true', help='Do not show a progress spinner.')
+    output.add_argument('--machine', action='store_true', help='Print one tab-separated "language versions" line per language, with no spinner.')
+    output.add_argument('-o', '--output', type=str.lower, choices=OUTPUT_FORMATS, default='text',
+                        help='The output format (ndjson writes a record for each language as soon as it completes)')
+    output.add_argument('--progress', action='store_true', help='Write a progress line to stderr as each language completes.')
+    output.add_argument('--timings', type=str.lower, nargs='?', const='table', choices=TIMINGS_FORMATS,
+                        help='Write the time, bytes, cache use and item count of each phase to stderr once complete, as a table or JSON')
 
     # Required arguments
-    required.add_argument('-l', '--language', type=str, choices=SUPPORTED_LANGUAGES, help='The language to check.')
+    required.add_argument('-l', '--language', type=str.lower, nargs='+', choices=SUPPORTED_LANGUAGES, help='The language(s) to check.')
 
     return parser
 
 
+def validate_modes(args: argparse.Namespace) -> None:
+    """
+    Validate the arguments selecting an alternative way of answering queries (daemon, bulk, snapshot and store).
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments (--since turns on --store).
+
+    Raises:
+        argparse.ArgumentTypeError: If there are conflicting arguments.
+    """
+    if args.serve and (args.language or args.all):
+        raise argparse.ArgumentTypeError("argument -l/--language: not allowed with argument --serve")
+
+    if args.bulk and (args.language or args.all or args.serve):
+        raise argparse.ArgumentTypeError("argument --bulk: not allowed with arguments -l/--language, -A/--all or --serve")
+
+    if args.offline and not args.snapshot:
+        raise argparse.ArgumentTypeError("argument --offline: requires argument --snapshot")
+
+    if args.snapshot_export and any((args.language, args.all, args.serve, args.bulk, args.snapshot)):
+        raise argparse.ArgumentTypeError("argument --snapshot-export: not allowed with arguments -l/--language, -A/--all, --serve, --bulk or --snapshot")
+
+    if args.snapshot and args.serve:
+        raise argparse.ArgumentTypeError("argument --snapshot: not allowed with argument --serve")
+
+    if args.since is not None:
+        args.store = True
+
+    if args.store and any((args.serve, args.bulk, args.snapshot_export, args.snapshot)):
+        raise argparse.ArgumentTypeError("argument --store/--since: not allowed with arguments --serve, --bulk, --snapshot-export or --snapshot")
+
+    if args.watch and any((args.serve, args.bulk, args.snapshot_export, args.snapshot)):
+        raise argparse.ArgumentTypeError("argument --watch: not allowed with arguments --serve, --bulk, --snapshot-export or --snapshot")
+
+    if sum(bool(transport) for transport in (args.record, args.replay, args.upstream)) > 1:
+        raise argparse.ArgumentTypeError("argument --record/--replay/--upstream: only one of them can be used")
+
+    if args.watch_count and not args.watch:
+        raise argparse.ArgumentTypeError("argument --watch-count: requires argument --watch")
+
+    validate_output(args)
+
+
+def validate_output(args: argparse.Namespace) -> None:
+    """
+    Validate the arguments selecting how results and timings are written.
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Raises:
+        argparse.ArgumentTypeError: If there are conflicting arguments.
+    """
+    if args.machine and args.output != 'text':
+        raise argparse.ArgumentTypeError("argument --machine: only allowed with text output")
+
+    if args.watch and args.output not in ('text', 'ndjson'):
+        raise argparse.ArgumentTypeError("argument --watch: only text and ndjson output are supported")
+
+    if args.timings and (args.serve or args.watch):
+        raise argparse.ArgumentTypeError("argument --timings: not allowed with arguments --serve or --watch")
+
+
 def process_arguments(parser: argparse.ArgumentParser) -> argparse.Namespace:
     """
     Process and validate the command line arguments.
@@ -95,17 +269,30 @@ def process_arguments(parser: argparse.ArgumentParser) -> argparse.Namespace:
     if args.list_languages and args.language:
         raise argparse.ArgumentTypeError("argument -l/--language: not allowed with argument -L/--list-languages")
 
+    if args.list_languages and args.all:
+        raise argparse.ArgumentTypeError("argument -A/--all: not allowed with argument -L/--list-languages")
+
     if args.list_languages:
         list_supported_languages()
         sys.exit(0)
 
-    if not args.language:
-        raise argparse.ArgumentTypeError("the following arguments are required: -l/--language")
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh_cache, ttl=args.cache_ttl, directory=args.cache_dir or CACHE_DIRECTORY,
+                    eol_ttl=args.eol_ttl)
+    configure_output(quiet=args.quiet, machine=args.machine, progress=args.progress, output_format=args.output)
+    configure_memo(enabled=not args.no_memo, max_size=args.memo_size, persist=args.persist_memo)
+
+    validate_modes(args)
 
-    args.language = args.language.lower()
+    if args.clear_cache:
+        clear_cache()
+        # Clearing the cache is only the whole of the run when nothing else was requested
+        if not any((args.language, args.all, args.serve, args.bulk, args.snapshot_export)):
+            sys.exit(0)
 
-    if args.language not in SUPPORTED_LANGUAGES:
-        raise argparse.ArgumentTypeError("Unsupported language [use -L/--list-languages to see a list of supported languages]")
+    if args.serve or args.bulk or args.snapshot_export:
+        return args
+
+    args.language = validate_languages(args)
 
     if args.remove_patch_version and args.include_pre_releases:
         raise argparse.ArgumentTypeError("argument -P/--include-pre-released: not allowed with argument -R/--remove-patch-version")
@@ -113,12 +300,166 @@ def process_arguments(parser: argparse.ArgumentParser) -> argparse.Namespace:
     return args
 
 
+def configure_fetching(args: argparse.Namespace) -> None:
+    """
+    Configure the HTTP session and the deadline, retry and hedging policy used for all upstream requests, and the worker processes used to parse the responses.
+
+    This is only called on the code paths that fetch from upstream, so that the other paths
+    (--help, --version, --list-languages and queries answered by a daemon) never import requests.
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
+    from .fetch import create_session, set_session  # pylint: disable=import-outside-toplevel
+    from .parsing import configure_processes  # pylint: disable=import-outside-toplevel
+    from .resilience import configure_requests  # pylint: disable=import-outside-toplevel
+    from .transport import mount_transport  # pylint: disable=import-outside-toplevel
+
+    set_session(mount_transport(create_session(pool_size=args.pool_size, keep_alive=not args.no_keep_alive), args.pool_size,
+                                record=args.record, replay=args.replay, upstream=args.upstream))
+    configure_requests(timeout=args.timeout, deadline=args.deadline, retries=args.retries, hedge=args.hedge)
+    configure_processes(args.processes or 0)
+
+
+def run_serve(args: argparse.Namespace) -> None:
+    """
+    Run the query daemon.
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
+    from .daemon import serve  # pylint: disable=import-outside-toplevel
+
+    configure_fetching(args)
+    serve(args.host, args.port, args.refresh_interval, speculative=args.speculative, workers=args.workers)
+
+
+def run_snapshot_export(args: argparse.Namespace) -> None:
+    """
+    Capture the data for every supported language into a snapshot file.
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
+    from .snapshot import export_snapshot  # pylint: disable=import-outside-toplevel
+
+    configure_fetching(args)
+    summary: SimpleNamespace = export_snapshot(args.snapshot_export, speculative=args.speculative, workers=args.workers)
+    print(f"Exported {summary.versions} versions for {', '.join(summary.languages)} to {args.snapshot_export} ({summary.size} bytes)")
+
+
+def run_bulk_queries(args: argparse.Namespace) -> None:
+    """
+    Answer every query in the bulk query file, from upstream or from a snapshot.
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
+    from .bulk import run_bulk, write_results  # pylint: disable=import-outside-toplevel
+
+    if args.snapshot:
+        from .snapshot import Snapshot  # pylint: disable=import-outside-toplevel
+
+        with Snapshot(args.snapshot) as snapshot:
+            write_results(run_bulk(args.bulk, snapshot=snapshot), args.output)
+        return
+
+    configure_fetching(args)
+    write_results(run_bulk(args.bulk, speculative=args.speculative, workers=args.workers), args.output)
+
+
+def run_watch(args: argparse.Namespace) -> None:
+    """
+    Watch upstream, writing the versions added to or removed from the result of the query on each poll.
+
+    Cached responses older than the poll interval are revalidated with conditional requests on each poll.
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
+    from .config import create_query_configuration  # pylint: disable=import-outside-toplevel
+    from .store import configure_store  # pylint: disable=import-outside-toplevel
+    from .watch import VersionWatcher, watch  # pylint: disable=import-outside-toplevel
+
+    configure_fetching(args)
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh_cache, ttl=min(args.cache_ttl, args.watch), directory=args.cache_dir or CACHE_DIRECTORY,
+                    eol_ttl=args.eol_ttl)
+    configure_store(enabled=args.store, path=args.store_path)
+    watch(VersionWatcher(create_query_configuration(args), args.min_version), args.watch, args.output, args.watch_count)
+
+
+def write_records(languages: list, records: Dict[str, dict], writer: Optional[ResultWriter]) -> None:
+    """
+    Write the structured results for each language, either as text or with the structured output writer.
+
+    Arguments:
+        languages (list): The languages, in the order they were requested.
+        records (Dict[str, dict]): The structured result for each language.
+        writer (Optional[ResultWriter]): The structured output writer, or None for text output.
+    """
+    if writer is None:
+        list_language_versions(SimpleNamespace(languages=languages), {language: records[language]["versions"] for language in languages})
+        return
+
+    for language in languages:
+        writer.emit(records[language])
+    writer.finish()
+
+
+def run_query(args: argparse.Namespace) -> None:
+    """
+    Answer the query, from a snapshot, a query daemon or upstream.
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
+    writer: Optional[ResultWriter] = ResultWriter(args.output, args.language) if args.output != 'text' else None
+
+    if args.snapshot:
+        from .config import create_query_configuration  # pylint: disable=import-outside-toplevel
+        from .snapshot import Snapshot  # pylint: disable=import-outside-toplevel
+
+        query: SimpleNamespace = create_query_configuration(args)
+        with Snapshot(args.snapshot) as snapshot:
+            write_records(args.language, {language: snapshot.query(language, query, args.min_version) for language in args.language}, writer)
+        return
+
+    # The version store is updated by local queries only, and the daemon does not use the transport, so a query daemon is not used with either
+    if args.daemon and not args.no_daemon and not args.store and not any((args.record, args.replay, args.upstream)):
+        from .client import query_daemon  # pylint: disable=import-outside-toplevel
+
+        versions: Optional[dict] = query_daemon(args.daemon, args)
+        if versions is not None:
+            # The daemon only answers with the versions themselves
+            write_records(args.language, {language: {"language": language, "versions": versions[language]} for language in args.language}, writer)
+            return
+
+    # Only import the local query pipeline (requests, yaspin, etc.) when it is actually used
+    from .config import create_configuration_from_arguments  # pylint: disable=import-outside-toplevel
+    from .process import process_languages  # pylint: disable=import-outside-toplevel
+    from .store import configure_store  # pylint: disable=import-outside-toplevel
+
+    configure_fetching(args)
+    configure_store(enabled=args.store, path=args.store_path)
+    config: SimpleNamespace = create_configuration_from_arguments(args)
+    results: dict = process_languages(config, on_result=writer.emit if writer is not None else None)
+
+    if writer is None:
+        list_language_versions(config, results)
+    else:
+        writer.finish()
+
+
 def run() -> None:
     """
     Execute the main functionality of the script.
 
     Sets up the argument parser, processes the arguments, validates them,
     creates the configuration, and processes the specified languages and versions.
+    Depending on the arguments it instead runs the query daemon, exports a snapshot,
+    answers a file of queries or watches upstream for changes, and single queries
+    are answered from a snapshot or a query daemon when one is configured. With
+    --timings, the time spent in each phase is reported once everything has completed.
     """
     parser: argparse.ArgumentParser = setup_arg_parser()
     try:
@@ -128,6 +469,23 @@ def run() -> None:
         print(err)
         sys.exit(1)
     else:
-        config: SimpleNamespace = create_configuration_from_arguments(args)
-        versions: list = process_languages(config)
-        list_language_versions(config, versions)
+        report: Optional[TimingsReport] = None
+        if args.timings:
+            report = TimingsReport(args.language or [])
+            subscribe(report.record)
+
+        try:
+            if args.serve:
+                run_serve(args)
+            elif args.snapshot_export:
+                run_snapshot_export(args)
+            elif args.bulk:
+                run_bulk_queries(args)
+            elif args.watch:
+                run_watch(args)
+            else:
+                run_query(args)
+        finally:
+            if report is not None:
+                unsubscribe(report.record)
+                report.write(args.timings)
@@ -0,0 +1,61 @@
+"""
+This module provides the thin client used to send queries to a running query daemon.
+
+It only depends on the standard library, so that answering a query through the daemon does not
+pay for importing the HTTP, parsing and progress reporting dependencies used to answer it locally.
+"""
+
+import json
+import urllib.parse
+import urllib.request
+
+from argparse import Namespace
+from typing import Dict, List, Optional
+
+from .globals import DAEMON_TIMEOUT
+
+
+def query_parameters(args: Namespace) -> Dict[str, List[str]]:
+    """
+    Encode the query described by the command line arguments as daemon request parameters.
+
+    Arguments:
+        args (Namespace): The parsed command-line arguments.
+
+    Returns:
+        Dict[str, List[str]]: The request parameters.
+    """
+    return {
+        "language": list(args.language),
+        "min_version": [args.min_version],
+        "max_version": [args.max_version],
+        "include_pre_releases": [str(int(args.include_pre_releases))],
+        "remove_patch_version": [str(int(args.remove_patch_version))],
+        "highest_only": [str(int(args.highest_only))],
+        "max_versions": [str(args.max_versions)],
+    }
+
+
+def query_daemon(url: str, args: Namespace, timeout: float = DAEMON_TIMEOUT) -> Optional[Dict[str, List[str]]]:
+    """
+    Send the query described by the command line arguments to a running daemon.
+
+    Arguments:
+        url (str): The base URL of the daemon.
+        args (Namespace): The parsed command-line arguments.
+        timeout (float): The number of seconds to wait for the daemon to answer.
+
+    Returns:
+        Optional[Dict[str, List[str]]]: The versions for each language, or None if the daemon could not answer.
+    """
+    request_url: str = f"{url.rstrip('/')}/versions?{urllib.parse.urlencode(query_parameters(args), doseq=True)}"
+
+    try:
+        with urllib.request.urlopen(request_url, timeout=timeout) as response:  # nosec B310
+            versions: Dict[str, List[str]] = json.load(response)["versions"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if not all(language in versions for language in args.language):
+        return None
+    return versions
@@ -7,34 +7,58 @@ that can be used throughout the application.
 
 from argparse import Namespace
 from types import SimpleNamespace
-from packaging import version as semver
 
-from .constants import MAX_VERSION
-from .versions import get_minimum_version
+from .versions import get_maximum_version, get_minimum_version, get_source_key
+from .workers import submit_unique
 
 
-def create_configuration_from_arguments(args: Namespace) -> SimpleNamespace:
+def create_query_configuration(args: Namespace) -> SimpleNamespace:
     """
-    Create a configuration object from command-line arguments.
+    Create a configuration object holding the query settings from command-line arguments.
 
-    This function processes the provided command-line arguments and generates a
-    SimpleNamespace configuration object that holds the relevant settings and
-    parameters for further processing.
+    This holds everything except the minimum version, which needs resolving against the EOL data
+    for each language (see create_configuration_from_arguments).
 
     Arguments:
         args (Namespace): The parsed command-line arguments.
 
     Returns:
-        SimpleNamespace: A namespace containing the configuration settings.
+        SimpleNamespace: A namespace containing the query settings.
     """
     config: SimpleNamespace = SimpleNamespace()
 
     config.highest_only = args.highest_only
     config.include_pre_releases = args.include_pre_releases
     config.remove_patch_version = args.remove_patch_version
-    config.min_version = get_minimum_version(args.min_version, args.language)
-    config.max_version = semver.parse(args.max_version) if args.max_version.upper() != 'LATEST' else MAX_VERSION
+    config.max_version = get_maximum_version(args.max_version)
     config.max_versions = args.max_versions
-    config.language = args.language
+    config.languages = args.language
+    config.workers = args.workers
+    config.speculative = args.speculative
+    config.since = args.since
+
+    return config
+
+
+def create_configuration_from_arguments(args: Namespace) -> SimpleNamespace:
+    """
+    Create a configuration object from command-line arguments.
+
+    This function processes the provided command-line arguments and generates a
+    SimpleNamespace configuration object that holds the relevant settings and
+    parameters for further processing. The minimum version is resolved per language in the
+    background, so config.min_version maps each language to a future whose EOL fetch runs
+    alongside the versions pipeline and is only waited on when the versions are filtered.
+
+    Arguments:
+        args (Namespace): The parsed command-line arguments.
+
+    Returns:
+        SimpleNamespace: A namespace containing the configuration settings.
+    """
+    config: SimpleNamespace = create_query_configuration(args)
+
+    config.min_version = submit_unique(lambda language: get_minimum_version(args.min_version, language), config.languages,
+                                       key=lambda language: get_source_key(language, "eol_url"), max_workers=config.workers)
 
     return config
@@ -5,12 +5,17 @@ It includes version boundaries, supported languages, and URLs for fetching versi
 information and end-of-life data for various programming languages and tools.
 """
 
-from packaging import version as semver
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from packaging import version as semver
 
-# Maximum and minimum version boundaries
-MAX_VERSION: semver.Version = semver.parse('99999')
-MIN_VERSION: semver.Version = semver.parse('0')
+# Maximum and minimum version boundaries, these are parsed when first used (see __getattr__)
+MAX_VERSION: 'semver.Version'
+MIN_VERSION: 'semver.Version'
+
+# The version strings of the boundaries
+_VERSION_BOUNDARIES: dict[str, str] = {"MAX_VERSION": '99999', "MIN_VERSION": '0'}
 
 # List of supported programming languages
 SUPPORTED_LANGUAGES: list = ['go', 'node', 'nodejs', 'perl', 'php', 'python', 'ruby', 'terraform']
@@ -62,3 +67,29 @@ URLS: dict[str, dict[str, str]] = {
         "eol_url": 'https://endoflife.date/api/terraform.json'
     }
 }
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Parse a version boundary the first time it is used.
+
+    This keeps packaging out of the start up paths (e.g. --help, --version and --list-languages),
+    which only need the supported languages.
+
+    Arguments:
+        name (str): The name of the attribute.
+
+    Returns:
+        Any: The parsed version boundary.
+
+    Raises:
+        AttributeError: If the attribute is not a version boundary.
+    """
+    if name not in _VERSION_BOUNDARIES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from packaging import version as semver  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    boundary: semver.Version = semver.parse(_VERSION_BOUNDARIES[name])
+    globals()[name] = boundary
+    return boundary
@@ -0,0 +1,282 @@
+"""
+This module provides a long-running query daemon.
+
+The daemon keeps the versions data for every supported language parsed and indexed in memory,
+refreshing it on a background schedule, and answers the same queries as the command line over a
+local HTTP endpoint (see client.py for the other side of the connection).
+"""
+
+import datetime
+import json
+import threading
+import urllib.parse
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from packaging import version as semver
+from wolfsoftware.notify import system_message
+
+from .constants import SUPPORTED_LANGUAGES, URLS
+from .eol import Schedule, get_eol_schedule, minimum_version_from_schedule
+from .exceptions import CustomException
+from .globals import DEFAULT_WORKERS
+from .index import VersionIndex
+from .parsing import index_versions
+from .resilience import deadline_scope
+from .versions import fetch_stable_versions, get_maximum_version, get_minimum_version, get_source_key
+from .workers import map_unique
+
+# The errors a refresh can fail with, the previously loaded data is kept when they happen
+_REFRESH_ERRORS: Tuple = (CustomException, requests.RequestException, ValueError, KeyError)
+
+
+def _parse_query(params: Dict[str, List[str]]) -> Tuple[List[str], str, SimpleNamespace]:
+    """
+    Decode the daemon request parameters into the languages, minimum version and query settings.
+
+    Arguments:
+        params (Dict[str, List[str]]): The request parameters.
+
+    Returns:
+        Tuple[List[str], str, SimpleNamespace]: The languages, the min-version string and the query settings.
+
+    Raises:
+        ValueError: If the parameters do not describe a valid query.
+    """
+    languages: List[str] = list(dict.fromkeys(language.lower() for language in params.get("language", [])))
+    if not languages:
+        raise ValueError("At least one language is required")
+
+    for language in languages:
+        if language not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language: {language}")
+
+    query: SimpleNamespace = SimpleNamespace()
+    query.max_version = get_maximum_version(params.get("max_version", ["LATEST"])[0])
+    query.include_pre_releases = params.get("include_pre_releases", ["0"])[0] == "1"
+    query.remove_patch_version = params.get("remove_patch_version", ["0"])[0] == "1"
+    query.highest_only = params.get("highest_only", ["0"])[0] == "1"
+    query.max_versions = int(params.get("max_versions", ["0"])[0])
+
+    return languages, params.get("min_version", ["EOL"])[0], query
+
+
+class SourceStore:
+    """
+    The parsed and indexed versions data and EOL schedules for every supported language, held in memory.
+
+    Arguments:
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+        workers (int): The maximum number of concurrent fetches when refreshing.
+    """
+
+    def __init__(self, speculative: bool = False, workers: int = DEFAULT_WORKERS) -> None:
+        """Initialise an empty store."""
+        self.speculative: bool = speculative
+        self.workers: int = workers
+        self._indexes: Dict[tuple, VersionIndex] = {}
+        self._schedules: Dict[str, Schedule] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _load_index(self, language: str) -> VersionIndex:
+        """
+        Fetch, parse and index the versions data for a language and store it.
+
+        Arguments:
+            language (str): The supported language.
+
+        Returns:
+            VersionIndex: The new index.
+        """
+        response = fetch_stable_versions(language, self.speculative, stream=True)
+        index: VersionIndex = index_versions(language, response)
+
+        with self._lock:
+            self._indexes[get_source_key(language)] = index
+        return index
+
+    def _load_schedule(self, language: str) -> Schedule:
+        """
+        Load the EOL schedule for a language and store it.
+
+        Arguments:
+            language (str): The supported language.
+
+        Returns:
+            Schedule: The EOL schedule.
+        """
+        schedule: Schedule = get_eol_schedule(URLS[language]["eol_url"])
+
+        with self._lock:
+            self._schedules[URLS[language]["eol_url"]] = schedule
+        return schedule
+
+    def _refresh_one(self, language: str) -> None:
+        """
+        Reload the data for a language, keeping the existing data if the reload fails.
+
+        Arguments:
+            language (str): The supported language.
+        """
+        try:
+            self._load_index(language)
+            self._load_schedule(language)
+        except _REFRESH_ERRORS as err:
+            print(system_message(f"Unable to refresh {language}: {err}"))
+
+    def refresh(self) -> None:
+        """Reload the data for every supported language concurrently, within the deadline if one is configured."""
+        with deadline_scope():
+            map_unique(self._refresh_one, SUPPORTED_LANGUAGES, key=get_source_key, max_workers=self.workers)
+
+    def index(self, language: str) -> VersionIndex:
+        """
+        Get the index for a language, loading it if it has not been loaded yet.
+
+        Arguments:
+            language (str): The supported language.
+
+        Returns:
+            VersionIndex: The index.
+        """
+        with self._lock:
+            index: Optional[VersionIndex] = self._indexes.get(get_source_key(language))
+        return index if index is not None else self._load_index(language)
+
+    def min_version(self, min_version_str: str, language: str) -> semver.Version:
+        """
+        Get the minimum version for a language, using the in-memory EOL schedule for "EOL".
+
+        Arguments:
+            min_version_str (str): The min-version as supplied by the client.
+            language (str): The supported language.
+
+        Returns:
+            semver.Version: The minimum version for the language.
+        """
+        if min_version_str.upper() != 'EOL':
+            return get_minimum_version(min_version_str, language)
+
+        with self._lock:
+            schedule: Optional[Schedule] = self._schedules.get(URLS[language]["eol_url"])
+        if schedule is None:
+            schedule = self._load_schedule(language)
+        return minimum_version_from_schedule(schedule, datetime.date.today())
+
+    def query(self, params: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """
+        Answer a query.
+
+        Arguments:
+            params (Dict[str, List[str]]): The request parameters.
+
+        Returns:
+            Dict[str, List[str]]: A dictionary mapping each requested language to its list of versions.
+        """
+        languages, min_version_str, query = _parse_query(params)
+
+        return {language: self.index(language).query(query, self.min_version(min_version_str, language)) for language in languages}
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    """Answer queries for the versions of one or more languages from the store of the server."""
+
+    server: '_DaemonServer'
+
+    def _send_json(self, status: int, body: dict) -> None:
+        """
+        Send a JSON response.
+
+        Arguments:
+            status (int): The HTTP status code.
+            body (dict): The response body.
+        """
+        data: bytes = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Answer a GET request for /versions or /health."""
+        url: urllib.parse.SplitResult = urllib.parse.urlsplit(self.path)
+
+        if url.path == '/health':
+            self._send_json(200, {"status": "ok"})
+            return
+
+        if url.path != '/versions':
+            self._send_json(404, {"error": f"Unknown path: {url.path}"})
+            return
+
+        try:
+            versions: Dict[str, List[str]] = self.server.store.query(urllib.parse.parse_qs(url.query))
+        except (ValueError, semver.InvalidVersion) as err:
+            self._send_json(400, {"error": str(err)})
+        except _REFRESH_ERRORS as err:
+            self._send_json(502, {"error": str(err)})
+        else:
+            self._send_json(200, {"versions": versions})
+
+    def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+        """Do not log every request."""
+
+
+class _DaemonServer(ThreadingHTTPServer):
+    """
+    A threaded HTTP server holding the store that queries are answered from.
+
+    Arguments:
+        address (Tuple[str, int]): The host and port to listen on.
+        store (SourceStore): The store queries are answered from.
+    """
+
+    daemon_threads: bool = True
+
+    def __init__(self, address: Tuple[str, int], store: SourceStore) -> None:
+        """Initialise the server and bind to the address."""
+        super().__init__(address, _QueryHandler)
+        self.store: SourceStore = store
+
+
+def _refresh_periodically(store: SourceStore, interval: int, stop: threading.Event) -> None:
+    """
+    Refresh the store every interval seconds until stopped.
+
+    Arguments:
+        store (SourceStore): The store to refresh.
+        interval (int): The number of seconds between refreshes.
+        stop (threading.Event): Set to stop refreshing.
+    """
+    while not stop.wait(interval):
+        store.refresh()
+
+
+def serve(host: str, port: int, refresh_interval: int, speculative: bool = False, workers: int = DEFAULT_WORKERS) -> None:
+    """
+    Load every supported language and answer queries until interrupted.
+
+    Arguments:
+        host (str): The host to listen on.
+        port (int): The port to listen on.
+        refresh_interval (int): The number of seconds between background refreshes of the data.
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+        workers (int): The maximum number of concurrent fetches when refreshing.
+    """
+    store: SourceStore = SourceStore(speculative, workers)
+    store.refresh()
+
+    stop: threading.Event = threading.Event()
+    threading.Thread(target=_refresh_periodically, args=(store, refresh_interval, stop), daemon=True).start()
+
+    with _DaemonServer((host, port), store) as server:
+        print(system_message(f"Serving queries on http://{host}:{server.server_address[1]}/versions"))
+        try:
+            server.serve_forever()
+        finally:
+            stop.set()
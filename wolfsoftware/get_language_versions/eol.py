@@ -0,0 +1,160 @@
+"""
+This module provides a locally stored, compact copy of the EOL (End Of Life) schedule for each language.
+
+The schedule is reduced to the cycle and eol date of each valid release cycle and kept in the
+cache, so the minimum supported version can be recomputed for any date without a network call.
+The stored schedule is only revalidated with upstream once it is older than the EOL TTL or once
+the next eol date it contains has passed, as those are the only points at which the answer can
+change.
+"""
+
+import datetime
+import json
+import time
+
+from types import SimpleNamespace
+from typing import List, Optional, Union
+
+from packaging import version as semver
+
+from .cache import CACHE_SETTINGS, load_body, load_entry, store_entry
+from .constants import MAX_VERSION
+from .fetch import fetch_url
+from .timings import annotate
+
+# A compact schedule, a list of [cycle, eol] pairs in upstream order, eol is either a boolean or an ISO date
+Schedule = List[List[Union[str, bool]]]
+
+
+def _schedule_key(eol_url: str) -> str:
+    """
+    Get the cache key the compact schedule for an EOL URL is stored under.
+
+    Arguments:
+        eol_url (str): The EOL URL.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{eol_url}#schedule"
+
+
+def compact_schedule(releases: list) -> Schedule:
+    """
+    Reduce the upstream EOL data to the cycle and eol date of each valid release cycle.
+
+    Arguments:
+        releases (list): The release cycles as published by endoflife.date.
+
+    Returns:
+        Schedule: The compact schedule.
+    """
+    schedule: Schedule = []
+
+    for release in releases:
+        try:
+            semver.Version(release['cycle'])
+        except semver.InvalidVersion:
+            continue
+
+        schedule.append([release['cycle'], release['eol']])
+
+    return schedule
+
+
+def minimum_version_from_schedule(schedule: Schedule, today: datetime.date) -> semver.Version:
+    """
+    Get the minimum supported version on the given date.
+
+    Arguments:
+        schedule (Schedule): The compact schedule.
+        today (datetime.date): The date to evaluate the schedule for.
+
+    Returns:
+        semver.Version: The minimum "supported" version.
+    """
+    min_version: semver.Version = MAX_VERSION
+
+    for cycle, eol in schedule:
+        if eol is True:
+            continue
+
+        if eol is False:
+            min_version = min(min_version, semver.parse(cycle))
+            continue
+
+        if today < datetime.date.fromisoformat(eol):
+            min_version = semver.parse(cycle)
+
+    return min_version
+
+
+def next_boundary(schedule: Schedule, today: datetime.date) -> Optional[datetime.date]:
+    """
+    Get the next date on which a release cycle in the schedule reaches its end of life.
+
+    Arguments:
+        schedule (Schedule): The compact schedule.
+        today (datetime.date): The date to look forward from.
+
+    Returns:
+        Optional[datetime.date]: The next eol date, or None if no cycle has a future eol date.
+    """
+    upcoming: List[datetime.date] = [datetime.date.fromisoformat(eol) for _, eol in schedule if isinstance(eol, str)]
+    return min((date for date in upcoming if date > today), default=None)
+
+
+def _load_stored_schedule(eol_url: str, today: datetime.date) -> Optional[Schedule]:
+    """
+    Load the stored schedule for an EOL URL, if it can still be used without revalidation.
+
+    Arguments:
+        eol_url (str): The EOL URL.
+        today (datetime.date): The date the schedule will be evaluated for.
+
+    Returns:
+        Optional[Schedule]: The stored schedule, or None if there is none or it needs revalidating.
+    """
+    entry: Optional[SimpleNamespace] = load_entry(_schedule_key(eol_url))
+    if entry is None or CACHE_SETTINGS.refresh or time.time() - entry.fetched_at >= CACHE_SETTINGS.eol_ttl:
+        return None
+
+    try:
+        stored: dict = json.loads(load_body(_schedule_key(eol_url)))
+        schedule: Schedule = stored['schedule']
+        boundary: Optional[str] = stored['boundary']
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+    if boundary is not None and today >= datetime.date.fromisoformat(boundary):
+        return None
+
+    return schedule
+
+
+def get_eol_schedule(eol_url: str, today: Optional[datetime.date] = None) -> Schedule:
+    """
+    Get the compact EOL schedule for an EOL URL, using the stored copy where possible.
+
+    Arguments:
+        eol_url (str): The EOL URL.
+        today (Optional[datetime.date]): The date the schedule will be evaluated for, defaults to today.
+
+    Returns:
+        Schedule: The compact schedule.
+    """
+    if today is None:
+        today = datetime.date.today()
+
+    schedule: Optional[Schedule] = _load_stored_schedule(eol_url, today)
+    if schedule is not None:
+        annotate(cache='hit')
+        return schedule
+
+    schedule = compact_schedule(fetch_url(eol_url).json())
+    boundary: Optional[datetime.date] = next_boundary(schedule, today)
+
+    stored: dict = {"schedule": schedule, "boundary": boundary.isoformat() if boundary is not None else None}
+    store_entry(_schedule_key(eol_url), eol_url, json.dumps(stored, separators=(',', ':')).encode('utf-8'), None, None)
+
+    return schedule
@@ -2,7 +2,7 @@
 This module defines custom exceptions used throughout the application.
 
 It includes a base custom exception class that can be extended for specific error
-handling needs.
+handling needs, along with the specific exceptions raised by the application.
 """
 
 
@@ -16,3 +16,53 @@ class CustomException(Exception):
     Arguments:
         Exception (Exception): Inherits from the base Exception class.
     """
+
+
+class TagNotFoundError(CustomException):
+    """
+    Raised when the latest release tag cannot be determined from a releases URL.
+
+    This happens when the releases URL does not redirect to a specific release, for example
+    when the repository has not published any releases.
+
+    Arguments:
+        CustomException (CustomException): Inherits from the base CustomException class.
+    """
+
+
+class InvalidQueryError(CustomException):
+    """
+    Raised when a query in a bulk query file is not valid.
+
+    The message includes the line number of the query so that it can be located in the file.
+
+    Arguments:
+        CustomException (CustomException): Inherits from the base CustomException class.
+    """
+
+
+class SnapshotError(CustomException):
+    """
+    Raised when a snapshot file cannot be read, is not a snapshot or is in an unsupported format.
+
+    Arguments:
+        CustomException (CustomException): Inherits from the base CustomException class.
+    """
+
+
+class RecordingNotFoundError(CustomException):
+    """
+    Raised when a request is replayed but no response to it was recorded.
+
+    Arguments:
+        CustomException (CustomException): Inherits from the base CustomException class.
+    """
+
+
+class DeadlineExceededError(CustomException):
+    """
+    Raised when the deadline for a run passes before an upstream request can be made, and there is no cached copy to fall back to.
+
+    Arguments:
+        CustomException (CustomException): Inherits from the base CustomException class.
+    """
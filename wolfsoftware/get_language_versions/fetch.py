@@ -0,0 +1,403 @@
+"""
+This module handles all HTTP requests made to the upstream version sources.
+
+It defines a small response object and a fetch function that transparently serves responses from
+the on-disk cache, revalidating expired entries with conditional requests so that an unchanged
+resource only costs a round-trip for the headers. Responses can be streamed so that large bodies
+are processed as they arrive. All requests share a single pooled session so that connections to
+the same host are kept alive and reused. Requests are retried, hedged and bounded by the run deadline
+(see resilience.py), and when upstream cannot be reached in time a stale cached copy is served instead.
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+from .cache import CACHE_SETTINGS, EntryWriter, is_fresh, iter_body, load_entry, touch_entry
+from .globals import DEADLINE_TAG_SHARE, MAX_REDIRECTS, POOL_SIZE, STREAM_CHUNK_SIZE
+from .resilience import RETRY_STATUSES, UPSTREAM_ERRORS, send_request
+from .timings import annotate, count_transfer
+
+_session: Optional[requests.Session] = None
+_session_lock: threading.Lock = threading.Lock()
+
+
+class FetchResult:  # pylint: disable=too-many-instance-attributes
+    """
+    The result of fetching a URL, either from upstream or from the cache.
+
+    The body is read lazily from an iterator of chunks, which allows large responses to be processed
+    incrementally via iter_content() without ever holding the whole body in memory. The known_digest
+    attribute holds the SHA-256 digest of the body when it is known without reading it (e.g. for a
+    cached response), or once the body has been streamed. The read_seconds attribute holds the time
+    spent reading the body so far, which for a streamed body is spread over whatever consumes it.
+
+    Arguments:
+        url (str): The final URL of the response after following any redirects.
+        chunks (Iterator[bytes]): An iterator over the response body.
+        status_code (int): The HTTP status code of the response.
+        from_cache (bool): True if the body was served from the cache.
+        etag (Optional[str]): The ETag validator of the response, if any.
+    """
+
+    def __init__(self, url: str, chunks: Iterator[bytes], status_code: int = 200, from_cache: bool = False, etag: Optional[str] = None) -> None:
+        """Initialise the fetch result."""
+        self.url: str = url
+        self.status_code: int = status_code
+        self.from_cache: bool = from_cache
+        self.etag: Optional[str] = etag
+        self.known_digest: Optional[str] = None
+        self.read_seconds: float = 0.0
+        self._content: Optional[bytes] = None
+        self._chunks: Optional[Iterator[bytes]] = chunks
+
+    @property
+    def content(self) -> bytes:
+        """
+        Get the complete response body, reading any remaining chunks.
+
+        Returns:
+            bytes: The response body.
+
+        Raises:
+            RuntimeError: If the body has already been streamed with iter_content().
+        """
+        if self._content is None:
+            if self._chunks is None:
+                raise RuntimeError(f"The response body for {self.url} has already been consumed")
+            started: float = time.perf_counter()
+            self._content = b''.join(self._chunks)
+            self._chunks = None
+            seconds: float = time.perf_counter() - started
+            self.read_seconds += seconds
+            count_transfer(seconds, len(self._content))
+        return self._content
+
+    def load(self) -> 'FetchResult':
+        """
+        Read the whole response body now (if it has not already been read).
+
+        Returns:
+            FetchResult: This result, to allow chaining.
+        """
+        self.content  # pylint: disable=pointless-statement
+        return self
+
+    def iter_content(self) -> Iterator[bytes]:
+        """
+        Iterate over the response body in chunks.
+
+        If the body has not already been read it is streamed and not retained, so this can only be
+        done once. The digest of a streamed body becomes available once it has been read completely.
+
+        Yields:
+            bytes: The next chunk of the response body.
+
+        Raises:
+            RuntimeError: If the body has already been streamed.
+        """
+        if self._content is not None:
+            yield self._content
+            return
+
+        if self._chunks is None:
+            raise RuntimeError(f"The response body for {self.url} has already been consumed")
+
+        chunks: Iterator[bytes] = self._chunks
+        self._chunks = None
+        body_hash = hashlib.sha256()
+
+        while True:
+            # Only the time spent waiting for each chunk is counted, not the time the consumer spends on it
+            started: float = time.perf_counter()
+            chunk: Optional[bytes] = next(chunks, None)
+            seconds: float = time.perf_counter() - started
+            self.read_seconds += seconds
+            count_transfer(seconds, len(chunk) if chunk is not None else 0)
+            if chunk is None:
+                break
+            body_hash.update(chunk)
+            yield chunk
+
+        if self.known_digest is None:
+            self.known_digest = body_hash.hexdigest()
+
+    @property
+    def ok(self) -> bool:
+        """
+        Check whether the response was successful.
+
+        Returns:
+            bool: True if the status code is below 400.
+        """
+        return self.status_code < 400
+
+    @property
+    def caching(self) -> bool:
+        """
+        Check whether the body is written to the cache as it is read, which only happens if it is read in full.
+
+        Returns:
+            bool: True if the body is being downloaded from upstream with the cache enabled.
+        """
+        return not self.from_cache and self._content is None and CACHE_SETTINGS.enabled
+
+    @property
+    def digest(self) -> str:
+        """
+        Get the SHA-256 digest of the response body.
+
+        Returns:
+            str: The hex encoded digest.
+        """
+        if self.known_digest is None:
+            self.known_digest = hashlib.sha256(self.content).hexdigest()
+        return self.known_digest
+
+    @property
+    def text(self) -> str:
+        """
+        Get the response body decoded as text.
+
+        Returns:
+            str: The decoded response body.
+        """
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        """
+        Get the response body decoded as JSON.
+
+        Returns:
+            Any: The decoded JSON document.
+        """
+        return json.loads(self.content)
+
+
+def create_session(pool_size: int = POOL_SIZE, keep_alive: bool = True) -> requests.Session:
+    """
+    Create a pooled HTTP session.
+
+    Arguments:
+        pool_size (int): The maximum number of connections kept per host (and the number of hosts pooled).
+        keep_alive (bool): Keep connections open between requests so they can be reused.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session: requests.Session = requests.Session()
+    adapter: HTTPAdapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+
+def set_session(session: Optional[requests.Session]) -> None:
+    """
+    Set the session used for all upstream requests.
+
+    This allows library callers to inject their own session (e.g. with custom adapters, proxies
+    or authentication). Passing None discards the current session so a default one is created on
+    the next request.
+
+    Arguments:
+        session (Optional[requests.Session]): The session to use.
+    """
+    global _session
+
+    with _session_lock:
+        _session = session
+
+
+def get_session() -> requests.Session:
+    """
+    Get the shared session, creating a default one if none has been set.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def _stream_response(url: str, response: requests.models.Response) -> Iterator[bytes]:
+    """
+    Stream a response body, writing it into the cache as it is read.
+
+    The cache entry is only committed once the whole body has been read. If the consumer stops
+    early the partial download is discarded.
+
+    Arguments:
+        url (str): The requested URL.
+        response (requests.models.Response): The streaming response.
+
+    Yields:
+        bytes: The next chunk of the response body.
+    """
+    writer: EntryWriter = EntryWriter(url)
+
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            writer.write(chunk)
+            yield chunk
+        writer.commit(response.url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    finally:
+        writer.abort()
+        response.close()
+
+
+def _cached_result(url: str, entry: SimpleNamespace, stream: bool, cache: str) -> FetchResult:
+    """
+    Serve a response from the cache.
+
+    Arguments:
+        url (str): The requested URL.
+        entry (SimpleNamespace): The cache entry.
+        stream (bool): Return without reading the body.
+        cache (str): How the cache was used ('hit', 'revalidated' or 'stale'), for the timings.
+
+    Returns:
+        FetchResult: The cached response.
+    """
+    annotate(cache=cache)
+    result: FetchResult = FetchResult(entry.final_url, iter_body(url, STREAM_CHUNK_SIZE), from_cache=True, etag=entry.etag)
+    result.known_digest = getattr(entry, 'digest', None)
+    return result if stream else result.load()
+
+
+def fetch_url(url: str, stream: bool = False) -> FetchResult:
+    """
+    Fetch a URL, using the on-disk cache where possible.
+
+    Fresh cache entries are returned without any network access. Expired entries are revalidated
+    using If-None-Match / If-Modified-Since, and a 304 response simply marks the entry as fresh
+    again. Only successful responses are stored in the cache. If upstream cannot be reached (after
+    any retries, or because the deadline has passed) or keeps failing, an expired entry is served
+    rather than failing.
+
+    Arguments:
+        url (str): The URL to fetch.
+        stream (bool): Return without reading the body, so it can be consumed incrementally with iter_content().
+
+    Returns:
+        FetchResult: The response.
+
+    Raises:
+        requests.RequestException: If upstream cannot be reached and nothing is cached.
+        DeadlineExceededError: If the deadline has passed and nothing is cached.
+    """
+    entry = load_entry(url)
+    headers: dict = {}
+
+    if entry is not None:
+        if is_fresh(entry):
+            return _cached_result(url, entry, stream, 'hit')
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+
+    try:
+        response: requests.models.Response = send_request(get_session(), 'GET', url, headers=headers, stream=True)
+    except UPSTREAM_ERRORS:
+        if entry is None:
+            raise
+        return _cached_result(url, entry, stream, 'stale')
+
+    if response.status_code == 304 and entry is not None:
+        response.close()
+        touch_entry(url, entry)
+        return _cached_result(url, entry, stream, 'revalidated')
+
+    if response.status_code in RETRY_STATUSES and entry is not None:
+        response.close()
+        return _cached_result(url, entry, stream, 'stale')
+
+    annotate(cache='miss')
+    chunks: Iterator[bytes] = _stream_response(url, response) if response.ok else response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    result: FetchResult = FetchResult(response.url, chunks, response.status_code, etag=response.headers.get('ETag'))
+    return result if stream else result.load()
+
+
+def matches_url(url: str, result: FetchResult) -> bool:
+    """
+    Check whether a URL serves the same content as an already fetched result, without downloading it.
+
+    A cached entry for the URL is compared by content digest (or ETag), otherwise a HEAD request
+    is made and the ETag it returns is compared.
+
+    Arguments:
+        url (str): The URL to check.
+        result (FetchResult): The already fetched result to compare against.
+
+    Returns:
+        bool: True if the URL is known to serve identical content.
+    """
+    entry = load_entry(url)
+
+    if entry is not None:
+        if getattr(entry, 'digest', None) == result.digest:
+            return True
+        return bool(entry.etag and entry.etag == result.etag)
+
+    if not result.etag:
+        return False
+
+    try:
+        response: requests.models.Response = send_request(get_session(), 'HEAD', url)
+    except UPSTREAM_ERRORS:
+        return False
+    return response.ok and response.headers.get('ETag') == result.etag
+
+
+def resolve_redirect(url: str, stop_when: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Follow the redirects for a URL using HEAD requests, without downloading any response body.
+
+    This is how the latest tag is resolved, so each request only gets DEADLINE_TAG_SHARE of the time
+    left before the deadline, leaving the rest for downloading the versions data.
+
+    Arguments:
+        url (str): The URL to resolve.
+        stop_when (Optional[Callable[[str], bool]]): An optional predicate, when it returns True for a
+            redirect target that target is returned without requesting it.
+
+    Returns:
+        str: The final URL the request was redirected to (or the URL itself if it does not redirect).
+
+    Raises:
+        requests.HTTPError: If upstream is still failing after the retries.
+    """
+    for _ in range(MAX_REDIRECTS):
+        response: requests.models.Response = send_request(get_session(), 'HEAD', url, share=DEADLINE_TAG_SHARE, allow_redirects=False)
+
+        # Upstream still failing after the retries is an error, rather than the URL not redirecting
+        if response.status_code in RETRY_STATUSES:
+            response.raise_for_status()
+
+        if not response.is_redirect or 'Location' not in response.headers:
+            return url
+
+        url = urljoin(url, response.headers['Location'])
+
+        if stop_when is not None and stop_when(url):
+            return url
+
+    return url
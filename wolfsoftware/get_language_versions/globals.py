@@ -3,15 +3,11 @@ This module defines global constants and retrieves the version information for t
 
 It sets up global constants used for the argument parser configuration and retrieves the version
 information of the application package using the importlib.metadata module. If the package is not found,
-the version is set to 'unknown'.
+the version is set to 'unknown'. The version is only looked up when it is displayed, as importing
+importlib.metadata is a noticeable part of the start up time.
 """
 
-import importlib.metadata
-
-try:
-    version: str = importlib.metadata.version('wolfsoftware.get-language-versions')
-except importlib.metadata.PackageNotFoundError:
-    version = 'unknown'
+import os
 
 # Program name for the argument parser
 ARG_PARSER_PROG_NAME: str = "get-language-versions"
@@ -22,8 +18,110 @@ ARG_PARSER_DESCRIPTION: str = "A description goes here"
 # Epilog for the argument parser
 ARG_PARSER_EPILOG: str = "The Epilog goes here"
 
-# Version string to display the current version of the program
-VERSION_STRING: str = f"Current version of {ARG_PARSER_PROG_NAME} is v{version}"
+
+def get_version_string() -> str:
+    """
+    Get the version string to display the current version of the program.
+
+    Returns:
+        str: The version string.
+    """
+    import importlib.metadata  # pylint: disable=import-outside-toplevel
+
+    try:
+        version: str = importlib.metadata.version('wolfsoftware.get-language-versions')
+    except importlib.metadata.PackageNotFoundError:
+        version = 'unknown'
+
+    return f"Current version of {ARG_PARSER_PROG_NAME} is v{version}"
+
 
 # Timeout duration for requests made by the program
 REQUESTS_TIMEOUT: int = 5
+
+# Number of times a failed upstream request is retried
+RETRIES: int = 2
+
+# Longest wait in seconds before the first retry (doubling for each further retry, with full jitter)
+RETRY_BACKOFF: float = 0.25
+
+# Longest wait in seconds honoured from a Retry-After header
+RETRY_AFTER_LIMIT: float = 5.0
+
+# Share of the time left before the deadline that resolving the latest tag may use, leaving the rest for the download
+DEADLINE_TAG_SHARE: float = 0.5
+
+# Percentile of recent request latencies after which a hedged request is sent, when --hedge is given without one
+HEDGE_PERCENTILE: float = 95.0
+
+# Number of recent request latencies the hedging percentile is taken over
+HEDGE_WINDOW: int = 100
+
+# Number of request latencies observed before the percentile is used to decide when to hedge
+HEDGE_MIN_SAMPLES: int = 5
+
+# Number of seconds a request is given before it is hedged while too few latencies have been observed
+HEDGE_DELAY: float = 1.0
+
+# Default number of worker threads used to fetch data for multiple languages concurrently
+DEFAULT_WORKERS: int = 8
+
+# Maximum number of pooled connections kept open per host
+POOL_SIZE: int = DEFAULT_WORKERS
+
+# Size of the chunks used when streaming response bodies
+STREAM_CHUNK_SIZE: int = 65536
+
+# Number of consecutive Terraform releases below the minimum version seen before the listing scan stops
+TERRAFORM_EARLY_STOP: int = 10
+
+# Maximum number of redirects followed when resolving a URL
+MAX_REDIRECTS: int = 10
+
+# Number of seconds a resolved latest tag is reused before it is resolved again
+TAG_CACHE_TTL: int = 300
+
+# Directory used to store cached upstream responses
+CACHE_DIRECTORY: str = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), ARG_PARSER_PROG_NAME)
+
+# Number of seconds a cached upstream response is used before it is revalidated
+CACHE_TTL: int = 3600
+
+# Number of seconds the stored EOL schedule is used before it is revalidated (unless an EOL date passes first)
+EOL_TTL: int = 86400
+
+# Maximum number of query results held in the memo
+MEMO_SIZE: int = 1024
+
+# Name of the file the query memo is persisted to within the cache directory
+MEMO_FILENAME: str = 'query-memo.json'
+
+# Host the query daemon listens on by default
+DAEMON_HOST: str = '127.0.0.1'
+
+# Port the query daemon listens on by default
+DAEMON_PORT: int = 8754
+
+# Number of seconds between background refreshes of the data held by the query daemon
+DAEMON_REFRESH_INTERVAL: int = 900
+
+# Number of seconds the client waits for the query daemon to answer before answering the query itself
+DAEMON_TIMEOUT: float = 2.0
+
+# Environment variable holding the URL of the query daemon to use
+DAEMON_URL_ENV: str = 'GET_LANGUAGE_VERSIONS_DAEMON'
+
+# Version of the snapshot file format written by --snapshot-export
+SNAPSHOT_FORMAT_VERSION: int = 1
+
+# Name of the SQLite version store within the cache directory
+STORE_FILENAME: str = 'versions.sqlite3'
+
+# Number of seconds between polls in watch mode
+WATCH_INTERVAL: int = 300
+
+# Host the stand-in upstream server listens on by default
+UPSTREAM_HOST: str = '127.0.0.1'
+
+# Port the stand-in upstream server listens on by default
+UPSTREAM_PORT: int = 8755
@@ -0,0 +1,157 @@
+"""
+This module provides a sorted index over the versions of a language.
+
+The index is built once per set of versions and groups them by major.minor, keeping the highest
+version in each group. Range, highest-only and last-N queries are then answered by bisection over
+the sorted group keys instead of rescanning every version.
+"""
+
+from bisect import bisect_left, bisect_right
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from packaging import version as semver
+
+from .records import VersionRecord
+
+
+def _group_index(records: Iterable[VersionRecord]) -> Tuple[List[Tuple[int, int]], List[VersionRecord]]:
+    """
+    Build the sorted major.minor group keys and the highest version in each group.
+
+    Arguments:
+        records (Iterable[VersionRecord]): The versions to index.
+
+    Returns:
+        Tuple[List[Tuple[int, int]], List[VersionRecord]]: The sorted group keys and the highest version of each group.
+    """
+    groups: Dict[Tuple[int, int], VersionRecord] = {}
+
+    for record in records:
+        group: Tuple[int, int] = (record.major, record.minor)
+        current: Optional[VersionRecord] = groups.get(group)
+        if current is None or current.key < record.key:
+            groups[group] = record
+
+    keys: List[Tuple[int, int]] = sorted(groups)
+    return keys, [groups[group] for group in keys]
+
+
+def _lower_bound(keys: List[Tuple[int, int]], min_version: semver.Version) -> int:
+    """
+    Find the first group whose major.minor is greater than or equal to the minimum version.
+
+    Arguments:
+        keys (List[Tuple[int, int]]): The sorted group keys.
+        min_version (semver.Version): The minimum version.
+
+    Returns:
+        int: The index of the first group in range.
+    """
+    group: Tuple[int, int] = (min_version.release + (0,))[:2]
+
+    if semver.Version(f"{group[0]}.{group[1]}") >= min_version:
+        return bisect_left(keys, group)
+    return bisect_right(keys, group)
+
+
+def _upper_bound(keys: List[Tuple[int, int]], max_version: semver.Version) -> int:
+    """
+    Find the index after the last group whose major.minor is less than or equal to the maximum version.
+
+    Arguments:
+        keys (List[Tuple[int, int]]): The sorted group keys.
+        max_version (semver.Version): The maximum version.
+
+    Returns:
+        int: The index after the last group in range.
+    """
+    group: Tuple[int, int] = (max_version.release + (0,))[:2]
+
+    if semver.Version(f"{group[0]}.{group[1]}") <= max_version:
+        return bisect_right(keys, group)
+    return bisect_left(keys, group)
+
+
+class VersionIndex:
+    """
+    A sorted, query-ready index over the versions of a language.
+
+    Arguments:
+        records (Iterable[VersionRecord]): The versions to index.
+    """
+
+    def __init__(self, records: Iterable[VersionRecord]) -> None:
+        """Build the index for releases only and for releases plus pre-releases."""
+        records = list(records)
+        self._all: Tuple[List[Tuple[int, int]], List[VersionRecord]] = _group_index(records)
+        self._releases: Tuple[List[Tuple[int, int]], List[VersionRecord]] = _group_index(record for record in records if not record.is_prerelease)
+
+    def records(self) -> List[VersionRecord]:
+        """
+        Get the versions the index is made up of (the highest version of each major.minor, with and without pre-releases).
+
+        An index built from just these versions answers every query in the same way as this index.
+
+        Returns:
+            List[VersionRecord]: The versions, lowest first.
+        """
+        unique: Dict[str, VersionRecord] = {record.text: record for record in self._all[1] + self._releases[1]}
+        return sorted(unique.values(), key=lambda record: record.key)
+
+    def between(self, min_version: semver.Version, max_version: semver.Version, include_pre: bool = False, limit: int = 0) -> List[VersionRecord]:
+        """
+        Get the highest version of each major.minor between the minimum and maximum versions.
+
+        Arguments:
+            min_version (semver.Version): The minimum version (compared against major.minor).
+            max_version (semver.Version): The maximum version (compared against major.minor).
+            include_pre (bool): Include pre-release versions.
+            limit (int): If greater than zero, only return this many of the highest matching versions.
+
+        Returns:
+            List[VersionRecord]: The matching versions, lowest first.
+        """
+        keys, best = self._all if include_pre else self._releases
+
+        start: int = _lower_bound(keys, min_version)
+        end: int = _upper_bound(keys, max_version)
+
+        if limit > 0:
+            start = max(start, end - limit)
+
+        return best[start:end]
+
+    def highest(self, min_version: semver.Version, max_version: semver.Version, include_pre: bool = False) -> Optional[VersionRecord]:
+        """
+        Get the highest version between the minimum and maximum versions.
+
+        Arguments:
+            min_version (semver.Version): The minimum version (compared against major.minor).
+            max_version (semver.Version): The maximum version (compared against major.minor).
+            include_pre (bool): Include pre-release versions.
+
+        Returns:
+            Optional[VersionRecord]: The highest matching version, or None if there are none.
+        """
+        matches: List[VersionRecord] = self.between(min_version, max_version, include_pre, limit=1)
+        return matches[0] if matches else None
+
+    def query(self, config: SimpleNamespace, min_version: semver.Version) -> List[str]:
+        """
+        Answer a query described by the configuration settings.
+
+        Arguments:
+            config (SimpleNamespace): The configuration settings (max_version, include_pre_releases, remove_patch_version,
+                highest_only and max_versions are used).
+            min_version (semver.Version): The minimum version for this language.
+
+        Returns:
+            List[str]: The matching versions, lowest first.
+        """
+        limit: int = 1 if config.highest_only else max(config.max_versions or 0, 0)
+        selected: List[VersionRecord] = self.between(min_version, config.max_version, config.include_pre_releases, limit)
+
+        if config.remove_patch_version:
+            return [record.without_patch().text for record in selected]
+        return [record.text for record in selected]
@@ -4,14 +4,13 @@ This script serves as the entry point for the application.
 
 This script initializes the application by invoking the main routine. It handles
 command-line argument processing and ensures the application runs as intended.
-The script also gracefully handles keyboard interrupts to allow for a clean exit.
+The script also gracefully handles keyboard interrupts and application errors to allow for a clean exit.
 """
 
 import sys
 
-from wolfsoftware.notify import system_message
-
 from .cli import run
+from .exceptions import CustomException
 
 
 def main() -> None:
@@ -27,8 +26,13 @@ def main() -> None:
     try:
         run()
     except KeyboardInterrupt:
+        from wolfsoftware.notify import system_message  # pylint: disable=import-outside-toplevel
         print(system_message("\n[*] Exiting Program\n"))
         sys.exit(1)
+    except CustomException as err:
+        from wolfsoftware.notify import error_message  # pylint: disable=import-outside-toplevel
+        print(error_message(str(err)))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+"""
+This module provides a bounded memo of final query results.
+
+Results are keyed by the language, the digest of the upstream versions data and every setting that
+affects the answer, so a changed upstream document automatically produces a new key and stale
+results simply age out of the least-recently-used memo. The memo can optionally be persisted in the
+cache directory so that it survives between runs.
+"""
+
+import json
+import os
+import threading
+
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from packaging import version as semver
+
+from .cache import CACHE_SETTINGS
+from .globals import MEMO_FILENAME, MEMO_SIZE
+
+
+class QueryMemo:
+    """
+    A thread-safe least-recently-used memo of query results.
+
+    Arguments:
+        max_size (int): The maximum number of results held.
+        path (Optional[str]): The file the memo is persisted to, or None to keep it in memory only.
+    """
+
+    def __init__(self, max_size: int = MEMO_SIZE, path: Optional[str] = None) -> None:
+        """Initialise the memo, loading any persisted results."""
+        self.max_size: int = max_size
+        self.path: Optional[str] = path
+        self._results: OrderedDict = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._dirty: bool = False
+
+        if path is not None:
+            try:
+                with open(path, 'r', encoding='UTF-8') as handle:
+                    self._results.update(json.load(handle))
+            except (OSError, ValueError, TypeError):
+                pass
+
+    @staticmethod
+    def make_key(language: str, digest: str, config: SimpleNamespace, min_version: 'semver.Version') -> str:
+        """
+        Build the memo key for a query.
+
+        The resolved minimum version is used rather than the EOL document digest, as it captures both
+        the EOL data and the date it was evaluated against.
+
+        Arguments:
+            language (str): The language queried.
+            digest (str): The digest of the upstream versions data.
+            config (SimpleNamespace): The configuration settings for the query.
+            min_version (semver.Version): The resolved minimum version.
+
+        Returns:
+            str: The memo key.
+        """
+        return '|'.join((language, digest, str(min_version), str(config.max_version), str(config.include_pre_releases),
+                         str(config.remove_patch_version), str(config.highest_only), str(config.max_versions)))
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Look up a result, marking it as recently used.
+
+        Arguments:
+            key (str): The memo key.
+
+        Returns:
+            Optional[List[str]]: The memoized versions, or None if there is no result for the key.
+        """
+        with self._lock:
+            if key not in self._results:
+                return None
+            self._results.move_to_end(key)
+            return list(self._results[key])
+
+    def put(self, key: str, versions: List[str]) -> None:
+        """
+        Store a result, evicting the least recently used results if the memo is full.
+
+        Arguments:
+            key (str): The memo key.
+            versions (List[str]): The versions to store.
+        """
+        with self._lock:
+            self._results[key] = list(versions)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the memo, if it is persistent and has changed."""
+        if self.path is None or not self._dirty:
+            return
+
+        with self._lock:
+            data: str = json.dumps(self._results)
+            self._dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path: str = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='UTF-8') as handle:
+                handle.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+# The memo used by process_languages, this is replaced by configure_memo()
+_query_memo: Optional[QueryMemo] = QueryMemo()
+
+
+def get_memo() -> Optional[QueryMemo]:
+    """
+    Get the memo used for queries.
+
+    Returns:
+        Optional[QueryMemo]: The memo, or None if memoization is disabled.
+    """
+    return _query_memo
+
+
+def configure_memo(enabled: bool = True, max_size: int = MEMO_SIZE, persist: bool = False) -> None:
+    """
+    Configure the memo used for subsequent queries.
+
+    Arguments:
+        enabled (bool): Memoize query results.
+        max_size (int): The maximum number of results held.
+        persist (bool): Persist the memo in the cache directory between runs.
+    """
+    global _query_memo
+
+    if not enabled:
+        _query_memo = None
+        return
+
+    _query_memo = QueryMemo(max_size, os.path.join(CACHE_SETTINGS.directory, MEMO_FILENAME) if persist and CACHE_SETTINGS.enabled else None)
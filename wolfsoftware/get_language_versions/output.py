@@ -0,0 +1,216 @@
+"""
+This module provides the output layer used to report progress and write structured results.
+
+Progress is reported in one of three ways, chosen from the output settings and whether stdout is a
+terminal: an interactive spinner (only ever started on a terminal), plain progress lines written to
+stderr (only when requested), or not at all. Progress lines are handed to a single writer thread so
+that the workers fetching languages concurrently never wait on each other or on a slow stderr.
+
+Structured results are written as a single JSON object, as a GitHub Actions matrix or as NDJSON,
+where each language's record is written as soon as that language completes.
+"""
+
+import json
+import queue
+import sys
+import threading
+import time
+
+from types import SimpleNamespace, TracebackType
+from typing import Any, Dict, List, Optional, Type
+
+# The supported output formats
+OUTPUT_FORMATS: List[str] = ['text', 'json', 'matrix', 'ndjson']
+
+# Runtime output settings, these are updated by configure_output()
+OUTPUT_SETTINGS: SimpleNamespace = SimpleNamespace(quiet=False, machine=False, progress=False, format='text')
+
+
+def configure_output(quiet: bool = False, machine: bool = False, progress: bool = False, output_format: str = 'text') -> None:
+    """
+    Configure how progress and results are output.
+
+    Arguments:
+        quiet (bool): Never show a spinner.
+        machine (bool): Print results in a machine readable form and never show a spinner.
+        progress (bool): Write a progress line to stderr as each language completes.
+        output_format (str): The format results are written in, one of OUTPUT_FORMATS (anything but text never shows a spinner).
+    """
+    OUTPUT_SETTINGS.quiet = quiet
+    OUTPUT_SETTINGS.machine = machine
+    OUTPUT_SETTINGS.progress = progress
+    OUTPUT_SETTINGS.format = output_format
+
+
+class _NullProgress:
+    """Progress reporting that does nothing."""
+
+    def __enter__(self) -> '_NullProgress':
+        """
+        Start reporting.
+
+        Returns:
+            _NullProgress: This reporter.
+        """
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        """Stop reporting."""
+
+    def completed(self, languages: List[str]) -> None:
+        """
+        Report that languages have completed.
+
+        Arguments:
+            languages (List[str]): The languages that completed.
+        """
+
+
+class _SpinnerProgress(_NullProgress):
+    """
+    Progress reporting with an interactive spinner on the terminal.
+
+    Arguments:
+        text (str): The text shown next to the spinner.
+    """
+
+    def __init__(self, text: str) -> None:
+        """Create the spinner (yaspin is only imported when a spinner is actually shown)."""
+        from yaspin import yaspin  # pylint: disable=import-outside-toplevel
+
+        self._spinner: Any = yaspin(text=text, color="cyan")
+
+    def __enter__(self) -> '_SpinnerProgress':
+        """
+        Start the spinner.
+
+        Returns:
+            _SpinnerProgress: This reporter.
+        """
+        self._spinner.start()
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        """Stop the spinner, marking it as done if there was no error."""
+        if exc_type is None:
+            self._spinner.ok('Done')
+        else:
+            self._spinner.stop()
+
+
+class _StreamProgress(_NullProgress):
+    """
+    Progress reporting as plain lines on stderr, written by a single background thread.
+
+    Arguments:
+        text (str): The description of the work, written when reporting starts.
+    """
+
+    def __init__(self, text: str) -> None:
+        """Initialise the reporter."""
+        self._text: str = text
+        self._lines: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: threading.Thread = threading.Thread(target=self._write, daemon=True)
+        self._started: float = 0.0
+
+    def _write(self) -> None:
+        """Write queued lines to stderr until the end of the queue is reached."""
+        while True:
+            line: Optional[str] = self._lines.get()
+            if line is None:
+                return
+            sys.stderr.write(line)
+            sys.stderr.flush()
+
+    def __enter__(self) -> '_StreamProgress':
+        """
+        Start reporting.
+
+        Returns:
+            _StreamProgress: This reporter.
+        """
+        self._started = time.monotonic()
+        self._writer.start()
+        self._lines.put(f"{self._text}\n")
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        """Report the end of the work and wait for every line to be written."""
+        self._lines.put(f"{'Done' if exc_type is None else 'Failed'} in {time.monotonic() - self._started:.2f}s\n")
+        self._lines.put(None)
+        self._writer.join()
+
+    def completed(self, languages: List[str]) -> None:
+        """
+        Report that languages have completed, without waiting for the report to be written.
+
+        Arguments:
+            languages (List[str]): The languages that completed.
+        """
+        self._lines.put(f"  {', '.join(languages)} done in {time.monotonic() - self._started:.2f}s\n")
+
+
+def progress_reporter(text: str) -> _NullProgress:
+    """
+    Create the progress reporter for the configured output settings.
+
+    A spinner is only used on a terminal, and never in quiet or machine mode or with structured output. Otherwise progress
+    lines are written to stderr if they were requested, and nothing is reported if not.
+
+    Arguments:
+        text (str): The description of the work.
+
+    Returns:
+        _NullProgress: The reporter, used as a context manager.
+    """
+    if OUTPUT_SETTINGS.progress:
+        return _StreamProgress(text)
+
+    if OUTPUT_SETTINGS.quiet or OUTPUT_SETTINGS.machine or OUTPUT_SETTINGS.format != 'text' or not sys.stdout.isatty():
+        return _NullProgress()
+
+    return _SpinnerProgress(text)
+
+
+class ResultWriter:
+    """
+    Write the structured result for each language in one of the structured output formats.
+
+    Results are passed to emit() as each language completes, possibly from several threads at once.
+    NDJSON records are written immediately, the other formats are written by finish() once every
+    language has completed.
+
+    Arguments:
+        output_format (str): The output format (json, matrix or ndjson).
+        languages (List[str]): The languages, in the order they were requested.
+    """
+
+    def __init__(self, output_format: str, languages: List[str]) -> None:
+        """Initialise the writer."""
+        self.output_format: str = output_format
+        self.languages: List[str] = languages
+        self._records: Dict[str, dict] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def emit(self, record: dict) -> None:
+        """
+        Accept the result for a language, writing it straight away for NDJSON.
+
+        Arguments:
+            record (dict): The structured result for a language.
+        """
+        with self._lock:
+            self._records[record["language"]] = record
+            if self.output_format == 'ndjson':
+                sys.stdout.write(json.dumps(record, separators=(',', ':')) + '\n')
+                sys.stdout.flush()
+
+    def finish(self) -> None:
+        """Write the collected results, for the formats that are written once everything has completed."""
+        records: List[dict] = [self._records[language] for language in self.languages if language in self._records]
+
+        if self.output_format == 'json':
+            print(json.dumps({record["language"]: record for record in records}, indent=2))
+        elif self.output_format == 'matrix':
+            include: List[dict] = [{"language": record["language"], "version": version} for record in records for version in record["versions"]]
+            print(json.dumps({"include": include}, separators=(',', ':')))
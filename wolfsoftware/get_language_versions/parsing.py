@@ -0,0 +1,92 @@
+"""
+This module parses versions data into indexes, optionally in a pool of worker processes.
+
+Decoding the upstream documents and parsing every version string is CPU bound, so when several
+languages are fetched at once the parsing holds the GIL and holds up the threads that are still
+downloading. With a process pool configured the raw body is handed to a worker process instead,
+which extracts and indexes the versions and sends back only the compact set of versions the index
+is made up of (the highest of each major.minor), leaving the main process to do the I/O.
+"""
+
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from packaging import version as semver
+
+from .fetch import FetchResult
+from .index import VersionIndex
+from .records import VersionRecord
+from .timings import annotate, measure
+from .versions import extract_versions
+
+# The pool of worker processes used for parsing, this is replaced by configure_processes()
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def configure_processes(processes: int = 0) -> None:
+    """
+    Configure the worker processes used to parse versions data.
+
+    The workers are started straight away, so that they are ready by the time the first response
+    has been downloaded.
+
+    Arguments:
+        processes (int): The number of worker processes, or 0 to parse in the calling thread.
+    """
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown()
+        _process_pool = None
+
+    if processes > 0:
+        # Worker processes are spawned rather than forked, as forking a process with running threads is unsafe
+        _process_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+        for _ in range(processes):
+            _process_pool.submit(int)
+
+
+def compact_versions(language: str, body: bytes) -> Tuple[int, List[str]]:
+    """
+    Extract and index the versions from the raw versions data, this runs in a worker process.
+
+    Arguments:
+        language (str): The supported language the data belongs to.
+        body (bytes): The raw versions data.
+
+    Returns:
+        Tuple[int, List[str]]: The number of versions extracted, and the versions the index is made up of (which answer
+            every query in the same way as all of the versions).
+    """
+    records: List[VersionRecord] = extract_versions(language, (body,))
+    return len(records), [record.text for record in VersionIndex(records).records()]
+
+
+def index_versions(language: str, response: FetchResult, min_version: Optional[semver.Version] = None) -> VersionIndex:
+    """
+    Extract and index the versions from a response, in a worker process if a process pool is configured.
+
+    Arguments:
+        language (str): The supported language the data belongs to.
+        response (FetchResult): The versions data.
+        min_version (Optional[semver.Version]): The minimum version of interest, allowing the parser to stop early
+            (only when parsing in the calling thread, as a worker needs the whole body anyway).
+
+    Returns:
+        VersionIndex: The index.
+    """
+    with measure("parse", language):
+        if _process_pool is None:
+            records: List[VersionRecord] = extract_versions(language, response.iter_content(), min_version, read_all=response.caching)
+            annotate(items=len(records))
+            return VersionIndex(records)
+
+        body: bytes = response.content
+        # Work out the digest of the body, as would have happened had it been streamed
+        response.digest  # pylint: disable=pointless-statement
+
+        count, texts = _process_pool.submit(compact_versions, language, body).result()
+        annotate(items=count)
+        return VersionIndex(record for record in map(VersionRecord.parse, texts) if record is not None)
@@ -2,18 +2,31 @@
 This module processes versions of various programming languages and tools.
 
 It defines functions to compare versions against minimum and maximum boundaries, process lists
-of versions to ensure they meet specified criteria, and handle different languages using the
-provided configuration.
+of versions to ensure they meet specified criteria, and handle one or more languages concurrently
+using the provided configuration.
 """
 
+import time
+
+from functools import partial
 from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
 from packaging import version as semver
-from yaspin import yaspin
 
-from .versions import get_versions, get_perl_versions, get_php_versions, get_ruby_versions, get_stable_versions, get_terraform_versions
+from .constants import MAX_VERSION, URLS
+from .fetch import FetchResult
+from .index import VersionIndex
+from .memo import QueryMemo, get_memo
+from .output import progress_reporter
+from .parsing import index_versions
+from .records import VersionRecord
+from .store import VersionStore, get_store, store_source
+from .timings import annotate, measure
+from .versions import extract_versions, fetch_stable_versions, get_source_key, get_source_tag
+from .workers import map_unique
 
 
-def compare_min_max_value(versions_dict: dict, version: str, min_version: semver.Version, max_version: semver.Version) -> dict:
+def compare_min_max_value(versions_dict: dict, record: VersionRecord, min_version: semver.Version, max_version: semver.Version) -> dict:
     """
     Compare the given version against minimum and maximum boundaries.
 
@@ -23,22 +36,22 @@ def compare_min_max_value(versions_dict: dict, version: str, min_version: semver
     the existing one.
 
     Arguments:
-        versions_dict (dict): The dictionary of valid versions.
-        version (str): The current version to compare.
+        versions_dict (dict): The dictionary of valid versions, keyed by major.minor.
+        record (VersionRecord): The current version to compare.
         min_version (semver.Version): The minimum defined version.
         max_version (semver.Version): The maximum defined version.
 
     Returns:
         dict: The updated versions dictionary.
     """
-    major_minor: semver.Version = semver.parse('.'.join(version.split('.')[:2]))
+    major_minor: semver.Version = record.major_minor
 
     if min_version <= major_minor <= max_version:
         if major_minor in versions_dict:
-            if semver.parse(versions_dict[major_minor]) < semver.parse(version):
-                versions_dict[major_minor] = version
+            if versions_dict[major_minor].key < record.key:
+                versions_dict[major_minor] = record
         else:
-            versions_dict[major_minor] = version
+            versions_dict[major_minor] = record
 
     return versions_dict
 
@@ -52,7 +65,7 @@ def process_versions(stable_versions: list, min_version: semver.Version, max_ver
     versions and patch version removal based on the provided flags.
 
     Arguments:
-        stable_versions (list): The list of stable versions.
+        stable_versions (list): The list of stable versions, either as version records or version strings.
         min_version (semver.Version): The minimum identified version.
         max_version (semver.Version): The maximum identified version.
         include_pre (bool): Flag to include pre-releases.
@@ -64,70 +77,271 @@ def process_versions(stable_versions: list, min_version: semver.Version, max_ver
     versions_dict: dict = {}
 
     for version in stable_versions:
-        try:
-            semver.Version(version)
-        except semver.InvalidVersion:
+        record: Optional[VersionRecord] = version if isinstance(version, VersionRecord) else VersionRecord.parse(version)
+
+        if record is None:
             continue
 
-        if not include_pre and semver.parse(version).is_prerelease:
+        if not include_pre and record.is_prerelease:
             continue
 
         if remove_patch:
-            version_str: str = '.'.join(version.split('.')[:2])
-        else:
-            version_str = version
+            record = record.without_patch()
+
+        versions_dict = compare_min_max_value(versions_dict, record, min_version, max_version)
+
+    return [record.text for record in sorted(versions_dict.values(), key=lambda record: record.key)]
 
-        versions_dict = compare_min_max_value(versions_dict, version_str, min_version, max_version)
 
-    versions: list = list(versions_dict.values())
-    versions = sorted(versions, key=lambda x: [int(i) if i.isdigit() else i for i in x.split('.')])
-    return versions
+def get_language_versions(language: str, speculative: bool = False, min_version: Optional[semver.Version] = None) -> List[VersionRecord]:
+    """
+    Fetch and extract the raw list of versions for a single language.
+
+    This function streams the versions data for the given language into the language specific
+    parser to produce a flat list of version strings.
 
+    Arguments:
+        language (str): The supported language to fetch.
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+        min_version (Optional[semver.Version]): The minimum version of interest, allowing the parser to stop early.
 
-def process_languages(config: SimpleNamespace) -> list:
+    Returns:
+        List[VersionRecord]: The versions found for the language.
     """
-    Process versions for the specified language based on the configuration.
+    response: FetchResult = fetch_stable_versions(language, speculative, stream=True)
+    return extract_versions(language, response.iter_content(), min_version, read_all=response.caching)
+
 
-    This function retrieves stable versions for the specified language and processes
-    them according to the configuration settings, including minimum and maximum versions,
-    inclusion of pre-releases, and removal of patch versions. It also handles different
-    languages using specific processing functions.
+def make_record(language: str, versions: List[str], min_version: semver.Version, config: SimpleNamespace, source: SimpleNamespace) -> dict:
+    """
+    Build the structured result for a language.
 
     Arguments:
+        language (str): The language.
+        versions (List[str]): The processed versions.
+        min_version (semver.Version): The resolved minimum version.
         config (SimpleNamespace): The configuration settings.
+        source (SimpleNamespace): Details of how the versions data was obtained (tag, from_cache, memoized and timings).
 
     Returns:
-        list: The list of processed versions.
+        dict: The structured result.
+    """
+    return {
+        "language": language,
+        "versions": versions,
+        "min_version": str(min_version),
+        "max_version": str(config.max_version) if config.max_version != MAX_VERSION else None,
+        "tag": source.tag,
+        "from_cache": source.from_cache,
+        "memoized": source.memoized,
+        "timings": {name: round(seconds, 4) for name, seconds in source.timings.items()},
+    }
+
+
+def select_since(records: List[VersionRecord], config: SimpleNamespace) -> List[str]:
     """
-    stable_versions: dict = {}
-    versions: list = []
+    Apply the output settings to the versions that appeared since a given time.
 
-    with yaspin(text=f"Getting stable versions for {config.language}", color="cyan") as spinner:
+    Every new version is listed rather than just the highest of each major.minor, unless patch
+    versions are removed, in which case each major.minor is listed once.
 
-        if config.language == "terraform":
-            stable_versions = get_stable_versions(config.language, False)
-        else:
-            stable_versions = get_stable_versions(config.language)
-
-        if config.language == "perl":
-            versions = get_perl_versions(stable_versions)
-        elif config.language == "php":
-            versions = get_php_versions(stable_versions)
-        elif config.language == "ruby":
-            versions = get_ruby_versions(stable_versions)
-        elif config.language == "terraform":
-            versions = get_terraform_versions(stable_versions)
-        else:
-            versions = get_versions(stable_versions)
+    Arguments:
+        records (List[VersionRecord]): The new versions, lowest first.
+        config (SimpleNamespace): The configuration settings (remove_patch_version, highest_only and max_versions are used).
 
-        versions = process_versions(versions, config.min_version, config.max_version, config.include_pre_releases, config.remove_patch_version)
+    Returns:
+        List[str]: The versions, lowest first.
+    """
+    texts: List[str] = [record.text for record in records]
 
-        if config.highest_only:
-            versions = versions[-1]
-        else:
-            if config.max_versions and config.max_versions > 0:
-                versions = versions[-config.max_versions:]
+    if config.remove_patch_version:
+        texts = list(dict.fromkeys(record.without_patch().text for record in records))
+
+    limit: int = 1 if config.highest_only else max(config.max_versions or 0, 0)
+    return texts[-limit:] if limit > 0 else texts
+
+
+def refresh_store(store: VersionStore, language: str, response: FetchResult, tag: Optional[str]) -> str:
+    """
+    Merge the versions data for a language into the version store.
+
+    The versions data is only parsed if the store does not already hold it (i.e. its digest is not
+    known up front, or differs from the one last merged), and only new versions are added.
+
+    Arguments:
+        store (VersionStore): The version store.
+        language (str): The supported language.
+        response (FetchResult): The versions data.
+        tag (Optional[str]): The release tag the versions data was fetched from.
+
+    Returns:
+        str: The name the versions are stored under.
+    """
+    name: str = store_source(language, URLS[language])
+
+    if not store.is_current(name, response.known_digest):
+        with measure("parse", language):
+            records: List[VersionRecord] = extract_versions(language, response.iter_content())
+            annotate(items=len(records))
+        store.merge(name, records, tag, response.known_digest)
+
+    return name
+
+
+def query_store(store: VersionStore, name: str, config: SimpleNamespace, min_version: semver.Version) -> List[str]:
+    """
+    Answer the configured query from the version store.
+
+    The candidate versions are selected by SQL and the query is settled exactly by an index over just
+    those, or if config.since is set every version first seen since then is listed.
+
+    Arguments:
+        store (VersionStore): The version store.
+        name (str): The name the versions are stored under.
+        config (SimpleNamespace): The configuration settings.
+        min_version (semver.Version): The minimum version for this language.
+
+    Returns:
+        List[str]: The matching versions, lowest first.
+    """
+    if config.since is not None:
+        return select_since(store.since(name, config.since, min_version, config.max_version, config.include_pre_releases), config)
+
+    return VersionIndex(store.candidates(name, min_version, config.max_version, config.include_pre_releases)).query(config, min_version)
+
+
+def load_answerer(language: str, languages: list, response: FetchResult, config: SimpleNamespace, tag: Optional[str]) -> Callable[[semver.Version], List[str]]:
+    """
+    Load the versions data for a language, ready to answer the configured query for any minimum version.
+
+    If the version store is in use the versions data is merged into the store and queries are answered
+    from it, otherwise the versions data is parsed into an index (stopping early if every minimum version
+    has already resolved).
+
+    Arguments:
+        language (str): The supported language.
+        languages (list): The configured languages sharing the source of the language.
+        response (FetchResult): The versions data.
+        config (SimpleNamespace): The configuration settings.
+        tag (Optional[str]): The release tag the versions data was fetched from.
+
+    Returns:
+        Callable[[semver.Version], List[str]]: Answers the query for a minimum version.
+    """
+    store: Optional[VersionStore] = get_store()
+
+    if store is not None:
+        return partial(query_store, store, refresh_store(store, language, response, tag), config)
+
+    early_stop: Optional[semver.Version] = None
+    if all(config.min_version[other].done() for other in languages):
+        early_stop = min(config.min_version[other].result() for other in languages)
+
+    return partial(index_versions(language, response, early_stop).query, config)
+
+
+def query_language_source(language: str, config: SimpleNamespace) -> Dict[str, dict]:
+    """
+    Fetch the versions data for a language and answer the configured query from it.
+
+    The query is answered for every configured language that shares the same source (e.g. node and
+    nodejs). If the digest of the versions data is known up front (i.e. it was served from the cache)
+    and every answer is already memoized, the data is not parsed at all. If the version store is in
+    use the versions data is merged into the store and the query is answered from the store instead
+    (the memo is not used, so that the versions data is always merged into the store).
+
+    The minimum versions in config.min_version are futures that resolve while the versions data is
+    fetched and parsed, they are only waited on once the parsed versions need to be filtered. If they
+    have already resolved by the time parsing starts they are used to let the parser stop early.
+
+    The fetch timing covers the whole download, including the body that is streamed while it is parsed,
+    and the process timing covers everything else.
+
+    Arguments:
+        language (str): The supported language to fetch.
+        config (SimpleNamespace): The configuration settings.
+
+    Returns:
+        Dict[str, dict]: A dictionary mapping each language sharing the source to its structured result
+            (see make_record), including the list of processed versions.
+    """
+    started: float = time.perf_counter()
+    languages: list = [other for other in config.languages if get_source_key(other) == get_source_key(language)]
+    memo: Optional[QueryMemo] = get_memo()
+    response: FetchResult = fetch_stable_versions(language, config.speculative, stream=True)
+    source: SimpleNamespace = SimpleNamespace(tag=get_source_tag(language), from_cache=response.from_cache, memoized=False,
+                                              timings={"fetch": time.perf_counter() - started})
+
+    if get_store() is not None:
+        memo = None
+
+    if memo is not None and response.known_digest is not None:
+        min_versions: dict = {other: config.min_version[other].result() for other in languages}
+        memoized: dict = {other: memo.get(memo.make_key(other, response.known_digest, config, min_versions[other])) for other in languages}
+        if all(versions is not None for versions in memoized.values()):
+            source.memoized = True
+            source.timings["process"] = 0.0
+            source.timings["total"] = time.perf_counter() - started
+            return {other: make_record(other, memoized[other], min_versions[other], config, source) for other in languages}
+
+    answer: Callable[[semver.Version], List[str]] = load_answerer(language, languages, response, config, source.tag)
+    results: dict = {}
+
+    for other in languages:
+        min_version: semver.Version = config.min_version[other].result()
+        with measure("filter", other):
+            results[other] = (answer(min_version), min_version)
+            annotate(items=len(results[other][0]))
+        if memo is not None and response.known_digest is not None:
+            memo.put(memo.make_key(other, response.known_digest, config, min_version), results[other][0])
+
+    total: float = time.perf_counter() - started
+    source.timings["fetch"] += response.read_seconds
+    source.timings["process"] = total - source.timings["fetch"]
+    source.timings["total"] = total
+
+    return {other: make_record(other, versions, min_version, config, source) for other, (versions, min_version) in results.items()}
+
+
+def process_languages(config: SimpleNamespace, on_result: Optional[Callable[[dict], None]] = None) -> dict:
+    """
+    Process versions for the specified languages based on the configuration.
+
+    This function retrieves stable versions for each of the configured languages concurrently and
+    processes them according to the configuration settings, including minimum and maximum versions,
+    inclusion of pre-releases, and removal of patch versions. Languages that share the same
+    sources (e.g. node and nodejs) are only fetched and indexed once, and results are memoized
+    against the digest of the upstream data. Progress is reported through the output layer.
+
+    If on_result is given it is called with the structured result for each language (see
+    make_record) as soon as that language completes, from the worker thread that processed it.
+
+    Arguments:
+        config (SimpleNamespace): The configuration settings.
+        on_result (Optional[Callable[[dict], None]]): Called with the structured result for each language as it completes.
+
+    Returns:
+        dict: A dictionary mapping each language to its list of processed versions.
+    """
+    results: dict = {}
+
+    with progress_reporter(f"Getting stable versions for {', '.join(config.languages)}") as progress:
+
+        def query_and_report(language: str) -> dict:
+            source_result: Dict[str, dict] = query_language_source(language, config)
+            progress.completed(list(source_result))
+            if on_result is not None:
+                for record in source_result.values():
+                    on_result(record)
+            return source_result
+
+        source_results: dict = map_unique(query_and_report, config.languages, key=get_source_key, max_workers=config.workers)
+
+        for language in config.languages:
+            results[language] = source_results[language][language]["versions"]
 
-    spinner.ok('Done')
+    memo: Optional[QueryMemo] = get_memo()
+    if memo is not None:
+        memo.save()
 
-    return versions
+    return results
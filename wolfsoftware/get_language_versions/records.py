@@ -0,0 +1,85 @@
+"""
+This module defines the compact parsed representation of a version used by the processing pipeline.
+
+Each version string is parsed exactly once, when it is first extracted from the upstream data, and
+the resulting record carries everything the filtering, de-duplication and sorting steps need.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from packaging import version as semver
+
+
+@lru_cache(maxsize=4096)
+def _parse_major_minor(major_minor: str) -> semver.Version:
+    """
+    Parse the major.minor prefix of a version (there are few distinct values, so these are cached).
+
+    Arguments:
+        major_minor (str): The major.minor prefix.
+
+    Returns:
+        semver.Version: The parsed prefix.
+    """
+    return semver.Version(major_minor)
+
+
+class VersionRecord:
+    """
+    A version string that has been parsed once, with the values needed for filtering precomputed.
+
+    Arguments:
+        text (str): The version string as it will be output.
+        key (semver.Version): The parsed version, used for ordering and comparison.
+        major_minor_text (str): The major.minor prefix of the version string.
+    """
+
+    __slots__ = ('text', 'key', 'major', 'minor', 'patch', 'is_prerelease', 'major_minor')
+
+    def __init__(self, text: str, key: semver.Version, major_minor_text: str) -> None:
+        """Initialise the record from an already parsed version."""
+        release: tuple = key.release + (0, 0, 0)
+
+        self.text: str = text
+        self.key: semver.Version = key
+        self.major: int = release[0]
+        self.minor: int = release[1]
+        self.patch: int = release[2]
+        self.is_prerelease: bool = key.is_prerelease
+        self.major_minor: semver.Version = _parse_major_minor(major_minor_text)
+
+    @classmethod
+    def parse(cls, text: str) -> Optional['VersionRecord']:
+        """
+        Parse a version string into a record.
+
+        Arguments:
+            text (str): The version string.
+
+        Returns:
+            Optional[VersionRecord]: The record, or None if the string is not a valid version.
+        """
+        try:
+            return cls(text, semver.Version(text), '.'.join(text.split('.')[:2]))
+        except semver.InvalidVersion:
+            return None
+
+    def without_patch(self) -> 'VersionRecord':
+        """
+        Get the record for the major.minor prefix of this version.
+
+        Returns:
+            VersionRecord: A record whose text (and ordering) is just the major.minor prefix.
+        """
+        major_minor_text: str = '.'.join(self.text.split('.')[:2])
+        return VersionRecord(major_minor_text, self.major_minor, major_minor_text)
+
+    def __repr__(self) -> str:
+        """
+        Get a debugging representation of the record.
+
+        Returns:
+            str: The representation.
+        """
+        return f"VersionRecord({self.text!r})"
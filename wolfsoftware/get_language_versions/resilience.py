@@ -0,0 +1,304 @@
+"""
+This module applies the deadline, retry and hedging policy to every upstream request.
+
+A run can be given an overall deadline, in which case each request is given the smaller of the request
+timeout and the time left (resolving the latest tag only gets a share of it, leaving the rest for the
+download), and no request is started once the deadline has passed. The callers fall back to a stale
+cached copy when a request cannot be made or fails (see fetch_url).
+
+Requests that fail with a connection error, a timeout or a retryable status (429 and 5xx) are retried
+with exponential backoff and full jitter, honouring Retry-After, for as long as the deadline allows.
+Every upstream request is an idempotent GET or HEAD, so retrying and hedging them is safe.
+
+With hedging enabled, a request that has not been answered by the time a percentile of the recent
+request latencies has passed is sent a second time, and whichever answer arrives first is used. Each
+hedged request is sent from a pair of threads of its own, so however many workers are fetching at once
+a hedge is never queued behind the requests of another worker.
+"""
+
+import random
+import threading
+import time
+
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from types import SimpleNamespace
+from typing import Deque, Iterator, Optional, Set
+
+import requests
+
+from .exceptions import DeadlineExceededError
+from .globals import HEDGE_DELAY, HEDGE_MIN_SAMPLES, HEDGE_WINDOW, REQUESTS_TIMEOUT, RETRIES, RETRY_AFTER_LIMIT, RETRY_BACKOFF
+
+# The statuses of responses that are retried
+RETRY_STATUSES: tuple = (429, 500, 502, 503, 504)
+
+# The errors an upstream request can fail with, callers fall back to a stale cached copy when they happen
+UPSTREAM_ERRORS: tuple = (requests.RequestException, DeadlineExceededError)
+
+# The errors of a request that are retried
+_RETRY_ERRORS: tuple = (requests.ConnectionError, requests.Timeout)
+
+# Runtime request settings, these are updated by configure_requests()
+REQUEST_SETTINGS: SimpleNamespace = SimpleNamespace(timeout=REQUESTS_TIMEOUT, deadline=None, expires_at=None, retries=RETRIES, backoff=RETRY_BACKOFF,
+                                                    hedge=None)
+
+
+class LatencyTracker:
+    """
+    Track the latencies of the most recent requests (the time until the response headers arrive).
+
+    Arguments:
+        window (int): The number of latencies kept.
+    """
+
+    def __init__(self, window: int = HEDGE_WINDOW) -> None:
+        """Initialise the tracker with no latencies."""
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """
+        Record the latency of a request.
+
+        Arguments:
+            seconds (float): The latency.
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Get a percentile of the recorded latencies.
+
+        Arguments:
+            percent (float): The percentile.
+
+        Returns:
+            Optional[float]: The latency, or None if fewer than HEDGE_MIN_SAMPLES have been recorded.
+        """
+        with self._lock:
+            latencies: list = sorted(self._latencies)
+
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return latencies[min(int(len(latencies) * percent / 100), len(latencies) - 1)]
+
+
+_latencies: LatencyTracker = LatencyTracker()
+
+
+def configure_requests(timeout: float = REQUESTS_TIMEOUT, deadline: Optional[float] = None, retries: int = RETRIES, backoff: float = RETRY_BACKOFF,
+                       hedge: Optional[float] = None) -> None:
+    """
+    Configure the deadline, retry and hedging policy for subsequent upstream requests, and start the deadline.
+
+    Arguments:
+        timeout (float): The number of seconds each request is given.
+        deadline (Optional[float]): The number of seconds every request of the run must complete within, or None for no deadline.
+        retries (int): The number of times a failed request is retried.
+        backoff (float): The longest wait in seconds before the first retry (doubling for each further retry).
+        hedge (Optional[float]): Send a request again once this percentile of recent latencies has passed, or None to never hedge.
+    """
+    REQUEST_SETTINGS.timeout = timeout
+    REQUEST_SETTINGS.deadline = deadline
+    REQUEST_SETTINGS.retries = retries
+    REQUEST_SETTINGS.backoff = backoff
+    REQUEST_SETTINGS.hedge = hedge
+    start_deadline()
+
+
+def start_deadline() -> None:
+    """Start the deadline from now."""
+    REQUEST_SETTINGS.expires_at = time.monotonic() + REQUEST_SETTINGS.deadline if REQUEST_SETTINGS.deadline is not None else None
+
+
+@contextmanager
+def deadline_scope() -> Iterator[None]:
+    """
+    Apply the deadline to the requests made within the block only, starting it from now.
+
+    Long running processes use this so that each refresh or poll gets the whole deadline, and
+    requests made between them are not held to a deadline that has long passed.
+
+    Yields:
+        None: Nothing.
+    """
+    start_deadline()
+    try:
+        yield
+    finally:
+        REQUEST_SETTINGS.expires_at = None
+
+
+def time_left() -> Optional[float]:
+    """
+    Get the time left before the deadline.
+
+    Returns:
+        Optional[float]: The number of seconds left (0 if the deadline has passed), or None if there is no deadline.
+    """
+    if REQUEST_SETTINGS.expires_at is None:
+        return None
+    return max(REQUEST_SETTINGS.expires_at - time.monotonic(), 0.0)
+
+
+def request_timeout(share: float = 1.0) -> float:
+    """
+    Get the timeout for a request, which is the request timeout or the share of the time left before the deadline, whichever is smaller.
+
+    Arguments:
+        share (float): The share of the time left the request may use.
+
+    Returns:
+        float: The timeout in seconds.
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed.
+    """
+    left: Optional[float] = time_left()
+    if left is None:
+        return REQUEST_SETTINGS.timeout
+
+    if left <= 0:
+        raise DeadlineExceededError(f"The {REQUEST_SETTINGS.deadline} second deadline passed before upstream could be queried")
+    return min(REQUEST_SETTINGS.timeout, left * share)
+
+
+def _send_once(session: requests.Session, method: str, url: str, share: float, **kwargs) -> requests.Response:
+    """
+    Send a request once, recording its latency.
+
+    Arguments:
+        session (requests.Session): The session to send the request with.
+        method (str): The request method.
+        url (str): The request URL.
+        share (float): The share of the time left before the deadline the request may use.
+        **kwargs: The arguments of requests.Session.request().
+
+    Returns:
+        requests.Response: The response.
+    """
+    started: float = time.monotonic()
+    response: requests.Response = session.request(method, url, timeout=request_timeout(share), **kwargs)
+    _latencies.record(time.monotonic() - started)
+    return response
+
+
+def _close_response(future: Future) -> None:
+    """
+    Close the response of a request whose answer is not used.
+
+    Arguments:
+        future (Future): The request.
+    """
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _send_hedged(session: requests.Session, method: str, url: str, share: float, **kwargs) -> requests.Response:
+    """
+    Send a request, sending it again if it has not been answered once the hedging percentile of recent latencies has passed.
+
+    Arguments:
+        session (requests.Session): The session to send the request with.
+        method (str): The request method.
+        url (str): The request URL.
+        share (float): The share of the time left before the deadline the request may use.
+        **kwargs: The arguments of requests.Session.request().
+
+    Returns:
+        requests.Response: The first response to arrive.
+
+    Raises:
+        requests.RequestException: If both requests fail (the error of the last to fail).
+    """
+    pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='hedge')
+    first: Future = pool.submit(_send_once, session, method, url, share, **kwargs)
+    threshold: Optional[float] = _latencies.percentile(REQUEST_SETTINGS.hedge)
+
+    try:
+        return first.result(timeout=threshold if threshold is not None else HEDGE_DELAY)
+    except FutureTimeoutError:
+        pending: Set[Future] = {first, pool.submit(_send_once, session, method, url, share, **kwargs)}
+    finally:
+        # Nothing more is sent from the pair of threads, which exit once the requests already sent are answered
+        pool.shutdown(wait=False)
+
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                for other in pending:
+                    other.add_done_callback(_close_response)
+                return future.result()
+
+    raise error
+
+
+def _wait_to_retry(attempt: int, response: Optional[requests.Response]) -> bool:
+    """
+    Wait before retrying a request, if it should be retried.
+
+    Arguments:
+        attempt (int): The number of retries so far.
+        response (Optional[requests.Response]): The response with a retryable status, or None if the request failed.
+
+    Returns:
+        bool: True if the request should be retried now, or False if there are no retries left or the deadline would pass first.
+    """
+    if attempt >= REQUEST_SETTINGS.retries:
+        return False
+
+    delay: float = random.uniform(0, REQUEST_SETTINGS.backoff * 2 ** attempt)  # nosec B311
+    retry_after: str = response.headers.get('Retry-After', '') if response is not None else ''
+    if retry_after.isdigit():
+        delay = min(float(retry_after), RETRY_AFTER_LIMIT)
+
+    left: Optional[float] = time_left()
+    if left is not None and delay >= left:
+        return False
+
+    time.sleep(delay)
+    return True
+
+
+def send_request(session: requests.Session, method: str, url: str, share: float = 1.0, **kwargs) -> requests.Response:
+    """
+    Send an upstream request, retrying and hedging it as configured.
+
+    Arguments:
+        session (requests.Session): The session to send the request with.
+        method (str): The request method (GET or HEAD, as only idempotent requests can be retried).
+        url (str): The request URL.
+        share (float): The share of the time left before the deadline each attempt may use.
+        **kwargs: The arguments of requests.Session.request() (except timeout).
+
+    Returns:
+        requests.Response: The response, which has a retryable status only if the retries ran out.
+
+    Raises:
+        requests.RequestException: If the request failed and the retries ran out.
+        DeadlineExceededError: If the deadline passed before the request could be sent.
+    """
+    attempt: int = 0
+
+    while True:
+        try:
+            if REQUEST_SETTINGS.hedge is not None:
+                response: requests.Response = _send_hedged(session, method, url, share, **kwargs)
+            else:
+                response = _send_once(session, method, url, share, **kwargs)
+        except _RETRY_ERRORS:
+            if not _wait_to_retry(attempt, None):
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or not _wait_to_retry(attempt, response):
+                return response
+            response.close()
+
+        attempt += 1
@@ -0,0 +1,244 @@
+"""
+This module exports and reads offline snapshots of all of the upstream data.
+
+A snapshot is a single versioned file holding, for every supported language, the resolved release
+tag and the pre-parsed versions needed to answer any query (the highest version of each major.minor,
+with and without pre-releases), along with the compact EOL schedules. It is laid out as:
+
+    magic (8 bytes) | format version (uint32) | header length (uint32) | header (JSON) | data
+
+The header is a small directory pointing at the versions of each source within the data section,
+so reading a snapshot memory-maps the file, decodes the header and then only decodes the versions
+of the languages that are actually queried, with no network access at all.
+"""
+
+import datetime
+import json
+import mmap
+import struct
+import time
+
+from types import SimpleNamespace, TracebackType
+from typing import Dict, List, Optional, Type
+
+from packaging import version as semver
+
+from .constants import SUPPORTED_LANGUAGES, URLS
+from .eol import Schedule, get_eol_schedule, minimum_version_from_schedule
+from .exceptions import SnapshotError
+from .globals import DEFAULT_WORKERS, SNAPSHOT_FORMAT_VERSION
+from .index import VersionIndex
+from .parsing import index_versions
+from .process import make_record
+from .records import VersionRecord
+from .versions import fetch_stable_versions, get_minimum_version, get_source_key, get_source_tag
+from .workers import map_unique
+
+# Identifies a snapshot file
+_MAGIC: bytes = b'GLVSNAP\x00'
+
+# The fixed size prefix: magic, format version and header length
+_PREFIX: struct.Struct = struct.Struct('<8sII')
+
+
+def _capture_source(language: str, speculative: bool) -> SimpleNamespace:
+    """
+    Fetch, parse and index the versions data for a language.
+
+    Arguments:
+        language (str): The supported language.
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+
+    Returns:
+        SimpleNamespace: The release tag (tag) and the versions needed to answer any query (versions).
+    """
+    index: VersionIndex = index_versions(language, fetch_stable_versions(language, speculative, stream=True))
+    return SimpleNamespace(tag=get_source_tag(language), versions=[record.text for record in index.records()])
+
+
+def export_snapshot(path: str, speculative: bool = False, workers: int = DEFAULT_WORKERS) -> SimpleNamespace:
+    """
+    Capture the upstream data for every supported language into a snapshot file.
+
+    Arguments:
+        path (str): The file to write the snapshot to.
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+        workers (int): The maximum number of concurrent fetches.
+
+    Returns:
+        SimpleNamespace: A summary of the snapshot (languages, versions and size).
+
+    Raises:
+        SnapshotError: If the snapshot cannot be written.
+    """
+    sources: Dict[str, SimpleNamespace] = map_unique(lambda language: _capture_source(language, speculative), SUPPORTED_LANGUAGES,
+                                                     key=get_source_key, max_workers=workers)
+    schedules: Dict[str, Schedule] = map_unique(lambda language: get_eol_schedule(URLS[language]["eol_url"]), SUPPORTED_LANGUAGES,
+                                                key=lambda language: get_source_key(language, "eol_url"), max_workers=workers)
+
+    data: bytearray = bytearray()
+    blocks: Dict[tuple, List[int]] = {}
+    directory: Dict[str, dict] = {}
+
+    for language in SUPPORTED_LANGUAGES:
+        source_key: tuple = get_source_key(language)
+        if source_key not in blocks:
+            block: bytes = '\n'.join(sources[language].versions).encode('utf-8')
+            blocks[source_key] = [len(data), len(block)]
+            data += block
+        directory[language] = {"tag": sources[language].tag, "versions": blocks[source_key], "eol": URLS[language]["eol_url"]}
+
+    header: bytes = json.dumps({
+        "created_at": time.time(),
+        "languages": directory,
+        "eol": {URLS[language]["eol_url"]: schedules[language] for language in SUPPORTED_LANGUAGES},
+    }, separators=(',', ':')).encode('utf-8')
+
+    try:
+        with open(path, 'wb') as handle:
+            handle.write(_PREFIX.pack(_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header)))
+            handle.write(header)
+            handle.write(data)
+    except OSError as err:
+        raise SnapshotError(f"Unable to write the snapshot to {path}: {err}") from err
+
+    return SimpleNamespace(languages=list(SUPPORTED_LANGUAGES), versions=sum(len(source.versions) for source in sources.values()),
+                           size=_PREFIX.size + len(header) + len(data))
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot, answering queries with no network access.
+
+    Arguments:
+        path (str): The snapshot file.
+
+    Raises:
+        SnapshotError: If the file cannot be read or is not a supported snapshot.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Map the snapshot file and read its header."""
+        self._indexes: Dict[str, VersionIndex] = {}
+
+        try:
+            with open(path, 'rb') as handle:
+                self._map: mmap.mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as err:
+            raise SnapshotError(f"Unable to read the snapshot {path}: {err}") from err
+
+        try:
+            magic, format_version, header_length = _PREFIX.unpack_from(self._map)
+            if magic != _MAGIC:
+                raise ValueError("not a snapshot file")
+            if format_version != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"unsupported snapshot format version {format_version}")
+            header: dict = json.loads(self._map[_PREFIX.size:_PREFIX.size + header_length])
+        except (struct.error, ValueError) as err:
+            self.close()
+            raise SnapshotError(f"Unable to read the snapshot {path}: {err}") from err
+
+        self.created_at: float = header["created_at"]
+        self._languages: Dict[str, dict] = header["languages"]
+        self._schedules: Dict[str, Schedule] = header["eol"]
+        self._data_offset: int = _PREFIX.size + header_length
+
+    def __enter__(self) -> 'Snapshot':
+        """
+        Use the snapshot as a context manager.
+
+        Returns:
+            Snapshot: This snapshot.
+        """
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        """Close the snapshot."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._map.close()
+
+    def _entry(self, language: str) -> dict:
+        """
+        Get the directory entry for a language.
+
+        Arguments:
+            language (str): The supported language.
+
+        Returns:
+            dict: The directory entry.
+
+        Raises:
+            SnapshotError: If the snapshot does not include the language.
+        """
+        if language not in self._languages:
+            raise SnapshotError(f"The snapshot does not include {language}")
+        return self._languages[language]
+
+    def tag(self, language: str) -> Optional[str]:
+        """
+        Get the release tag the versions data for a language was captured from.
+
+        Arguments:
+            language (str): The supported language.
+
+        Returns:
+            Optional[str]: The release tag, or None if the versions data is not tagged.
+        """
+        return self._entry(language)["tag"]
+
+    def index(self, language: str) -> VersionIndex:
+        """
+        Get the index for a language, decoding its versions from the snapshot the first time it is used.
+
+        Arguments:
+            language (str): The supported language.
+
+        Returns:
+            VersionIndex: The index.
+        """
+        if language not in self._indexes:
+            offset, length = self._entry(language)["versions"]
+            start: int = self._data_offset + offset
+            texts: List[str] = self._map[start:start + length].decode('utf-8').split('\n') if length else []
+            self._indexes[language] = VersionIndex(record for record in map(VersionRecord.parse, texts) if record is not None)
+        return self._indexes[language]
+
+    def min_version(self, min_version_str: str, language: str) -> semver.Version:
+        """
+        Get the minimum version for a language, using the captured EOL schedule for "EOL".
+
+        Arguments:
+            min_version_str (str): The min-version as supplied by the user.
+            language (str): The supported language.
+
+        Returns:
+            semver.Version: The minimum version for the language.
+        """
+        if min_version_str.upper() != 'EOL':
+            return get_minimum_version(min_version_str, language)
+        return minimum_version_from_schedule(self._schedules[self._entry(language)["eol"]], datetime.date.today())
+
+    def query(self, language: str, config: SimpleNamespace, min_version_str: str) -> dict:
+        """
+        Answer a query for a language.
+
+        Arguments:
+            language (str): The supported language.
+            config (SimpleNamespace): The query settings (max_version, include_pre_releases, remove_patch_version,
+                highest_only and max_versions are used).
+            min_version_str (str): The min-version as supplied by the user.
+
+        Returns:
+            dict: The structured result for the language (see process.make_record).
+        """
+        started: float = time.perf_counter()
+        min_version: semver.Version = self.min_version(min_version_str, language)
+        versions: List[str] = self.index(language).query(config, min_version)
+        elapsed: float = time.perf_counter() - started
+
+        source: SimpleNamespace = SimpleNamespace(tag=self.tag(language), from_cache=True, memoized=False,
+                                                  timings={"fetch": 0.0, "process": elapsed, "total": elapsed})
+        return make_record(language, versions, min_version, config, source)
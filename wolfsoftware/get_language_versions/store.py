@@ -0,0 +1,304 @@
+"""
+This module provides a local SQLite store of every version seen for each upstream source.
+
+Each version is stored once per source with its major/minor/patch integer columns, the pre-release
+flag, the release tag it was first seen in, when it was first seen and whether the versions data
+last merged still lists it. Refreshing a source only adds versions that are not already known and
+marks the ones upstream has withdrawn (and is skipped entirely if the versions data has not changed).
+Range and highest-per-minor queries are narrowed down by indexed SQL over the versions still listed,
+so they answer exactly as a query of the versions data itself would. Nothing is ever removed, so the
+store can also answer which versions appeared since a given time, withdrawn or not.
+
+The first import of a source is a baseline: the versions it already lists were released at some
+unknown time before the store saw them, so they are recorded as first seen at BASELINE and are
+never listed as new. Only the versions added by later refreshes are.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from typing import Iterable, List, Optional
+
+from packaging import version as semver
+
+from .cache import CACHE_SETTINGS
+from .globals import STORE_FILENAME
+from .records import VersionRecord
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS versions (
+    source TEXT NOT NULL,
+    version TEXT NOT NULL,
+    major INTEGER NOT NULL,
+    minor INTEGER NOT NULL,
+    patch INTEGER NOT NULL,
+    prerelease INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    tag TEXT,
+    present INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (source, version)
+);
+CREATE INDEX IF NOT EXISTS versions_by_minor ON versions (source, prerelease, major, minor, patch);
+CREATE INDEX IF NOT EXISTS versions_by_first_seen ON versions (source, first_seen);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    digest TEXT,
+    tag TEXT,
+    refreshed_at REAL NOT NULL
+);
+"""
+
+# Adds the column marking the versions still listed upstream to a store created before it existed
+_ADD_PRESENT_SQL: str = "ALTER TABLE versions ADD COLUMN present INTEGER NOT NULL DEFAULT 1"
+
+# Adds a version, or marks a known version as still listed upstream
+_UPSERT_SQL: str = """
+INSERT INTO versions (source, version, major, minor, patch, prerelease, first_seen, tag, present) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+ON CONFLICT (source, version) DO UPDATE SET present = 1
+"""
+
+# Selects the highest patch release of each major.minor in range still listed upstream, ties (e.g. pre-releases of the same patch) are settled by VersionIndex
+_CANDIDATES_SQL: str = """
+SELECT version FROM versions AS v
+WHERE v.source = :source AND v.present = 1 AND (v.prerelease = 0 OR :include_pre)
+  AND (v.major > :min_major OR (v.major = :min_major AND v.minor >= :min_minor))
+  AND (v.major < :max_major OR (v.major = :max_major AND v.minor <= :max_minor))
+  AND v.patch = (SELECT MAX(w.patch) FROM versions AS w
+                 WHERE w.source = v.source AND w.present = 1 AND w.major = v.major AND w.minor = v.minor AND (w.prerelease = 0 OR :include_pre))
+"""
+
+# The first seen time of the versions found by the first import of a source, which are never listed as new
+BASELINE: float = 0.0
+
+# Selects every version in range that was first seen at or after the given time, excluding the baseline
+_SINCE_SQL: str = """
+SELECT version FROM versions
+WHERE source = :source AND first_seen > :baseline AND first_seen >= :since AND (prerelease = 0 OR :include_pre)
+  AND (major > :min_major OR (major = :min_major AND minor >= :min_minor))
+  AND (major < :max_major OR (major = :max_major AND minor <= :max_minor))
+"""
+
+
+def _major_minor(version: semver.Version) -> tuple:
+    """
+    Get the major and minor numbers of a version (a missing minor number is zero).
+
+    Arguments:
+        version (semver.Version): The version.
+
+    Returns:
+        tuple: The major and minor numbers.
+    """
+    return (version.release + (0,))[:2]
+
+
+def _range_parameters(min_version: semver.Version, max_version: semver.Version, include_pre: bool) -> dict:
+    """
+    Build the query parameters for a version range.
+
+    Arguments:
+        min_version (semver.Version): The minimum version (compared against major.minor).
+        max_version (semver.Version): The maximum version (compared against major.minor).
+        include_pre (bool): Include pre-release versions.
+
+    Returns:
+        dict: The query parameters.
+    """
+    min_major, min_minor = _major_minor(min_version)
+    max_major, max_minor = _major_minor(max_version)
+
+    return {"min_major": min_major, "min_minor": min_minor, "max_major": max_major, "max_minor": max_minor, "include_pre": int(include_pre)}
+
+
+class VersionStore:
+    """
+    A thread-safe SQLite store of the versions seen for each upstream source.
+
+    Arguments:
+        path (str): The database file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open (and if needed create) the database."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path: str = path
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+
+        columns: List[str] = [row[1] for row in self._connection.execute("PRAGMA table_info(versions)")]
+        if 'present' not in columns:
+            with self._connection:
+                self._connection.execute(_ADD_PRESENT_SQL)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+    def is_current(self, source: str, digest: Optional[str]) -> bool:
+        """
+        Check whether the store already holds the versions data with the given digest for a source.
+
+        Arguments:
+            source (str): The source.
+            digest (Optional[str]): The digest of the versions data, if known.
+
+        Returns:
+            bool: True if the versions data has already been merged in.
+        """
+        if digest is None:
+            return False
+
+        with self._lock:
+            row: Optional[tuple] = self._connection.execute("SELECT digest FROM sources WHERE source = ?", (source,)).fetchone()
+        return row is not None and row[0] == digest
+
+    def merge(self, source: str, records: Iterable[VersionRecord], tag: Optional[str], digest: Optional[str]) -> int:
+        """
+        Merge versions into the store, adding the versions that are not already known and marking which are still listed.
+
+        The versions of the first import of a source are recorded as first seen at BASELINE, as when
+        they were released is not known, so that only versions added by later refreshes are listed as new.
+        Known versions missing from the versions data (e.g. withdrawn releases) are kept, but are no
+        longer used to answer queries.
+
+        Arguments:
+            source (str): The source.
+            records (Iterable[VersionRecord]): The versions found in the versions data.
+            tag (Optional[str]): The release tag the versions data was fetched from.
+            digest (Optional[str]): The digest of the versions data, if known.
+
+        Returns:
+            int: The number of new versions.
+        """
+        now: float = time.time()
+
+        with self._lock, self._connection:
+            imported: bool = self._connection.execute("SELECT 1 FROM sources WHERE source = ?", (source,)).fetchone() is not None
+            first_seen: float = now if imported else BASELINE
+            rows: List[tuple] = [(source, record.text, record.major, record.minor, record.patch, int(record.is_prerelease), first_seen, tag)
+                                 for record in records]
+            before: int = self._count(source)
+            self._connection.execute("UPDATE versions SET present = 0 WHERE source = ?", (source,))
+            self._connection.executemany(_UPSERT_SQL, rows)
+            added: int = self._count(source) - before
+            self._connection.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)", (source, digest, tag, now))
+
+        return added
+
+    def _count(self, source: str) -> int:
+        """
+        Count the versions stored for a source (the caller must hold the lock).
+
+        Arguments:
+            source (str): The source.
+
+        Returns:
+            int: The number of versions.
+        """
+        return self._connection.execute("SELECT COUNT(*) FROM versions WHERE source = ?", (source,)).fetchone()[0]
+
+    def _select(self, sql: str, parameters: dict) -> List[VersionRecord]:
+        """
+        Run a query returning versions, and parse them into records.
+
+        Arguments:
+            sql (str): The query.
+            parameters (dict): The query parameters.
+
+        Returns:
+            List[VersionRecord]: The versions, lowest first.
+        """
+        with self._lock:
+            rows: List[tuple] = self._connection.execute(sql, parameters).fetchall()
+
+        records: List[VersionRecord] = [record for record in map(VersionRecord.parse, (row[0] for row in rows)) if record is not None]
+        return sorted(records, key=lambda record: record.key)
+
+    def candidates(self, source: str, min_version: semver.Version, max_version: semver.Version, include_pre: bool = False) -> List[VersionRecord]:
+        """
+        Get the highest patch release of each major.minor in range.
+
+        The result is a small superset of the versions that answer a query (the range is only compared
+        against major.minor here), to be settled exactly by a VersionIndex.
+
+        Arguments:
+            source (str): The source.
+            min_version (semver.Version): The minimum version.
+            max_version (semver.Version): The maximum version.
+            include_pre (bool): Include pre-release versions.
+
+        Returns:
+            List[VersionRecord]: The candidate versions, lowest first.
+        """
+        return self._select(_CANDIDATES_SQL, dict(_range_parameters(min_version, max_version, include_pre), source=source))
+
+    def since(self, source: str, since: float, min_version: semver.Version, max_version: semver.Version, include_pre: bool = False) -> List[VersionRecord]:
+        """
+        Get every version in range that was first seen at or after the given time.
+
+        Versions found by the first import of the source are never included, so a source that has
+        not been refreshed since it was first imported has no new versions.
+
+        Arguments:
+            source (str): The source.
+            since (float): The time (as a timestamp).
+            min_version (semver.Version): The minimum version (compared against major.minor).
+            max_version (semver.Version): The maximum version (compared against major.minor).
+            include_pre (bool): Include pre-release versions.
+
+        Returns:
+            List[VersionRecord]: The versions, lowest first.
+        """
+        parameters: dict = dict(_range_parameters(min_version, max_version, include_pre), source=source, since=since, baseline=BASELINE)
+        records: List[VersionRecord] = self._select(_SINCE_SQL, parameters)
+        return [record for record in records if min_version <= record.major_minor <= max_version]
+
+
+# The store used by process_languages, this is replaced by configure_store()
+_version_store: Optional[VersionStore] = None
+
+
+def get_store() -> Optional[VersionStore]:
+    """
+    Get the version store.
+
+    Returns:
+        Optional[VersionStore]: The store, or None if the store is not in use.
+    """
+    return _version_store
+
+
+def configure_store(enabled: bool = False, path: Optional[str] = None) -> None:
+    """
+    Configure the version store used for subsequent queries.
+
+    Arguments:
+        enabled (bool): Record versions in, and answer queries from, the store.
+        path (Optional[str]): The database file, defaults to a file in the cache directory.
+    """
+    global _version_store
+
+    if _version_store is not None:
+        _version_store.close()
+        _version_store = None
+
+    if enabled:
+        _version_store = VersionStore(path or os.path.join(CACHE_SETTINGS.directory, STORE_FILENAME))
+
+
+def store_source(language: str, urls: dict) -> str:
+    """
+    Get the name a language's versions are stored under (languages sharing the same versions data share a name).
+
+    Arguments:
+        language (str): The supported language.
+        urls (dict): The URLs for the language.
+
+    Returns:
+        str: The source name.
+    """
+    return urls.get("versions_url", language)
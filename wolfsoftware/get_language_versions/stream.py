@@ -0,0 +1,267 @@
+"""
+This module provides incremental extraction of items from large JSON and HTML documents.
+
+It defines a reader that decodes a JSON array one element at a time as the response body arrives,
+so only the current element (and, for objects, only the wanted fields) is ever held in memory
+rather than the whole parsed document, and a scanner that yields the link targets of an HTML
+page as it is read without building a DOM.
+"""
+
+import codecs
+import json
+import re
+
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+_WHITESPACE: str = ' \t\n\r'
+
+# The characters a JSON number can continue with
+_NUMBER_CHARACTERS: str = '0123456789.eE+-'
+
+# Matches the href attribute of an anchor tag
+_ANCHOR_HREF_RE: re.Pattern = re.compile(r'''<a\s[^>]*?href\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+
+# The longest anchor tag prefix that is held back between chunks while waiting for the rest of it
+_MAX_ANCHOR_LENGTH: int = 1024
+
+
+class _JSONStreamReader:
+    """
+    A minimal pull reader over a JSON document delivered as chunks of bytes.
+
+    Arguments:
+        chunks (Iterable[bytes]): The document, in chunks.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        """Initialise the reader."""
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._json: json.JSONDecoder = json.JSONDecoder()
+        self._buffer: str = ''
+        self._pos: int = 0
+        self._exhausted: bool = False
+
+    def _fill(self) -> bool:
+        """
+        Append the next chunk to the buffer, discarding anything already consumed.
+
+        Returns:
+            bool: False if there is no more data.
+        """
+        if self._exhausted:
+            return False
+
+        chunk: Optional[bytes] = next(self._chunks, None)
+        if chunk is None:
+            self._exhausted = True
+            self._buffer = self._buffer[self._pos:] + self._decoder.decode(b'', final=True)
+        else:
+            self._buffer = self._buffer[self._pos:] + self._decoder.decode(chunk)
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            str: The next character, or an empty string at the end of the document.
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """
+        Consume the next (non-whitespace) character, which must be the given character.
+
+        Arguments:
+            char (str): The expected character.
+
+        Raises:
+            ValueError: If a different character is found.
+        """
+        found: str = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON stream")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode and consume the next complete JSON value.
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            ValueError: If the document ends before the value is complete.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number running to the end of the buffer (e.g. "1" or "1." or "1e") may continue in the next chunk
+            if not self._exhausted and all(char in _NUMBER_CHARACTERS for char in self._buffer[end:]):
+                self._fill()
+                continue
+
+            self._pos = end
+            return value
+
+    def object_fields(self, fields: Sequence[str]) -> dict:
+        """
+        Consume the next JSON object, keeping only the requested fields.
+
+        Arguments:
+            fields (Sequence[str]): The names of the fields to keep.
+
+        Returns:
+            dict: The requested fields that were present in the object.
+        """
+        result: dict = {}
+
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return result
+
+        while True:
+            key: str = self.value()
+            self.expect(':')
+            field_value: Any = self.value()
+            if key in fields:
+                result[key] = field_value
+            if self.peek() == ',':
+                self._pos += 1
+                continue
+            self.expect('}')
+            return result
+
+    def seek_key(self, key: str) -> None:
+        """
+        Consume the start of the next JSON object up to (and including) the given key.
+
+        Arguments:
+            key (str): The key to find.
+
+        Raises:
+            KeyError: If the object does not contain the key.
+        """
+        self.expect('{')
+        while self.peek() != '}':
+            if self.value() == key:
+                self.expect(':')
+                return
+            self.expect(':')
+            self.value()
+            if self.peek() == ',':
+                self._pos += 1
+        raise KeyError(key)
+
+    def skip_object_rest(self) -> None:
+        """Consume the remaining members of the object currently being read, including its closing brace."""
+        while self.at(','):
+            self.value()
+            self.expect(':')
+            self.value()
+        self.expect('}')
+
+    def finish(self) -> None:
+        """
+        Read the rest of the document, which must only contain whitespace.
+
+        This ensures the underlying chunk iterator is exhausted, so anything that acts once the whole
+        body has been read (such as committing it to the cache) is run.
+
+        Raises:
+            ValueError: If there is anything other than whitespace after the value.
+        """
+        found: str = self.peek()
+        if found:
+            raise ValueError(f"Unexpected '{found}' after the end of the JSON stream")
+
+    def at(self, char: str) -> bool:
+        """
+        Consume the next character if it is the given character.
+
+        Arguments:
+            char (str): The character to test for.
+
+        Returns:
+            bool: True if the character was found and consumed.
+        """
+        if self.peek() == char:
+            self._pos += 1
+            return True
+        return False
+
+
+def iter_json_array(chunks: Iterable[bytes], path: Sequence[str] = (), fields: Optional[Sequence[str]] = None) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array one at a time as the document is read.
+
+    Arguments:
+        chunks (Iterable[bytes]): The JSON document, in chunks.
+        path (Sequence[str]): The keys leading from the top level object to the array (empty if the document is the array).
+        fields (Optional[Sequence[str]]): If given, elements are objects and only these fields are kept.
+
+    Yields:
+        Any: The next element of the array.
+
+    Raises:
+        ValueError: If the document is not valid JSON or does not have the expected shape.
+        KeyError: If a key in the path is not present.
+    """
+    reader: _JSONStreamReader = _JSONStreamReader(chunks)
+
+    for key in path:
+        reader.seek_key(key)
+
+    reader.expect('[')
+    if not reader.at(']'):
+        while True:
+            yield reader.object_fields(fields) if fields is not None else reader.value()
+            if reader.at(']'):
+                break
+            reader.expect(',')
+
+    # Read the rest of the document, so the chunks are exhausted and the body is cached
+    for _ in path:
+        reader.skip_object_rest()
+    reader.finish()
+
+
+def iter_html_links(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Yield the href of every anchor tag in an HTML document as the document is read.
+
+    Arguments:
+        chunks (Iterable[bytes]): The HTML document, in chunks.
+
+    Yields:
+        str: The next link target, in document order.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    buffer: str = ''
+
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        last_end: int = 0
+        for match in _ANCHOR_HREF_RE.finditer(buffer):
+            last_end = match.end()
+            yield match.group(1)
+        buffer = buffer[max(last_end, len(buffer) - _MAX_ANCHOR_LENGTH):]
+
+    buffer += decoder.decode(b'', final=True)
+    for match in _ANCHOR_HREF_RE.finditer(buffer):
+        yield match.group(1)
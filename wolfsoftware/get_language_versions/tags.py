@@ -1,29 +1,90 @@
 """
 This module handles HTTP requests to retrieve the latest tag from release URLs.
 
-It defines a function to make HTTP requests to the specified URL and extract
-the latest version tag from the response.
+It defines a function that resolves the redirect of the specified releases URL, without
+downloading the releases page itself, and extracts the latest version tag from the redirect
+target. Resolved tags are cached for a short time, both in memory and on disk, and the last resolved
+tag is used if the redirect cannot be resolved in time.
 """
 
-import requests
+import threading
+import time
 
-from .globals import REQUESTS_TIMEOUT
+from typing import Dict, Tuple
+
+from .cache import is_fresh, load_entry, store_entry
+from .exceptions import TagNotFoundError
+from .fetch import resolve_redirect
+from .globals import TAG_CACHE_TTL
+from .resilience import UPSTREAM_ERRORS
+from .timings import annotate
+
+_tag_cache: Dict[str, Tuple[float, str]] = {}
+_tag_cache_lock: threading.Lock = threading.Lock()
+
+
+def _is_tag_url(url: str) -> bool:
+    """
+    Check whether a URL points to a specific release tag.
+
+    Arguments:
+        url (str): The URL to check.
+
+    Returns:
+        bool: True if the URL is a release tag URL.
+    """
+    return '/releases/tag/' in url and bool(url.rstrip('/').split('/releases/tag/')[-1])
 
 
 def get_latest_tag(releases_url: str) -> str:
     """
     Retrieve the latest version tag from the given releases URL.
 
-    This function sends an HTTP GET request to the specified releases URL and
-    extracts the latest version tag from the response URL.
+    This function follows the redirect of the specified releases URL using HEAD requests and
+    extracts the latest version tag from the redirect target. The tag page itself is never
+    requested. Results are cached per releases URL for TAG_CACHE_TTL seconds, and if upstream cannot
+    be reached (after any retries, or because the deadline has passed) the last tag resolved is used.
 
     Arguments:
         releases_url (str): The URL to the releases page.
 
     Returns:
-        str: The latest version tag extracted from the response URL.
+        str: The latest version tag extracted from the redirect target.
+
+    Raises:
+        TagNotFoundError: If the releases URL does not redirect to a release tag.
+        requests.RequestException: If upstream cannot be reached and no tag has been resolved before.
+        DeadlineExceededError: If the deadline has passed and no tag has been resolved before.
     """
-    response: requests.models.Response = requests.get(releases_url, timeout=REQUESTS_TIMEOUT)
-    version: str = response.url.split('/')[-1]
+    with _tag_cache_lock:
+        cached: Tuple[float, str] = _tag_cache.get(releases_url, (0.0, ''))
+    if cached[1] and time.time() - cached[0] < TAG_CACHE_TTL:
+        annotate(cache='hit')
+        return cached[1]
+
+    entry = load_entry(releases_url)
+    if entry is not None and is_fresh(entry, TAG_CACHE_TTL) and _is_tag_url(entry.final_url):
+        tag_url: str = entry.final_url
+        annotate(cache='hit')
+    else:
+        try:
+            tag_url = resolve_redirect(releases_url, stop_when=_is_tag_url)
+        except UPSTREAM_ERRORS:
+            if entry is None or not _is_tag_url(entry.final_url):
+                raise
+            tag_url = entry.final_url
+            annotate(cache='stale')
+        else:
+            annotate(cache='miss')
+
+            if not _is_tag_url(tag_url):
+                raise TagNotFoundError(f"Unable to determine the latest tag from {releases_url} (resolved to {tag_url})")
+
+            store_entry(releases_url, tag_url, b'', None, None)
+
+    version: str = tag_url.rstrip('/').split('/')[-1]
+
+    with _tag_cache_lock:
+        _tag_cache[releases_url] = (time.time(), version)
 
     return version
@@ -0,0 +1,260 @@
+"""
+This module provides the timing instrumentation for each phase of answering a query.
+
+The phases (resolving the latest tag, downloading the versions data, loading the EOL data, parsing
+and filtering) are each measured as a span, recording the wall time along with the bytes read, whether
+the upstream data came from the cache and the number of items produced, where these apply. Code deeper
+in the call stack (e.g. fetch_url) annotates the innermost span open on the same thread.
+
+A streamed response body is read while it is parsed, after the download span has ended with the response
+headers. The time spent reading it and its bytes are taken out of the span it was read in and passed on as
+a separate download span, so transfer is always reported under download and parse only covers parsing.
+
+Completed spans are passed to every subscribed callback, which is how the --timings report is built and
+how library users can feed them into their own metrics. Nothing is measured while there are no subscribers.
+"""
+
+import json
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# The phases, in the order they happen for a language
+PHASES: List[str] = ['tag', 'download', 'eol', 'parse', 'filter']
+
+# The formats the --timings report can be written in
+TIMINGS_FORMATS: List[str] = ['table', 'json']
+
+# The phases that fetch upstream data, a body read during any other phase is reported under download
+FETCH_PHASES: List[str] = ['tag', 'download', 'eol']
+
+# The fields of a span passed to the subscribers
+_FIELDS: tuple = ('phase', 'name', 'seconds', 'bytes', 'cache', 'items')
+
+_subscribers: List[Callable[[dict], None]] = []
+_subscribers_lock: threading.Lock = threading.Lock()
+_spans: threading.local = threading.local()
+
+
+def subscribe(callback: Callable[[dict], None]) -> None:
+    """
+    Subscribe to completed spans.
+
+    The callback is called with a dictionary holding the phase, name (the language), seconds, bytes,
+    cache ('hit', 'revalidated', 'stale' or 'miss') and items of each span as it completes. Fields that do not
+    apply are None. It is called from the thread that ran the phase, so it must be thread-safe. A language
+    can have more than one span for a phase (e.g. a download span for the response headers and another
+    for a body read while parsing), their seconds and bytes add up.
+
+    Arguments:
+        callback (Callable[[dict], None]): The callback.
+    """
+    with _subscribers_lock:
+        _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[dict], None]) -> None:
+    """
+    Stop passing completed spans to a callback.
+
+    Arguments:
+        callback (Callable[[dict], None]): The callback passed to subscribe().
+    """
+    with _subscribers_lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+@contextmanager
+def measure(phase: str, name: str) -> Iterator[Optional[SimpleNamespace]]:
+    """
+    Measure a phase as a span, passing it to the subscribers when it completes.
+
+    Arguments:
+        phase (str): The phase, one of PHASES.
+        name (str): The language the phase is for.
+
+    Yields:
+        Optional[SimpleNamespace]: The span, or None if there are no subscribers.
+    """
+    if not _subscribers:
+        yield None
+        return
+
+    span: SimpleNamespace = SimpleNamespace(phase=phase, name=name, seconds=0.0, bytes=None, cache=None, items=None, transfer_seconds=0.0,
+                                            transfer_bytes=None)
+    stack: List[SimpleNamespace] = _spans.__dict__.setdefault('stack', [])
+    stack.append(span)
+    started: float = time.perf_counter()
+
+    try:
+        yield span
+    finally:
+        span.seconds = time.perf_counter() - started
+        stack.pop()
+        completed: List[dict] = [{field: getattr(span, field) for field in _FIELDS}]
+
+        # A body read during another phase is reported under download
+        if span.transfer_bytes is not None:
+            completed[0]["seconds"] = max(span.seconds - span.transfer_seconds, 0.0)
+            completed.insert(0, {"phase": 'download', "name": name, "seconds": span.transfer_seconds, "bytes": span.transfer_bytes,
+                                 "cache": None, "items": None})
+
+        with _subscribers_lock:
+            subscribers: List[Callable[[dict], None]] = list(_subscribers)
+        for callback in subscribers:
+            for completed_span in completed:
+                callback(dict(completed_span))
+
+
+def _current_span() -> Optional[SimpleNamespace]:
+    """
+    Get the innermost span open on this thread.
+
+    Returns:
+        Optional[SimpleNamespace]: The span, or None if there is none.
+    """
+    stack: Optional[List[SimpleNamespace]] = getattr(_spans, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def annotate(cache: Optional[str] = None, items: Optional[int] = None) -> None:
+    """
+    Record whether upstream data came from the cache, or the number of items produced, on the innermost open span.
+
+    Arguments:
+        cache (Optional[str]): 'hit', 'revalidated', 'stale' or 'miss'.
+        items (Optional[int]): The number of items produced.
+    """
+    span: Optional[SimpleNamespace] = _current_span()
+    if span is None:
+        return
+
+    if cache is not None:
+        span.cache = cache
+    if items is not None:
+        span.items = items
+
+
+def count_bytes(size: int) -> None:
+    """
+    Add to the number of bytes read by the innermost open span.
+
+    Arguments:
+        size (int): The number of bytes read.
+    """
+    span: Optional[SimpleNamespace] = _current_span()
+    if span is not None:
+        span.bytes = (span.bytes or 0) + size
+
+
+def count_transfer(seconds: float, size: int) -> None:
+    """
+    Record reading part of a response body on the innermost open span.
+
+    Outside of the phases that fetch upstream data (i.e. a streamed body read while parsing) the time
+    and bytes are taken out of the span when it completes, and reported as a separate download span.
+
+    Arguments:
+        seconds (float): The number of seconds spent reading.
+        size (int): The number of bytes read.
+    """
+    span: Optional[SimpleNamespace] = _current_span()
+    if span is None:
+        return
+
+    if span.phase in FETCH_PHASES:
+        span.bytes = (span.bytes or 0) + size
+    else:
+        span.transfer_seconds += seconds
+        span.transfer_bytes = (span.transfer_bytes or 0) + size
+
+
+class TimingsReport:
+    """
+    Collect completed spans and write them as a report, with one row for each language and phase.
+
+    Arguments:
+        languages (List[str]): The languages, in the order they were requested (used to order the report).
+    """
+
+    def __init__(self, languages: Optional[List[str]] = None) -> None:
+        """Initialise an empty report."""
+        self.languages: List[str] = languages or []
+        self._spans: Dict[tuple, dict] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, span: dict) -> None:
+        """
+        Collect a completed span (this is the subscriber callback), adding it to any earlier span of the same language and phase.
+
+        Arguments:
+            span (dict): The completed span.
+        """
+        key: tuple = (span["name"], span["phase"])
+
+        with self._lock:
+            if key not in self._spans:
+                self._spans[key] = dict(span)
+                return
+
+            merged: dict = self._spans[key]
+            merged["seconds"] += span["seconds"]
+            for field in ('bytes', 'items'):
+                if span[field] is not None:
+                    merged[field] = (merged[field] or 0) + span[field]
+            merged["cache"] = merged["cache"] or span["cache"]
+
+    def spans(self) -> List[dict]:
+        """
+        Get the collected spans, ordered by language and then phase.
+
+        Returns:
+            List[dict]: The spans.
+        """
+        def order(span: dict) -> tuple:
+            language: int = self.languages.index(span["name"]) if span["name"] in self.languages else len(self.languages)
+            return (language, span["name"], PHASES.index(span["phase"]) if span["phase"] in PHASES else len(PHASES))
+
+        with self._lock:
+            return sorted(self._spans.values(), key=order)
+
+    def write(self, output_format: str = 'table', stream: Any = None) -> None:
+        """
+        Write the report.
+
+        Arguments:
+            output_format (str): One of TIMINGS_FORMATS.
+            stream (Any): The stream to write to, defaults to stderr.
+        """
+        stream = stream or sys.stderr
+        spans: List[dict] = self.spans()
+
+        if output_format == 'json':
+            stream.write(json.dumps([dict(span, seconds=round(span["seconds"], 4)) for span in spans], indent=2) + '\n')
+            return
+
+        totals: Dict[str, float] = {}
+        stream.write(f"{'language':<12} {'phase':<9} {'ms':>9} {'bytes':>10} {'cache':<12} {'items':>6}\n")
+        for span in spans:
+            totals[span["phase"]] = totals.get(span["phase"], 0.0) + span["seconds"]
+            stream.write(f"{span['name']:<12} {span['phase']:<9} {span['seconds'] * 1000:9.1f} {_blank(span['bytes']):>10} "
+                         f"{_blank(span['cache']):<12} {_blank(span['items']):>6}\n")
+        stream.write(f"{'total':<12} " + ', '.join(f"{phase} {totals[phase] * 1000:.1f} ms" for phase in PHASES if phase in totals) + '\n')
+
+
+def _blank(value: Any) -> str:
+    """
+    Format a field of the table, leaving it blank if it does not apply.
+
+    Arguments:
+        value (Any): The value.
+
+    Returns:
+        str: The formatted value.
+    """
+    return '' if value is None else str(value)
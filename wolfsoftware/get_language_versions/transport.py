@@ -0,0 +1,314 @@
+"""
+This module provides alternative transports for the upstream requests: record, replay and a local stand-in.
+
+Each transport is a requests adapter mounted on the shared session, so everything above it (the
+cache, conditional requests, redirects and streaming) behaves exactly as it does against upstream:
+
+- Recording passes every request to upstream and writes each response (status, validators, redirect
+  target and body) to a recordings directory.
+- Replay answers every request from a recordings directory without any network access, answering
+  conditional requests with 304 Not Modified when the validators match.
+- The upstream transport sends every request to a local stand-in server (see upstream.py), which
+  serves a recordings directory with injected latency, throttling and failures.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from types import SimpleNamespace
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import RecordingNotFoundError
+
+# The response headers that are recorded (the body is recorded decoded, so the encoding headers are not)
+RECORDED_HEADERS: tuple = ('Content-Type', 'ETag', 'Last-Modified', 'Location')
+
+# The request headers that make a request conditional
+_CONDITIONAL_HEADERS: tuple = ('If-None-Match', 'If-Modified-Since')
+
+
+class RecordingStore:
+    """
+    A directory of recorded responses, one pair of files (metadata and body) for each method and URL.
+
+    Arguments:
+        directory (str): The recordings directory.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialise the store."""
+        self.directory: str = directory
+
+    def _path(self, method: str, url: str, suffix: str) -> str:
+        """
+        Get the path of a file of a recorded response.
+
+        Arguments:
+            method (str): The request method.
+            url (str): The request URL.
+            suffix (str): The file suffix (.json for the metadata, .body for the body).
+
+        Returns:
+            str: The path.
+        """
+        return os.path.join(self.directory, hashlib.sha256(f"{method} {url}".encode('utf-8')).hexdigest()[:32] + suffix)
+
+    def save(self, method: str, url: str, status: int, headers: Mapping[str, str], body: bytes) -> None:
+        """
+        Record a response, replacing any previous recording of the same request.
+
+        Arguments:
+            method (str): The request method.
+            url (str): The request URL.
+            status (int): The status code.
+            headers (Mapping[str, str]): The response headers (only RECORDED_HEADERS are kept).
+            body (bytes): The decoded response body.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        metadata: dict = {"method": method, "url": url, "status": status,
+                          "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers}}
+
+        # The body is written before the metadata, so a recording is never found without its body
+        for suffix, data in (('.body', body), ('.json', json.dumps(metadata, indent=2).encode('utf-8'))):
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(descriptor, 'wb') as handle:
+                handle.write(data)
+            os.replace(temporary, self._path(method, url, suffix))
+
+    def load(self, method: str, url: str) -> Optional[SimpleNamespace]:
+        """
+        Load a recorded response, answering a HEAD request from the recorded GET request if it was not recorded itself.
+
+        Arguments:
+            method (str): The request method.
+            url (str): The request URL.
+
+        Returns:
+            Optional[SimpleNamespace]: The status, headers and body of the response, or None if it was not recorded.
+        """
+        for recorded_method in ((method, 'GET') if method == 'HEAD' else (method,)):
+            try:
+                with open(self._path(recorded_method, url, '.json'), encoding='utf-8') as handle:
+                    metadata: dict = json.load(handle)
+                with open(self._path(recorded_method, url, '.body'), 'rb') as handle:
+                    body: bytes = handle.read()
+            except (OSError, ValueError):
+                continue
+
+            return SimpleNamespace(status=metadata["status"], headers=validators(metadata["headers"], body), body=b'' if method == 'HEAD' else body)
+
+        return None
+
+
+def validators(headers: Dict[str, str], body: bytes) -> Dict[str, str]:
+    """
+    Give a recorded response an ETag of the digest of its body if it was recorded without any validators.
+
+    This means conditional requests, and so revalidation of the cache, can be exercised for every source.
+
+    Arguments:
+        headers (Dict[str, str]): The recorded headers.
+        body (bytes): The recorded body.
+
+    Returns:
+        Dict[str, str]: The headers.
+    """
+    if 'ETag' in headers or 'Last-Modified' in headers or 'Location' in headers:
+        return headers
+    return dict(headers, ETag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+def is_not_modified(request_headers: Mapping[str, str], headers: Mapping[str, str]) -> bool:
+    """
+    Check whether a conditional request is answered with 304 Not Modified.
+
+    Arguments:
+        request_headers (Mapping[str, str]): The request headers.
+        headers (Mapping[str, str]): The headers of the response.
+
+    Returns:
+        bool: True if the validators of the request match the response.
+    """
+    if 'If-None-Match' in request_headers:
+        return 'ETag' in headers and headers['ETag'] in (tag.strip() for tag in request_headers['If-None-Match'].split(','))
+    return 'If-Modified-Since' in request_headers and request_headers['If-Modified-Since'] == headers.get('Last-Modified')
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Send requests to upstream, recording every response.
+
+    Conditional headers are removed from the requests, so every response is recorded in full.
+
+    Arguments:
+        store (RecordingStore): The store the responses are recorded in.
+        **kwargs: The arguments of HTTPAdapter (e.g. the pool sizes).
+    """
+
+    def __init__(self, store: RecordingStore, **kwargs) -> None:
+        """Initialise the adapter."""
+        super().__init__(**kwargs)
+        self.store: RecordingStore = store
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:  # pylint: disable=signature-differs
+        """
+        Send a request to upstream and record the response.
+
+        Arguments:
+            request (requests.PreparedRequest): The request.
+            *args: The positional arguments of HTTPAdapter.send().
+            **kwargs: The keyword arguments of HTTPAdapter.send().
+
+        Returns:
+            requests.Response: The response, with its body already read.
+        """
+        for name in _CONDITIONAL_HEADERS:
+            request.headers.pop(name, None)
+
+        response: requests.Response = super().send(request, *args, **kwargs)
+        self.store.save(str(request.method), str(request.url), response.status_code, response.headers, response.content)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answer requests from recorded responses, without any network access.
+
+    Arguments:
+        store (RecordingStore): The store the responses were recorded in.
+    """
+
+    def __init__(self, store: RecordingStore) -> None:
+        """Initialise the adapter."""
+        super().__init__()
+        self.store: RecordingStore = store
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:  # pylint: disable=signature-differs,unused-argument
+        """
+        Answer a request with the recorded response.
+
+        Arguments:
+            request (requests.PreparedRequest): The request.
+            *args: The positional arguments of BaseAdapter.send() (unused, as no connection is made).
+            **kwargs: The keyword arguments of BaseAdapter.send() (unused, as no connection is made).
+
+        Returns:
+            requests.Response: The recorded response, or 304 Not Modified if the validators of the request match it.
+
+        Raises:
+            RecordingNotFoundError: If no response to the request was recorded.
+        """
+        recording: Optional[SimpleNamespace] = self.store.load(str(request.method), str(request.url))
+        if recording is None:
+            raise RecordingNotFoundError(f"No response to {request.method} {request.url} was recorded in {self.store.directory}")
+
+        if is_not_modified(request.headers, recording.headers):
+            return build_response(request, 304, recording.headers, b'')
+        return build_response(request, recording.status, recording.headers, recording.body)
+
+    def close(self) -> None:
+        """Release nothing, as no connections are opened."""
+
+
+def build_response(request: requests.PreparedRequest, status: int, headers: Mapping[str, str], body: bytes) -> requests.Response:
+    """
+    Build a response with its body already read.
+
+    Arguments:
+        request (requests.PreparedRequest): The request it answers.
+        status (int): The status code.
+        headers (Mapping[str, str]): The headers.
+        body (bytes): The body.
+
+    Returns:
+        requests.Response: The response.
+    """
+    response: requests.Response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = str(request.url)
+    response.request = request
+    response._content = body  # pylint: disable=protected-access
+    response._content_consumed = True  # pylint: disable=protected-access
+    return response
+
+
+class UpstreamAdapter(HTTPAdapter):
+    """
+    Send requests to a local stand-in for upstream (see upstream.py), rather than upstream itself.
+
+    The upstream URL is encoded in the path of the request to the stand-in, and the URL of the
+    response is the upstream URL, so redirects and the cache behave exactly as they do upstream.
+
+    Arguments:
+        base_url (str): The URL of the stand-in server.
+        **kwargs: The arguments of HTTPAdapter (e.g. the pool sizes).
+    """
+
+    def __init__(self, base_url: str, **kwargs) -> None:
+        """Initialise the adapter."""
+        super().__init__(**kwargs)
+        self.base_url: str = base_url.rstrip('/')
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:  # pylint: disable=signature-differs
+        """
+        Send a request to the stand-in server.
+
+        Arguments:
+            request (requests.PreparedRequest): The request.
+            *args: The positional arguments of HTTPAdapter.send().
+            **kwargs: The keyword arguments of HTTPAdapter.send().
+
+        Returns:
+            requests.Response: The response, with the upstream URL.
+        """
+        url: str = str(request.url)
+        parts = urlsplit(url)
+        request.url = f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else '')
+
+        try:
+            response: requests.Response = super().send(request, *args, **kwargs)
+        finally:
+            request.url = url
+
+        response.url = url
+        return response
+
+
+def mount_transport(session: requests.Session, pool_size: int, record: Optional[str] = None, replay: Optional[str] = None,
+                    upstream: Optional[str] = None) -> requests.Session:
+    """
+    Mount a transport on a session for every upstream request, if one is selected.
+
+    Arguments:
+        session (requests.Session): The session.
+        pool_size (int): The maximum number of pooled connections per host.
+        record (Optional[str]): Record every response in this directory.
+        replay (Optional[str]): Answer every request from the responses recorded in this directory.
+        upstream (Optional[str]): Send every request to the stand-in server at this URL.
+
+    Returns:
+        requests.Session: The session.
+    """
+    adapter: Optional[BaseAdapter] = None
+
+    if record:
+        adapter = RecordingAdapter(RecordingStore(record), pool_connections=pool_size, pool_maxsize=pool_size)
+    elif replay:
+        adapter = ReplayAdapter(RecordingStore(replay))
+    elif upstream:
+        adapter = UpstreamAdapter(upstream, pool_connections=pool_size, pool_maxsize=pool_size)
+
+    if adapter is not None:
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+    return session
@@ -0,0 +1,261 @@
+"""
+This module provides a local stand-in for the upstream version sources, for deterministic testing and benchmarking.
+
+It serves the responses in a recordings directory (see transport.py, and --record) to clients using the
+upstream transport (--upstream), answering conditional requests with 304 Not Modified when the validators
+match, and can inject latency (with jitter), a bandwidth limit, throttling (429 with Retry-After) and
+failures (an error status, or the connection being dropped) so that tail latency, retries and the cache
+can be measured without network access. Injected faults are drawn from a seeded random number generator,
+so the same sequence of requests sees the same faults on every run.
+
+Usage:
+    python -m wolfsoftware.get_language_versions.upstream DIRECTORY [--port PORT] [--latency MS] [--jitter MS] [--bandwidth BYTES]
+        [--throttle-rate FRACTION] [--failure-rate FRACTION] [--failure-status STATUS] [--seed SEED]
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .globals import UPSTREAM_HOST, UPSTREAM_PORT
+from .transport import RecordingStore, is_not_modified
+from .validation import positive_int
+
+# The fault settings of the stand-in server when none are given (no faults)
+DEFAULT_FAULTS: Dict[str, float] = {"latency": 0.0, "jitter": 0.0, "bandwidth": 0, "throttle_rate": 0.0, "failure_rate": 0.0, "failure_status": 503}
+
+# The number of times a second a bandwidth limited body is written
+_BANDWIDTH_SLICES: int = 10
+
+
+def create_faults(seed: int = 0, **settings: float) -> SimpleNamespace:
+    """
+    Create the settings for the faults injected by the stand-in server.
+
+    The settings are latency and jitter (the number of seconds each response is delayed by, and the
+    most it is randomly shortened or lengthened by), bandwidth (the most bytes per second a body is
+    written at, 0 for no limit), throttle_rate (the fraction of requests answered with 429), and
+    failure_rate and failure_status (the fraction of requests that fail, and their status code, 0 to
+    drop the connection instead). Any setting not given injects no fault.
+
+    Arguments:
+        seed (int): The seed of the random number generator the faults are drawn from.
+        **settings (float): The fault settings.
+
+    Returns:
+        SimpleNamespace: The fault settings.
+
+    Raises:
+        ValueError: If a setting is not known.
+    """
+    unknown: set = set(settings) - set(DEFAULT_FAULTS)
+    if unknown:
+        raise ValueError(f"Unknown fault settings: {', '.join(sorted(unknown))}")
+
+    return SimpleNamespace(**dict(DEFAULT_FAULTS, **settings), random=random.Random(seed), lock=threading.Lock())
+
+
+def upstream_url(path: str) -> Optional[str]:
+    """
+    Decode the upstream URL from the path of a request to the stand-in server.
+
+    Arguments:
+        path (str): The request path, e.g. /https/github.com/owner/repo/releases/latest/.
+
+    Returns:
+        Optional[str]: The upstream URL, or None if the path does not encode one.
+    """
+    parts = urlsplit(path)
+    scheme, _, remainder = parts.path.lstrip('/').partition('/')
+    netloc, _, upstream_path = remainder.partition('/')
+
+    if scheme not in ('http', 'https') or not netloc:
+        return None
+    return f"{scheme}://{netloc}/{upstream_path}" + (f"?{parts.query}" if parts.query else '')
+
+
+class _UpstreamHandler(BaseHTTPRequestHandler):
+    """Answer requests from the recorded responses of the server, injecting its faults."""
+
+    server: '_UpstreamServer'
+    protocol_version: str = 'HTTP/1.1'
+
+    def _draw(self) -> Tuple[float, float]:
+        """
+        Draw the delay and the fault roll of a request.
+
+        Returns:
+            Tuple[float, float]: The number of seconds to delay the response by, and a number in [0, 1) selecting any fault.
+        """
+        faults: SimpleNamespace = self.server.faults
+        with faults.lock:
+            delay: float = faults.latency + faults.random.uniform(-faults.jitter, faults.jitter)
+            roll: float = faults.random.random()
+        return max(delay, 0.0), roll
+
+    def _send(self, status: int, headers: dict, body: bytes, head: bool) -> None:
+        """
+        Send a response, limiting the bandwidth the body is written at if configured.
+
+        Arguments:
+            status (int): The status code.
+            headers (dict): The headers.
+            body (bytes): The body.
+            head (bool): Send the headers only, as the request was a HEAD request.
+        """
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if head or not body:
+            return
+
+        bandwidth: int = self.server.faults.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+
+        size: int = max(bandwidth // _BANDWIDTH_SLICES, 1)
+        for offset in range(0, len(body), size):
+            self.wfile.write(body[offset:offset + size])
+            self.wfile.flush()
+            time.sleep(1 / _BANDWIDTH_SLICES)
+
+    def _answer(self, head: bool) -> None:
+        """
+        Answer a request, injecting any faults.
+
+        Arguments:
+            head (bool): The request is a HEAD request.
+        """
+        faults: SimpleNamespace = self.server.faults
+        delay, roll = self._draw()
+        time.sleep(delay)
+
+        if roll < faults.failure_rate:
+            if not faults.failure_status:
+                self.close_connection = True
+                return
+            self._send(faults.failure_status, {}, b'', head)
+            return
+
+        if roll < faults.failure_rate + faults.throttle_rate:
+            self._send(429, {"Retry-After": '1'}, b'', head)
+            return
+
+        url: Optional[str] = upstream_url(self.path)
+        recording: Optional[SimpleNamespace] = self.server.store.load(self.command, url) if url is not None else None
+
+        if recording is None:
+            self._send(404, {"Content-Type": 'text/plain'}, f"No response to {self.command} {url or self.path} was recorded\n".encode('utf-8'), head)
+        elif is_not_modified(self.headers, recording.headers):
+            self._send(304, recording.headers, b'', True)
+        else:
+            self._send(recording.status, recording.headers, recording.body, head)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Answer a GET request."""
+        self._answer(head=False)
+
+    def do_HEAD(self) -> None:  # pylint: disable=invalid-name
+        """Answer a HEAD request."""
+        self._answer(head=True)
+
+    def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+        """Do not log every request."""
+
+
+class _UpstreamServer(ThreadingHTTPServer):
+    """
+    A threaded HTTP server holding the recorded responses and the faults to inject.
+
+    Arguments:
+        address (Tuple[str, int]): The host and port to listen on.
+        store (RecordingStore): The recorded responses.
+        faults (SimpleNamespace): The fault settings (see create_faults).
+    """
+
+    daemon_threads: bool = True
+
+    def __init__(self, address: Tuple[str, int], store: RecordingStore, faults: SimpleNamespace) -> None:
+        """Initialise the server and bind to the address."""
+        super().__init__(address, _UpstreamHandler)
+        self.store: RecordingStore = store
+        self.faults: SimpleNamespace = faults
+
+
+def serve_upstream(directory: str, host: str = UPSTREAM_HOST, port: int = UPSTREAM_PORT, faults: Optional[SimpleNamespace] = None) -> None:
+    """
+    Serve the recorded responses in a directory until interrupted.
+
+    Arguments:
+        directory (str): The recordings directory.
+        host (str): The host to listen on.
+        port (int): The port to listen on.
+        faults (Optional[SimpleNamespace]): The faults to inject (see create_faults), defaults to none.
+    """
+    with _UpstreamServer((host, port), RecordingStore(directory), faults or create_faults()) as server:
+        print(f"Serving {directory} as upstream on http://{host}:{server.server_address[1]} (use --upstream http://{host}:{server.server_address[1]})",
+              flush=True)
+        server.serve_forever()
+
+
+def _fraction(value: str) -> float:
+    """
+    Validate a fraction.
+
+    Arguments:
+        value (str): The value.
+
+    Returns:
+        float: The fraction.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a number between 0 and 1.
+    """
+    try:
+        fraction: float = float(value)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(f"{value} is not a number") from err
+
+    if not 0.0 <= fraction <= 1.0:
+        raise argparse.ArgumentTypeError(f"{value} is not between 0 and 1")
+    return fraction
+
+
+def main() -> None:
+    """Serve a recordings directory as upstream, with the faults given on the command line."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Serve recorded upstream responses locally, injecting faults.')
+    parser.add_argument('directory', type=str, help='The recordings directory (written with get-language-versions --record)')
+    parser.add_argument('--host', type=str, default=UPSTREAM_HOST, help='The host to listen on')
+    parser.add_argument('--port', type=int, default=UPSTREAM_PORT, help='The port to listen on')
+    parser.add_argument('--latency', type=float, default=0.0, metavar='MS', help='Delay every response by MS milliseconds')
+    parser.add_argument('--jitter', type=float, default=0.0, metavar='MS', help='Randomly shorten or lengthen the delay by up to MS milliseconds')
+    parser.add_argument('--bandwidth', type=positive_int, default=0, metavar='BYTES', help='Write bodies at no more than BYTES per second')
+    parser.add_argument('--throttle-rate', type=_fraction, default=0.0, help='The fraction of requests answered with 429 Too Many Requests')
+    parser.add_argument('--failure-rate', type=_fraction, default=0.0, help='The fraction of requests that fail')
+    parser.add_argument('--failure-status', type=int, default=503, help='The status code of failed requests (0 drops the connection instead)')
+    parser.add_argument('--seed', type=int, default=0, help='The seed the faults are drawn with')
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.throttle_rate + args.failure_rate > 1.0:
+        parser.error("argument --throttle-rate: the throttle and failure rates add up to more than 1")
+
+    faults: SimpleNamespace = create_faults(args.seed, latency=args.latency / 1000, jitter=args.jitter / 1000, bandwidth=args.bandwidth,
+                                            throttle_rate=args.throttle_rate, failure_rate=args.failure_rate, failure_status=args.failure_status)
+    try:
+        serve_upstream(args.directory, args.host, args.port, faults)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
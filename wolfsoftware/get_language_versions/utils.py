@@ -4,9 +4,10 @@ This module provides functionality to list the supported programming languages.
 It defines a function to print the supported languages in a nicely formatted manner.
 """
 from types import SimpleNamespace
-from typing import List
+from typing import Dict, List
 
 from .constants import SUPPORTED_LANGUAGES
+from .output import OUTPUT_SETTINGS
 
 
 def list_supported_languages() -> None:
@@ -20,11 +21,22 @@ def list_supported_languages() -> None:
     print(f"Support Languages: {languages}")
 
 
-def list_language_versions(config: SimpleNamespace, versions: List[str]) -> None:
+def list_language_versions(config: SimpleNamespace, versions: Dict[str, List[str]]) -> None:
     """
-    List the versions that have been found for a given language.
+    List the versions that have been found for each of the requested languages.
 
-    This function prints the versions as a comma-separated list with a header.
+    This function prints the versions for each language as a comma-separated list with a header,
+    in the order the languages were requested. In machine mode each line is just the language and
+    a comma-separated list of versions, separated by a tab.
+
+    Arguments:
+        config (SimpleNamespace): The configuration settings (only languages is used).
+        versions (Dict[str, List[str]]): The versions found for each language.
     """
-    languages: str = ", ".join(versions)
-    print(f"{config.language} Versions: {languages}")
+    for language in config.languages:
+        if OUTPUT_SETTINGS.machine:
+            print(f"{language}\t{','.join(versions[language])}")
+            continue
+
+        language_versions: str = ", ".join(versions[language])
+        print(f"{language} Versions: {language_versions}")
@@ -0,0 +1,121 @@
+"""
+This module provides the validation shared by the command line and bulk query arguments.
+
+It defines the argument types used for integer, percentile and date options and the resolution of
+the requested languages into a list of unique supported languages.
+"""
+
+import argparse
+import datetime
+
+from .constants import SUPPORTED_LANGUAGES
+
+
+def positive_int(value: str) -> int:
+    """
+    Ensure the provided value is a positive integer.
+
+    Arguments:
+        value (str): The value to be validated.
+
+    Returns:
+        int: The validated positive integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer.
+    """
+    ivalue = int(value)
+    if ivalue <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return ivalue
+
+
+def non_negative_int(value: str) -> int:
+    """
+    Ensure the provided value is zero or a positive integer.
+
+    Arguments:
+        value (str): The value to be validated.
+
+    Returns:
+        int: The validated integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is negative.
+    """
+    ivalue = int(value)
+    if ivalue < 0:
+        raise argparse.ArgumentTypeError(f"{value} is not zero or a positive integer")
+    return ivalue
+
+
+def percentile(value: str) -> float:
+    """
+    Ensure the provided value is a percentile, above 0 and below 100.
+
+    Arguments:
+        value (str): The value to be validated.
+
+    Returns:
+        float: The validated percentile.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a number above 0 and below 100.
+    """
+    try:
+        fvalue: float = float(value)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(f"{value} is not a number") from err
+
+    if not 0.0 < fvalue < 100.0:
+        raise argparse.ArgumentTypeError(f"{value} is not a percentile (above 0 and below 100)")
+    return fvalue
+
+
+def timestamp(value: str) -> float:
+    """
+    Convert an ISO 8601 date or date and time (in local time unless an offset is given) into a timestamp.
+
+    Arguments:
+        value (str): The value to be converted.
+
+    Returns:
+        float: The timestamp.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an ISO 8601 date or date and time.
+    """
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(f"{value} is not an ISO 8601 date (YYYY-MM-DD) or date and time") from err
+
+
+def validate_languages(args: argparse.Namespace) -> list:
+    """
+    Validate the requested languages and resolve them into a list of unique supported languages.
+
+    Arguments:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        list: The requested languages, in the order requested.
+
+    Raises:
+        argparse.ArgumentTypeError: If no languages or unsupported languages are requested.
+    """
+    if args.all and args.language:
+        raise argparse.ArgumentTypeError("argument -l/--language: not allowed with argument -A/--all")
+
+    languages: list = list(SUPPORTED_LANGUAGES) if args.all else (args.language or [])
+
+    if not languages:
+        raise argparse.ArgumentTypeError("the following arguments are required: -l/--language or -A/--all")
+
+    languages = list(dict.fromkeys(language.lower() for language in languages))
+
+    for language in languages:
+        if language not in SUPPORTED_LANGUAGES:
+            raise argparse.ArgumentTypeError("Unsupported language [use -L/--list-languages to see a list of supported languages]")
+
+    return languages
@@ -6,12 +6,40 @@ data from different sources and formats.
 """
 
 import datetime
-import requests
-from bs4 import BeautifulSoup
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional
+
 from packaging import version as semver
 from .constants import MAX_VERSION, MIN_VERSION, URLS
-from .globals import REQUESTS_TIMEOUT
+from .eol import get_eol_schedule, minimum_version_from_schedule
+from .exceptions import RecordingNotFoundError
+from .fetch import FetchResult, fetch_url, matches_url
+from .globals import TERRAFORM_EARLY_STOP
+from .records import VersionRecord
+from .resilience import UPSTREAM_ERRORS
+from .stream import iter_html_links, iter_json_array
 from .tags import get_latest_tag
+from .timings import annotate, count_bytes, measure
+
+
+def get_source_key(language: str, url_type: str = "versions_url") -> tuple:
+    """
+    Get a key identifying the upstream source(s) used for a language.
+
+    Some languages share the same sources (e.g. node and nodejs), this key allows callers to detect
+    this and only fetch the data once.
+
+    Arguments:
+        language (str): The supported language.
+        url_type (str): Which source to identify, either "versions_url" or "eol_url".
+
+    Returns:
+        tuple: A hashable key made up of the URLs used to fetch the data.
+    """
+    if url_type == "eol_url":
+        return (URLS[language]["eol_url"],)
+    return (URLS[language].get("releases_url"), URLS[language]["versions_url"])
 
 
 def get_minimum_version_from_oel(language: str) -> semver.Version:
@@ -19,7 +47,7 @@ def get_minimum_version_from_oel(language: str) -> semver.Version:
     Get the minimum version from the EOL (End Of Life) URL.
 
     The default value for min-version is "EOL" so we need to have a way to get the min-version from the
-    EOL URL.
+    EOL URL. The EOL schedule is stored locally, so this is normally answered without a network call.
 
     Arguments:
         language (str): The supported language to use to locate the correct EOL URL.
@@ -27,26 +55,10 @@ def get_minimum_version_from_oel(language: str) -> semver.Version:
     Returns:
         semver.Version: The minimum "supported" version.
     """
-    versions_url: str = URLS[language]["eol_url"]
-    min_version: semver.Version = MAX_VERSION
+    today: datetime.date = datetime.date.today()
 
-    for release in requests.get(versions_url, timeout=REQUESTS_TIMEOUT).json():
-        try:
-            semver.Version(release['cycle'])
-        except semver.InvalidVersion:
-            continue
-
-        if release['eol'] is True:
-            continue
-
-        if release['eol'] is False:
-            min_version = min(min_version, semver.parse(release['cycle']))
-            continue
-
-        if datetime.date.today() < datetime.date.fromisoformat(release['eol']):
-            min_version = semver.parse(release['cycle'])
-
-    return min_version
+    with measure("eol", language):
+        return minimum_version_from_schedule(get_eol_schedule(URLS[language]["eol_url"], today), today)
 
 
 def get_minimum_version(min_version_str: str, language: str) -> semver.Version:
@@ -73,6 +85,54 @@ def get_minimum_version(min_version_str: str, language: str) -> semver.Version:
     return min_version
 
 
+def get_maximum_version(max_version_str: str) -> semver.Version:
+    """
+    Get the maximum version based on the input string.
+
+    Arguments:
+        max_version_str (str): The max-version as supplied to the action by the user (or the default if none is supplied).
+
+    Returns:
+        semver.Version: The maximum version.
+    """
+    return semver.parse(max_version_str) if max_version_str.upper() != 'LATEST' else MAX_VERSION
+
+
+def parse_versions(candidates: Iterable[str]) -> List[VersionRecord]:
+    """
+    Parse candidate version strings into version records.
+
+    Each candidate is parsed exactly once, anything that is not a valid version is dropped.
+
+    Arguments:
+        candidates (Iterable[str]): The candidate version strings.
+
+    Returns:
+        List[VersionRecord]: The parsed records, in their original order.
+    """
+    records: List[VersionRecord] = []
+
+    for candidate in candidates:
+        record: Optional[VersionRecord] = VersionRecord.parse(candidate)
+        if record is not None:
+            records.append(record)
+
+    return records
+
+
+def _php_version(version_object: dict) -> str:
+    """
+    Build the version string from a PHP release object.
+
+    Arguments:
+        version_object (dict): A release object from the PHP versions URL.
+
+    Returns:
+        str: The version string.
+    """
+    return f"{version_object['major']}.{version_object['minor']}.{version_object['release']}"
+
+
 def get_perl_versions(stable_versions: dict) -> list:
     """
     Get Perl versions from the returned dataset.
@@ -85,16 +145,7 @@ def get_perl_versions(stable_versions: dict) -> list:
     Returns:
         list: A list containing just the version numbers.
     """
-    versions: list = []
-
-    for version in stable_versions:
-        try:
-            if semver.Version(version):
-                versions.append(version)
-        except semver.InvalidVersion:
-            continue
-
-    return versions
+    return [record.text for record in parse_versions(stable_versions)]
 
 
 def get_php_versions(stable_versions: dict) -> list:
@@ -109,18 +160,7 @@ def get_php_versions(stable_versions: dict) -> list:
     Returns:
         list: A list containing just the version numbers.
     """
-    versions: list = []
-
-    for version_object in stable_versions:
-        version: str = f"{version_object['major']}.{version_object['minor']}.{version_object['release']}"
-
-        try:
-            if semver.Version(version):
-                versions.append(version)
-        except semver.InvalidVersion:
-            continue
-
-    return versions
+    return [record.text for record in parse_versions(_php_version(version_object) for version_object in stable_versions)]
 
 
 def get_ruby_versions(stable_versions: dict) -> list:
@@ -135,43 +175,55 @@ def get_ruby_versions(stable_versions: dict) -> list:
     Returns:
         list: A list containing just the version numbers.
     """
-    versions: list = []
+    return [record.text for record in parse_versions(stable_versions["ruby"])]
+
+
+def iter_terraform_versions(chunks: Iterable[bytes], min_version: Optional[semver.Version] = None) -> Iterator[VersionRecord]:
+    """
+    Yield Terraform versions from the releases listing as it is read.
 
-    for version in stable_versions["ruby"]:
-        try:
-            if semver.Version(version):
-                versions.append(version)
-        except semver.InvalidVersion:
+    The listing is ordered newest first, so if a minimum version is given the scan stops once
+    TERRAFORM_EARLY_STOP consecutive versions have been found below it, rather than scanning the
+    rest of the (long) listing. Whatever is left of the chunks is not read.
+
+    Arguments:
+        chunks (Iterable[bytes]): The releases listing HTML, in chunks.
+        min_version (Optional[semver.Version]): The minimum version of interest, if known.
+
+    Yields:
+        VersionRecord: The next version found in the listing.
+    """
+    below_minimum: int = 0
+
+    for link in iter_html_links(chunks):
+        record: Optional[VersionRecord] = VersionRecord.parse(link.replace('/terraform/', '').replace('/', ''))
+        if record is None:
             continue
 
-    return versions
+        yield record
+
+        if min_version is not None:
+            if record.major_minor < min_version:
+                below_minimum += 1
+                if below_minimum >= TERRAFORM_EARLY_STOP:
+                    return
+            else:
+                below_minimum = 0
 
 
-def get_terraform_versions(stable_versions: dict) -> list:
+def get_terraform_versions(stable_versions: str) -> list:
     """
     Get Terraform versions from the returned dataset.
 
     Different version URLs return the version data in different formats, this handles the data for Terraform only.
 
     Arguments:
-        stable_versions (dict): The dataset returned from the versions URL.
+        stable_versions (str): The releases listing HTML returned from the versions URL.
 
     Returns:
         list: A list containing just the version numbers.
     """
-    versions: list = []
-
-    soup: BeautifulSoup = BeautifulSoup(stable_versions, features="html.parser")
-    for link in soup.findAll('a'):
-        version: str = link['href'].replace('/terraform/', '').replace('/', '')
-        try:
-            semver.Version(version)
-        except semver.InvalidVersion:
-            continue
-        else:
-            versions.append(version)
-
-    return versions
+    return [record.text for record in iter_terraform_versions([stable_versions.encode('utf-8')])]
 
 
 def get_versions(stable_versions: dict) -> list:
@@ -186,38 +238,146 @@ def get_versions(stable_versions: dict) -> list:
     Returns:
         list: A list containing just the version numbers.
     """
-    versions: list = []
+    return [record.text for record in parse_versions(version_object['version'] for version_object in stable_versions)]
 
-    for version_object in stable_versions:
-        version: str = version_object['version']
 
-        try:
-            if semver.Version(version):
-                versions.append(version)
-        except semver.InvalidVersion:
-            continue
+def get_source_tag(language: str) -> Optional[str]:
+    """
+    Get the release tag the versions data for a language is fetched from.
+
+    Arguments:
+        language (str): The supported language.
 
-    return versions
+    Returns:
+        Optional[str]: The latest release tag, or None if the versions data is not tagged (e.g. terraform).
+    """
+    if "releases_url" not in URLS[language]:
+        return None
+    return get_latest_tag(URLS[language]["releases_url"])
 
 
-def get_stable_versions(language: str, return_json: bool = True) -> dict:
+def fetch_speculatively(language: str, stream: bool = False) -> FetchResult:
     """
-    Get a list of stable versions for a given language.
+    Fetch the versions data from the head branch while the latest tag is being resolved.
 
-    For a given language, locate the current stable (supported) versions.
+    The head branch copy of the versions file is requested at the same time as the latest tag. If the
+    tagged copy is known to be identical (by cached content digest or ETag) the head branch response is
+    used directly, otherwise the tagged copy is fetched as normal. The head branch copy is only an
+    optimisation, so if it cannot be fetched the tagged copy is fetched as normal too.
 
     Arguments:
         language (str): The supported language to use.
+        stream (bool): Return the tagged copy (if needed) without reading the body.
 
     Returns:
-        dict: The list of stable (supported) versions available.
+        FetchResult: The response containing the versions data for the latest tag.
+    """
+    versions_url: str = URLS[language]["versions_url"]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        head_future = executor.submit(fetch_url, versions_url.replace('LATEST_TAG', URLS[language]["head_branch"]))
+        with measure("tag", language):
+            tagged_url: str = versions_url.replace('LATEST_TAG', get_latest_tag(URLS[language]["releases_url"]))
+        with measure("download", language):
+            try:
+                head_response: Optional[FetchResult] = head_future.result()
+            except UPSTREAM_ERRORS + (RecordingNotFoundError,):
+                head_response = None
+
+            if head_response is not None and head_response.ok and matches_url(tagged_url, head_response):
+                # The head branch copy was read on another thread, so it is accounted for here
+                annotate(cache='hit' if head_response.from_cache else 'miss')
+                count_bytes(len(head_response.content))
+                return head_response
+            return fetch_url(tagged_url, stream=stream)
+
+
+def fetch_stable_versions(language: str, speculative: bool = False, stream: bool = False) -> FetchResult:
+    """
+    Fetch the versions data for a given language.
+
+    Arguments:
+        language (str): The supported language to use.
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+        stream (bool): Return without reading the body, so it can be consumed incrementally.
+
+    Returns:
+        FetchResult: The response containing the versions data.
     """
     versions_url: str = URLS[language]["versions_url"]
 
+    if speculative and "head_branch" in URLS[language]:
+        return fetch_speculatively(language, stream)
+
     if "releases_url" in URLS[language]:
-        latest_tag: str = get_latest_tag(URLS[language]["releases_url"])
+        with measure("tag", language):
+            latest_tag: str = get_latest_tag(URLS[language]["releases_url"])
         versions_url = versions_url.replace('LATEST_TAG', latest_tag)
 
+    with measure("download", language):
+        return fetch_url(versions_url, stream=stream)
+
+
+def get_stable_versions(language: str, return_json: bool = True, speculative: bool = False) -> dict:
+    """
+    Get a list of stable versions for a given language.
+
+    For a given language, locate the current stable (supported) versions.
+
+    Arguments:
+        language (str): The supported language to use.
+        return_json (bool): Return the decoded JSON document rather than the raw text.
+        speculative (bool): Fetch the head branch copy of the versions data while resolving the latest tag.
+
+    Returns:
+        dict: The list of stable (supported) versions available.
+    """
+    response: FetchResult = fetch_stable_versions(language, speculative)
+
     if return_json is True:
-        return requests.get(versions_url, timeout=REQUESTS_TIMEOUT).json()
-    return requests.get(versions_url, timeout=REQUESTS_TIMEOUT).text
+        return response.json()
+    return response.text
+
+
+def extract_versions(language: str, chunks: Iterable[bytes], min_version: Optional[semver.Version] = None,
+                     read_all: bool = True) -> List[VersionRecord]:
+    """
+    Extract the versions for a given language from the raw versions data as it is read.
+
+    JSON documents are decoded incrementally, one array element at a time and keeping only the
+    fields the language parser needs, so the full document is never built in memory. The Terraform
+    HTML listing is scanned for links as it arrives, stopping early once it is below min_version.
+
+    What stopping early saves depends on read_all. A response being downloaded into the cache is
+    only cached once it has been read in full, so the rest of the listing is still read (without
+    being scanned) and the early stop saves only the scan, not the download. Otherwise (the listing
+    is read from the cache, or the cache is disabled) the rest of the listing is not read at all.
+
+    Arguments:
+        language (str): The supported language the data belongs to.
+        chunks (Iterable[bytes]): The raw versions data, in chunks.
+        min_version (Optional[semver.Version]): The minimum version of interest, if known.
+        read_all (bool): Read the rest of the data after stopping early (see FetchResult.caching).
+
+    Returns:
+        List[VersionRecord]: The parsed versions.
+    """
+    if language == "terraform":
+        remaining: Iterator[bytes] = iter(chunks)
+        records: List[VersionRecord] = list(iter_terraform_versions(remaining, min_version))
+        if read_all:
+            for _ in remaining:
+                pass
+        else:
+            # Release the connection (or the cached file) now, rather than when the iterator is collected
+            close: Optional[Callable[[], None]] = getattr(remaining, 'close', None)
+            if close is not None:
+                close()
+        return records
+    if language == "perl":
+        return parse_versions(iter_json_array(chunks))
+    if language == "php":
+        return parse_versions(_php_version(version_object) for version_object in iter_json_array(chunks, fields=('major', 'minor', 'release')))
+    if language == "ruby":
+        return parse_versions(iter_json_array(chunks, path=('ruby',)))
+    return parse_versions(version_object['version'] for version_object in iter_json_array(chunks, fields=('version',)))
@@ -0,0 +1,182 @@
+"""
+This module watches upstream for newly released versions.
+
+Each poll fetches the versions data for every watched language, which revalidates the cached copy
+with a conditional request rather than downloading it again. If the digest of the versions data
+(and the minimum version) is the same as on the previous poll nothing is parsed at all, otherwise
+the processed versions are compared with the previous result and only the versions that were added
+or removed are reported as events. The first poll only records the starting point.
+"""
+
+import datetime
+import json
+import sys
+import time
+
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from packaging import version as semver
+from wolfsoftware.notify import system_message
+
+from .exceptions import CustomException
+from .fetch import FetchResult
+from .process import load_answerer
+from .resilience import deadline_scope
+from .versions import fetch_stable_versions, get_minimum_version, get_source_key, get_source_tag
+from .workers import map_unique, submit_unique
+
+# The errors a poll can fail with, the previous result is kept when they happen
+_POLL_ERRORS: Tuple = (CustomException, requests.RequestException, ValueError, KeyError)
+
+
+def diff_versions(language: str, previous: List[str], current: List[str], tag: Optional[str]) -> List[dict]:
+    """
+    Build the events for the versions added and removed between two results.
+
+    Arguments:
+        language (str): The language.
+        previous (List[str]): The versions on the previous poll.
+        current (List[str]): The versions on this poll.
+        tag (Optional[str]): The release tag the versions data was fetched from.
+
+    Returns:
+        List[dict]: An event for each added version then each removed version.
+    """
+    timestamp: str = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+    before: set = set(previous)
+    after: set = set(current)
+
+    return [{"event": event, "language": language, "version": version, "tag": tag, "time": timestamp}
+            for event, versions in (("added", [version for version in current if version not in before]),
+                                    ("removed", [version for version in previous if version not in after]))
+            for version in versions]
+
+
+class VersionWatcher:
+    """
+    Poll upstream for the configured query and report changes to its result.
+
+    Arguments:
+        config (SimpleNamespace): The query settings (see config.create_query_configuration).
+        min_version_str (str): The min-version as supplied by the user, resolved again on each poll.
+    """
+
+    def __init__(self, config: SimpleNamespace, min_version_str: str) -> None:
+        """Initialise the watcher with no previous result."""
+        self.config: SimpleNamespace = config
+        self.min_version_str: str = min_version_str
+        self._state: Dict[str, SimpleNamespace] = {}
+
+    def versions(self, language: str) -> Optional[List[str]]:
+        """
+        Get the result for a language as of the last successful poll.
+
+        Arguments:
+            language (str): The watched language.
+
+        Returns:
+            Optional[List[str]]: The versions, or None if the language has not been polled successfully yet.
+        """
+        state: Optional[SimpleNamespace] = self._state.get(language)
+        return state.versions if state is not None else None
+
+    def _poll_source(self, language: str) -> Dict[str, List[dict]]:
+        """
+        Poll the versions data for a language, for every watched language sharing its source.
+
+        Arguments:
+            language (str): The supported language.
+
+        Returns:
+            Dict[str, List[dict]]: The events for each language sharing the source.
+        """
+        languages: List[str] = [other for other in self.config.languages if get_source_key(other) == get_source_key(language)]
+        response: FetchResult = fetch_stable_versions(language, self.config.speculative, stream=True)
+        min_versions: Dict[str, semver.Version] = {other: self.config.min_version[other].result() for other in languages}
+
+        if response.known_digest is not None and all(other in self._state and self._state[other].digest == response.known_digest
+                                                     and self._state[other].min_version == min_versions[other] for other in languages):
+            return {other: [] for other in languages}
+
+        tag: Optional[str] = get_source_tag(language)
+        answer: Callable[[semver.Version], List[str]] = load_answerer(language, languages, response, self.config, tag)
+        events: Dict[str, List[dict]] = {}
+
+        for other in languages:
+            versions: List[str] = answer(min_versions[other])
+            previous: Optional[SimpleNamespace] = self._state.get(other)
+            events[other] = diff_versions(other, previous.versions, versions, tag) if previous is not None else []
+            self._state[other] = SimpleNamespace(digest=response.known_digest, min_version=min_versions[other], versions=versions)
+
+        return events
+
+    def _poll_or_report(self, language: str) -> Dict[str, List[dict]]:
+        """
+        Poll a language, reporting a failure and keeping the previous result if the poll fails.
+
+        Arguments:
+            language (str): The supported language.
+
+        Returns:
+            Dict[str, List[dict]]: The events for each language sharing the source (none if the poll failed).
+        """
+        try:
+            return self._poll_source(language)
+        except _POLL_ERRORS as err:
+            print(system_message(f"Unable to poll {language}: {err}"), file=sys.stderr)
+            return {}
+
+    def poll(self) -> List[dict]:
+        """
+        Poll every watched language concurrently, within the deadline if one is configured.
+
+        Returns:
+            List[dict]: The events, in the order the languages were requested.
+        """
+        with deadline_scope():
+            self.config.min_version = submit_unique(lambda language: get_minimum_version(self.min_version_str, language), self.config.languages,
+                                                    key=lambda language: get_source_key(language, "eol_url"), max_workers=self.config.workers)
+            results: Dict[str, Dict[str, List[dict]]] = map_unique(self._poll_or_report, self.config.languages, key=get_source_key,
+                                                                   max_workers=self.config.workers)
+
+        return [event for language in self.config.languages for event in results[language].get(language, [])]
+
+
+def write_event(event: dict, output_format: str) -> None:
+    """
+    Write an event as soon as it happens.
+
+    Arguments:
+        event (dict): The event.
+        output_format (str): The output format (text or ndjson).
+    """
+    if output_format == 'ndjson':
+        sys.stdout.write(json.dumps(event, separators=(',', ':')) + '\n')
+    else:
+        sys.stdout.write(f"{event['time']} {event['language']} {event['event']} {event['version']}\n")
+    sys.stdout.flush()
+
+
+def watch(watcher: VersionWatcher, interval: int, output_format: str, count: Optional[int] = None) -> None:
+    """
+    Poll every interval seconds, writing the events for each poll, until interrupted.
+
+    Arguments:
+        watcher (VersionWatcher): The watcher.
+        interval (int): The number of seconds between polls.
+        output_format (str): The output format (text or ndjson).
+        count (Optional[int]): Stop after this many polls.
+    """
+    polls: int = 0
+
+    while True:
+        for event in watcher.poll():
+            write_event(event, output_format)
+
+        polls += 1
+        if count is not None and polls >= count:
+            return
+        time.sleep(interval)
@@ -0,0 +1,74 @@
+"""
+This module provides a bounded worker pool for running blocking fetches concurrently.
+
+It defines helpers that run a function for many inputs on a thread pool, collapsing inputs that
+share the same key so that each distinct upstream request is only made once, either waiting for
+the results or handing back futures so the work can overlap with whatever the caller does next.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable
+
+from .globals import DEFAULT_WORKERS
+
+
+def map_unique(func: Callable[[Any], Any], items: Iterable[Any], key: Callable[[Any], Hashable], max_workers: int = DEFAULT_WORKERS) -> Dict[Any, Any]:
+    """
+    Run a function for every item on a bounded thread pool, calling it once per distinct key.
+
+    Items that map to the same key (for example node and nodejs, which share the same URLs) share a
+    single call and therefore a single result.
+
+    Arguments:
+        func (Callable): The function to call for each distinct item.
+        items (Iterable): The items to process.
+        key (Callable): A function returning the deduplication key for an item.
+        max_workers (int): The maximum number of worker threads.
+
+    Returns:
+        Dict[Any, Any]: A dictionary mapping each item to its result.
+
+    Raises:
+        Exception: Any exception raised by func is re-raised in the calling thread.
+    """
+    items = list(items)
+    futures: Dict[Hashable, Future] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items) or 1))) as executor:
+        for item in items:
+            item_key: Hashable = key(item)
+            if item_key not in futures:
+                futures[item_key] = executor.submit(func, item)
+
+        return {item: futures[key(item)].result() for item in items}
+
+
+def submit_unique(func: Callable[[Any], Any], items: Iterable[Any], key: Callable[[Any], Hashable], max_workers: int = DEFAULT_WORKERS) -> Dict[Any, Future]:
+    """
+    Start running a function for every item in the background, calling it once per distinct key.
+
+    Unlike map_unique() this does not wait for the calls to complete, the work starts immediately
+    and the caller collects each result with Future.result() only at the point it is needed.
+
+    Arguments:
+        func (Callable): The function to call for each distinct item.
+        items (Iterable): The items to process.
+        key (Callable): A function returning the deduplication key for an item.
+        max_workers (int): The maximum number of worker threads.
+
+    Returns:
+        Dict[Any, Future]: A dictionary mapping each item to the future for its result.
+    """
+    items = list(items)
+    futures: Dict[Hashable, Future] = {}
+
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items) or 1)))
+    for item in items:
+        item_key: Hashable = key(item)
+        if item_key not in futures:
+            futures[item_key] = executor.submit(func, item)
+
+    # Submitted calls still run to completion, this just releases the threads once they have
+    executor.shutdown(wait=False)
+
+    return {item: futures[key(item)] for item in items}